@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Thread Pool vs asyncio Write Benchmark for Unicorn E-Commerce Seeders
+Loads the same synthetic records through the threaded and async bulk writers on local stand-ins
+
+Start the stand-ins first, e.g.:
+  docker run -d -p 27017:27017 mongo:5.0
+  docker run -d -p 8000:8000 amazon/dynamodb-local
+  docker run -d -p 6379:6379 redis:7
+
+Every store gets a scratch collection / table / key namespace, removed after the run.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+SCRATCH_NAME = 'async-benchmark'
+
+
+def synthetic_records(count: int, payload_bytes: int) -> Iterator[Dict[str, Any]]:
+    """Yield product-shaped records with a fixed-size payload"""
+    payload = 'x' * payload_bytes
+    for i in range(count):
+        yield {
+            'productId': f"bench-{i:08d}",
+            'name': f"Benchmark product {i}",
+            'category': f"category-{i % 10}",
+            'stock': i % 500,
+            'description': payload,
+        }
+
+
+def _timed(label: str, run: Callable[[], int]) -> Tuple[str, int, float]:
+    """Run a synchronous load and return (label, items written, seconds)"""
+    start = time.perf_counter()
+    written = run()
+    return label, written, time.perf_counter() - start
+
+
+async def _timed_async(label: str, run) -> Tuple[str, int, float]:
+    """Await an async load and return (label, items written, seconds)"""
+    start = time.perf_counter()
+    written = await run()
+    return label, written, time.perf_counter() - start
+
+
+def bench_documentdb(args) -> List[Tuple[str, int, float]]:
+    """Insert the records into MongoDB with DocumentDBBulkLoader and AsyncDocumentDBBulkLoader"""
+    from pymongo import MongoClient
+    from async_bulk import AsyncDocumentDBBulkLoader
+    from async_connections import ASYNC_PYMONGO_AVAILABLE
+    from documentdb_bulk import DocumentDBBulkLoader
+
+    if ASYNC_PYMONGO_AVAILABLE:
+        from pymongo import AsyncMongoClient as AsyncClient
+    else:
+        from motor.motor_asyncio import AsyncIOMotorClient as AsyncClient
+
+    client = MongoClient(args.mongo_uri, maxPoolSize=max(args.workers, args.concurrency))
+    collection = client[SCRATCH_NAME][SCRATCH_NAME]
+    results = []
+    try:
+        collection.drop()
+        loader = DocumentDBBulkLoader(collection, workers=args.workers, max_batch_docs=args.batch_docs)
+        results.append(_timed(f"threads ({args.workers})",
+                              lambda: loader.load(synthetic_records(args.records, args.payload_bytes))))
+
+        async def run_async():
+            async_client = AsyncClient(args.mongo_uri, maxPoolSize=args.concurrency)
+            try:
+                async_loader = AsyncDocumentDBBulkLoader(async_client[SCRATCH_NAME][SCRATCH_NAME],
+                                                         concurrency=args.concurrency,
+                                                         max_batch_docs=args.batch_docs)
+                return await _timed_async(f"asyncio ({args.concurrency})", lambda: async_loader.load(
+                    synthetic_records(args.records, args.payload_bytes)))
+            finally:
+                close = async_client.close()
+                if close is not None:
+                    await close
+
+        collection.drop()
+        results.append(asyncio.run(run_async()))
+    finally:
+        client.drop_database(SCRATCH_NAME)
+        client.close()
+    return results
+
+
+def bench_dynamodb(args) -> List[Tuple[str, int, float]]:
+    """Write the records to DynamoDB Local with DynamoDBBulkLoader and AsyncDynamoDBBulkLoader"""
+    # Point both boto3 and aiobotocore at the stand-in; DynamoDB Local accepts any credentials
+    os.environ['AWS_ENDPOINT_URL_DYNAMODB'] = args.dynamodb_endpoint
+    os.environ.setdefault('AWS_REGION', 'us-east-1')
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'local')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'local')
+
+    from async_bulk import AsyncDynamoDBBulkLoader
+    from async_connections import AsyncDatabaseConnections
+    from database_connections import get_boto3_session
+    from dynamodb_bulk import DynamoDBBulkLoader
+
+    client = get_boto3_session().client('dynamodb')
+
+    def create_table():
+        client.create_table(TableName=SCRATCH_NAME, BillingMode='PAY_PER_REQUEST',
+                            KeySchema=[{'AttributeName': 'productId', 'KeyType': 'HASH'}],
+                            AttributeDefinitions=[{'AttributeName': 'productId', 'AttributeType': 'S'}])
+        client.get_waiter('table_exists').wait(TableName=SCRATCH_NAME)
+
+    def drop_table():
+        try:
+            client.delete_table(TableName=SCRATCH_NAME)
+            client.get_waiter('table_not_exists').wait(TableName=SCRATCH_NAME)
+        except client.exceptions.ResourceNotFoundException:
+            pass
+
+    results = []
+    try:
+        drop_table()
+        create_table()
+        loader = DynamoDBBulkLoader(SCRATCH_NAME, workers=args.workers)
+        results.append(_timed(f"threads ({args.workers})",
+                              lambda: loader.load(synthetic_records(args.records, args.payload_bytes))))
+
+        async def run_async():
+            async with AsyncDatabaseConnections(max_connections=args.concurrency) as connections:
+                async_loader = AsyncDynamoDBBulkLoader(await connections.get_dynamodb_client(), SCRATCH_NAME,
+                                                       concurrency=args.concurrency)
+                return await _timed_async(f"asyncio ({args.concurrency})", lambda: async_loader.load(
+                    synthetic_records(args.records, args.payload_bytes)))
+
+        drop_table()
+        create_table()
+        results.append(asyncio.run(run_async()))
+    finally:
+        drop_table()
+    return results
+
+
+def bench_redis(args) -> List[Tuple[str, int, float]]:
+    """SETEX the records into Redis with RedisBulkWriter and AsyncRedisBulkWriter"""
+    import json
+    import redis
+    import redis.asyncio
+    from async_bulk import AsyncRedisBulkWriter
+    from redis_bulk import RedisBulkWriter, purge_namespace
+
+    def queue_writes(writer):
+        for record in synthetic_records(args.records, args.payload_bytes):
+            writer.setex(f"{SCRATCH_NAME}:{record['productId']}", 600, json.dumps(record))
+
+    client = redis.Redis.from_url(args.redis_url)
+    results = []
+    try:
+        purge_namespace(client, [f"{SCRATCH_NAME}:*"])
+        # Queueing is identical for both writers, so only the flush is timed
+        writer = RedisBulkWriter(client, max_buffered=args.records)
+        queue_writes(writer)
+        results.append(_timed("sequential pipelines", writer.flush))
+
+        async def run_async():
+            async_client = redis.asyncio.Redis.from_url(args.redis_url, max_connections=args.concurrency)
+            try:
+                async_writer = AsyncRedisBulkWriter(async_client, concurrency=args.concurrency)
+                queue_writes(async_writer)
+                return await _timed_async(f"asyncio ({args.concurrency})", async_writer.flush)
+            finally:
+                await async_client.aclose()
+
+        purge_namespace(client, [f"{SCRATCH_NAME}:*"])
+        results.append(asyncio.run(run_async()))
+    finally:
+        purge_namespace(client, [f"{SCRATCH_NAME}:*"])
+        client.close()
+    return results
+
+
+BENCHMARKS = {
+    'documentdb': bench_documentdb,
+    'dynamodb': bench_dynamodb,
+    'redis': bench_redis,
+}
+
+
+def main():
+    """Compare thread-pool and asyncio write strategies on local stand-ins"""
+    parser = argparse.ArgumentParser(description='Benchmark threaded vs asyncio bulk writers on local stand-ins')
+    parser.add_argument('--stores', nargs='+', choices=sorted(BENCHMARKS), default=sorted(BENCHMARKS),
+                        help='Stores to benchmark (default: all)')
+    parser.add_argument('--records', type=int, default=20000, help='Records written per strategy (default: 20000)')
+    parser.add_argument('--payload-bytes', type=int, default=1024, help='Payload size per record (default: 1024)')
+    parser.add_argument('--workers', type=int, default=4, help='Writer threads for the threaded loaders (default: 4)')
+    parser.add_argument('--concurrency', type=int, default=32, help='Batches in flight for asyncio (default: 32)')
+    parser.add_argument('--batch-docs', type=int, default=1000, help='Documents per DocumentDB batch (default: 1000)')
+    parser.add_argument('--mongo-uri', default='mongodb://localhost:27017')
+    parser.add_argument('--dynamodb-endpoint', default='http://localhost:8000')
+    parser.add_argument('--redis-url', default='redis://localhost:6379/0')
+    args = parser.parse_args()
+
+    success = True
+    print(f"{'Store':<12}{'Strategy':<24}{'Records':>10}{'Time (s)':>10}{'Records/sec':>14}")
+    for store in args.stores:
+        try:
+            results = BENCHMARKS[store](args)
+        except Exception as e:
+            print(f"{store:<12}❌ {e}")
+            success = False
+            continue
+
+        baseline = None
+        for label, written, elapsed in results:
+            rate = written / elapsed if elapsed > 0 else 0.0
+            speedup = f"  {rate / baseline:.2f}x" if baseline else ""
+            baseline = baseline or rate
+            print(f"{store:<12}{label:<24}{written:>10,}{elapsed:>10.2f}{rate:>14,.0f}{speedup}")
+            if written != args.records:
+                print(f"{'':<12}⚠️  expected {args.records:,} records")
+                success = False
+    return success
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,416 @@
+"""
+Async Bulk Operations for Unicorn E-Commerce Seeders
+asyncio counterparts of the DocumentDB, DynamoDB and Redis bulk writers
+
+Instead of a fixed pool of worker threads, every batch is its own task on one event loop and
+a semaphore bounds how many are in flight. The next batch is only read (and encoded) once a
+slot frees up, so memory stays flat the same way the threaded loaders' bounded queues keep it.
+Reading and encoding run in the default executor so the loop keeps serving responses meanwhile.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from data_loader import batched
+from documentdb_bulk import DocumentDBBulkLoader
+from dynamodb_bulk import BATCH_WRITE_LIMIT, RETRYABLE_ERROR_CODES, DynamoDBBulkLoader
+from instrumentation import instrumentation
+from redis_bulk import RedisBulkWriter, get_key_slot, purge_result
+
+# Batches in flight per loader; far more than threads would allow, since each costs one task
+DEFAULT_CONCURRENCY = 32
+
+
+async def _run_bounded(batches: Iterator[Any], write, concurrency: int):
+    """
+    Await write(batch) for every batch with at most concurrency writes in flight.
+
+    batches is a blocking iterator; each next() runs in the default executor so the event loop
+    keeps completing writes while the next batch is read and encoded.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    async def write_and_release(batch):
+        try:
+            await write(batch)
+        finally:
+            semaphore.release()
+
+    try:
+        while True:
+            await semaphore.acquire()
+            batch = await loop.run_in_executor(None, next, batches, None)
+            if batch is None:
+                semaphore.release()
+                break
+            task = asyncio.create_task(write_and_release(batch))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class AsyncDocumentDBBulkLoader(DocumentDBBulkLoader):
+    """
+    Load documents into an async (PyMongo async or Motor) DocumentDB collection.
+
+    Batching, BSON encoding, write concern profiles and result accounting are shared with
+    DocumentDBBulkLoader; only the write path is asynchronous.
+    """
+
+    def __init__(self, collection, concurrency: int = DEFAULT_CONCURRENCY, **kwargs):
+        super().__init__(collection, workers=concurrency, **kwargs)
+        self.concurrency = self.workers
+
+    async def _write_batch(self, batch, batch_bytes: int, key_field: Optional[str] = None):
+        """Write one batch with an unordered bulk_write, retrying network errors"""
+        attempt = 0
+        while True:
+            try:
+                result = await self.collection.bulk_write(self._build_requests(batch, key_field), ordered=False)
+                written = result.inserted_count + result.upserted_count + result.matched_count
+                failed = 0
+                break
+            except BulkWriteError as e:
+                written, failed = self._bulk_write_error_counts(e, len(batch), attempt)
+                break
+            except AutoReconnect as e:
+                if attempt >= self.max_retries:
+                    print(f"Failed to write batch of {len(batch)} documents to {self.collection.name}: {e}")
+                    written, failed = 0, len(batch)
+                    break
+                attempt += 1
+                self.retries += 1
+                instrumentation.record_retry('documentdb')
+                await asyncio.sleep(self._backoff_delay(attempt))
+
+        self._record_batch(len(batch), batch_bytes, written, failed)
+
+    async def load(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Insert all documents and return how many were written successfully"""
+        return await self._run(documents, key_field=None)
+
+    async def upsert(self, documents: Iterable[Dict[str, Any]], key_field: str) -> int:
+        """Replace (or insert) each document matched on key_field and return how many were written"""
+        return await self._run(documents, key_field=key_field)
+
+    async def delete(self, key_field: str, keys: Iterable[Any], chunk_size: int = 1000) -> int:
+        """Delete the documents whose key_field is in keys and return how many were deleted"""
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            self.collection.delete_many({key_field: {'$in': list(chunk)}})
+            for chunk in batched(keys, chunk_size)
+        ))
+        self.elapsed += time.perf_counter() - start
+        return sum(result.deleted_count for result in results)
+
+    async def _run(self, documents: Iterable[Dict[str, Any]], key_field: Optional[str]) -> int:
+        """Write encoded batches as bounded concurrent tasks and wait for them to finish"""
+        written_before = self.docs_written
+
+        async def write(item: Tuple[list, int, list]):
+            batch, batch_bytes, _ = item
+            try:
+                await self._write_batch(batch, batch_bytes, key_field)
+            except Exception as e:
+                print(f"Failed to write batch of {len(batch)} documents to {self.collection.name}: {e}")
+                self.docs_failed += len(batch)
+
+        start = time.perf_counter()
+        try:
+            # Upserts keep the stored _id, so only plain inserts get a client-side one
+            await _run_bounded(self._iter_batches(documents, assign_ids=key_field is None), write,
+                               self.concurrency)
+        finally:
+            self.elapsed += time.perf_counter() - start
+        return self.docs_written - written_before
+
+    def print_stats(self, label: str = "DocumentDB async bulk load"):
+        """Print throughput statistics for this loader"""
+        print(f"{label}: {self.docs_written:,} documents ({self.bytes_written / (1024 * 1024):,.1f} MB) "
+              f"written with up to {self.concurrency} batches in flight in {self.elapsed:.2f}s "
+              f"({self.docs_per_second:,.0f} docs/sec, {self.mb_per_second:,.1f} MB/sec)")
+        print(f"  Batches: {self.batches:,}, retries: {self.retries:,}")
+        if self.docs_failed:
+            print(f"  Failed documents: {self.docs_failed:,}")
+
+
+class AsyncDynamoDBBulkLoader(DynamoDBBulkLoader):
+    """
+    Load items into a DynamoDB table through one aiobotocore client.
+
+    Request building, UnprocessedItems retries and capacity accounting are shared with
+    DynamoDBBulkLoader. The client's connection pool must allow concurrency connections.
+    """
+
+    def __init__(self, client, table_name: str, concurrency: int = DEFAULT_CONCURRENCY, **kwargs):
+        self.client = client
+        super().__init__(table_name, workers=concurrency, **kwargs)
+        self.concurrency = self.workers
+
+    def _create_clients(self) -> list:
+        """The async loader shares the single client it was given"""
+        return []
+
+    async def _write_batch(self, requests: List[Dict[str, Any]]):
+        """Write one batch of up to 25 requests, retrying unprocessed items until done or out of retries"""
+        request_items = {self.table_name: requests}
+        pending = len(requests)
+        attempt = 0
+
+        while pending:
+            try:
+                response = await self.client.batch_write_item(RequestItems=request_items,
+                                                              ReturnConsumedCapacity='TOTAL')
+            except ClientError as e:
+                code = e.response.get('Error', {}).get('Code')
+                if code in RETRYABLE_ERROR_CODES and attempt < self.max_retries:
+                    attempt += 1
+                    self.retries += 1
+                    instrumentation.record_retry('dynamodb')
+                    await asyncio.sleep(self._backoff_delay(attempt))
+                    continue
+                print(f"Failed to write batch of {pending} items to {self.table_name}: {e}")
+                self.items_failed += pending
+                return
+
+            unprocessed = self._record_response(response, pending)
+            pending = len(unprocessed)
+            if not pending:
+                return
+            if attempt >= self.max_retries:
+                print(f"Giving up on {pending} unprocessed items for {self.table_name} after {attempt} retries")
+                self.items_failed += pending
+                return
+
+            attempt += 1
+            self.retries += 1
+            instrumentation.record_retry('dynamodb')
+            request_items = {self.table_name: unprocessed}
+            await asyncio.sleep(self._backoff_delay(attempt))
+
+    async def load(self, items: Iterable[Dict[str, Any]]) -> int:
+        """Write all items and return how many were written successfully"""
+        return await self._run(items, 'put')
+
+    async def delete(self, keys: Iterable[Dict[str, Any]]) -> int:
+        """Delete the items with the given primary keys and return how many requests succeeded"""
+        return await self._run(keys, 'delete')
+
+    async def _run(self, items: Iterable[Dict[str, Any]], kind: str) -> int:
+        """Write batches of 25 requests as bounded concurrent tasks"""
+        written_before = self.items_written
+        # Serialization happens while the batch is read, off the event loop
+        requests = ([self._build_request(kind, item) for item in batch]
+                    for batch in batched(items, BATCH_WRITE_LIMIT))
+
+        async def write(batch: List[Dict[str, Any]]):
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                print(f"Failed to write batch of {len(batch)} items to {self.table_name}: {e}")
+                self.items_failed += len(batch)
+
+        start = time.perf_counter()
+        try:
+            await _run_bounded(requests, write, self.concurrency)
+        finally:
+            self.elapsed += time.perf_counter() - start
+        return self.items_written - written_before
+
+    def print_stats(self, label: str = "DynamoDB async bulk load"):
+        """Print throughput and capacity statistics for this loader"""
+        print(f"{label}: {self.items_written:,} items written with up to {self.concurrency} batches in flight "
+              f"in {self.elapsed:.2f}s ({self.items_per_second:,.0f} items/sec)")
+        print(f"  Requests: {self.requests:,}, retries: {self.retries:,}, "
+              f"consumed capacity: {self.consumed_capacity:,.1f} WCU")
+        if self.items_failed:
+            print(f"  Failed items: {self.items_failed:,}")
+
+
+async def get_key_attributes_async(client, table_name: str) -> List[str]:
+    """Return the table's key attribute names from its KeySchema"""
+    description = await client.describe_table(TableName=table_name)
+    return [key['AttributeName'] for key in description['Table']['KeySchema']]
+
+
+async def scan_segments_async(client, table_name: str, segments: int = 8, **scan_kwargs) -> List[Dict[str, Any]]:
+    """Run a paginated parallel scan with all segments in flight at once and return the raw items"""
+    segments = max(1, segments)
+
+    async def scan_segment(segment: int) -> List[Dict[str, Any]]:
+        kwargs = dict(scan_kwargs, Segment=segment, TotalSegments=segments)
+        items = []
+        while True:
+            response = await client.scan(TableName=table_name, **kwargs)
+            items.extend(response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return items
+            kwargs['ExclusiveStartKey'] = last_key
+
+    results = await asyncio.gather(*(scan_segment(segment) for segment in range(segments)))
+    return [item for items in results for item in items]
+
+
+async def truncate_table_async(client, table_name: str, segments: int = 8,
+                               concurrency: int = DEFAULT_CONCURRENCY) -> int:
+    """Delete every item in a DynamoDB table with a parallel key-only scan and return the count"""
+    key_names = await get_key_attributes_async(client, table_name)
+    attribute_names = {f"#k{i}": name for i, name in enumerate(key_names)}
+    start = time.perf_counter()
+    keys = await scan_segments_async(client, table_name, segments,
+                                     ProjectionExpression=', '.join(attribute_names),
+                                     ExpressionAttributeNames=attribute_names)
+
+    # Scanned keys are in the low-level attribute format; the loader serializes plain values
+    deserializer = TypeDeserializer()
+    loader = AsyncDynamoDBBulkLoader(client, table_name, concurrency=concurrency)
+    deleted_count = await loader.delete(
+        {name: deserializer.deserialize(value) for name, value in key.items()} for key in keys)
+
+    elapsed = time.perf_counter() - start
+    rate = deleted_count / elapsed if elapsed > 0 else 0.0
+    print(f"Truncated {table_name}: {deleted_count:,} items deleted across {segments} segments "
+          f"in {elapsed:.2f}s ({rate:,.0f} items/sec)")
+    return deleted_count
+
+
+async def count_items_async(client, table_name: str, segments: int = 8) -> int:
+    """Count every item in a table with a parallel COUNT scan"""
+    segments = max(1, segments)
+
+    async def count_segment(segment: int) -> int:
+        kwargs = {'Select': 'COUNT', 'Segment': segment, 'TotalSegments': segments}
+        total = 0
+        while True:
+            response = await client.scan(TableName=table_name, **kwargs)
+            total += response['Count']
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return total
+            kwargs['ExclusiveStartKey'] = last_key
+
+    return sum(await asyncio.gather(*(count_segment(segment) for segment in range(segments))))
+
+
+class AsyncRedisBulkWriter(RedisBulkWriter):
+    """
+    Buffer Redis commands by hash slot and flush them as concurrent pipelines.
+
+    Commands are queued synchronously (so the seeders' command builders work unchanged) and
+    only sent by await flush(); up to concurrency pipelines are in flight at a time. Callers
+    queueing many commands await flush() whenever needs_flush is set, or hand a generator that
+    queues them to queue_from(), so at most max_buffered commands are held in memory.
+    """
+
+    def __init__(self, redis_client, chunk_size: int = 500, max_buffered: int = 50000,
+                 concurrency: int = DEFAULT_CONCURRENCY):
+        super().__init__(redis_client, chunk_size=chunk_size, max_buffered=max_buffered)
+        self.concurrency = max(1, concurrency)
+
+    def add(self, command: str, key, *args):
+        """Queue a single-key command; it is sent by the next await flush()"""
+        self._buffer_command(command, key, args)
+
+    async def queue_from(self, writes: Iterable[Any]):
+        """Run a generator that queues commands on this writer, flushing each time the buffer fills"""
+        for _ in writes:
+            if self.needs_flush:
+                await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Send all buffered commands as pipelines, up to concurrency at a time.
+
+        A slot whose commands straddle a chunk boundary puts both chunks in one lane, which
+        sends them one after the other, so commands for the same key keep their order.
+        """
+        if not self._buffered:
+            return 0
+
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(lane):
+            sent = 0
+            for chunk in lane:
+                async with semaphore:
+                    sent += await self._execute(chunk)
+            return sent
+
+        sent = sum(await asyncio.gather(*(send(lane) for lane in self._take_lanes())))
+        self.elapsed += time.perf_counter() - start
+        return sent
+
+    def _take_lanes(self) -> List[List[List[Tuple[str, Any, tuple]]]]:
+        """Empty the buffer into lanes of chunks; consecutive chunks sharing a slot share a lane"""
+        lanes = []
+        last_slot = None
+        for chunk in self._take_chunks():
+            # Chunks follow slot order, so only a chunk's first slot can continue the previous one
+            if lanes and get_key_slot(chunk[0][1]) == last_slot:
+                lanes[-1].append(chunk)
+            else:
+                lanes.append([chunk])
+            last_slot = get_key_slot(chunk[-1][1])
+        return lanes
+
+    async def _execute(self, chunk: List[Tuple[str, Any, tuple]]) -> int:
+        """Execute one chunk of commands as a non-transactional pipeline"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for command, key, args in chunk:
+            getattr(pipe, command)(key, *args)
+
+        self._record_errors(await pipe.execute(raise_on_error=False))
+        self.commands_sent += len(chunk)
+        self.pipelines_sent += 1
+        return len(chunk)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.flush()
+
+
+async def purge_namespace_async(redis_client, patterns: List[str], batch_size: int = 500,
+                                chunk_size: int = 100, scan_count: int = 1000) -> int:
+    """Async purge_namespace: SCAN for the patterns and UNLINK matches in slot-grouped pipelines"""
+    writer = AsyncRedisBulkWriter(redis_client, chunk_size=chunk_size)
+    pending: Dict[int, list] = {}
+
+    async def scan_keys_async(pattern: str):
+        if not any(ch in pattern for ch in '*?['):
+            if await redis_client.exists(pattern):
+                yield pattern
+            return
+        async for key in redis_client.scan_iter(match=pattern, count=scan_count):
+            yield key
+
+    for pattern in patterns:
+        async for key in scan_keys_async(pattern):
+            slot_keys = pending.setdefault(get_key_slot(key), [])
+            slot_keys.append(key)
+            if len(slot_keys) >= batch_size:
+                writer.add('unlink', *slot_keys)
+                slot_keys.clear()
+                if writer.needs_flush:
+                    await writer.flush()
+
+    for slot_keys in pending.values():
+        if slot_keys:
+            writer.add('unlink', *slot_keys)
+            if writer.needs_flush:
+                await writer.flush()
+
+    await writer.flush()
+    return purge_result(writer, patterns)
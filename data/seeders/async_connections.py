@@ -0,0 +1,232 @@
+"""
+Async Database Connection Handler for Unicorn E-Commerce Seeders
+Provides asyncio clients for DocumentDB, DynamoDB, and ElastiCache
+
+Connection settings and credentials come from the same environment variables and Secrets
+Manager secret as database_connections, so the async seeders run wherever the threaded ones do.
+Timeouts, keepalive, compression and retries follow the same pool profile; only the pool size
+is set by max_connections, since one event loop keeps many more requests in flight.
+"""
+import os
+import sys
+from contextlib import AsyncExitStack
+
+# Check for required dependencies. PyMongo's native async client is Motor's successor and is
+# preferred; Motor is used with older PyMongo releases
+try:
+    from pymongo import AsyncMongoClient
+    ASYNC_PYMONGO_AVAILABLE = True
+except ImportError:
+    ASYNC_PYMONGO_AVAILABLE = False
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    MOTOR_AVAILABLE = True
+except ImportError:
+    MOTOR_AVAILABLE = False
+
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import get_session
+    AIOBOTOCORE_AVAILABLE = True
+except ImportError:
+    AIOBOTOCORE_AVAILABLE = False
+
+try:
+    from redis.asyncio import RedisCluster as AsyncRedisCluster
+    REDIS_ASYNCIO_AVAILABLE = True
+except ImportError:
+    REDIS_ASYNCIO_AVAILABLE = False
+
+from database_connections import MONGO_AUTHENTICATION_FAILED, db_connections
+
+# Connections each client may open; sized for thousands of writes in flight from one event loop
+DEFAULT_MAX_CONNECTIONS = 64
+
+
+class AsyncDatabaseConnections:
+    """Centralized asyncio database connection manager"""
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        self.max_connections = max_connections
+        self.documentdb_client = None
+        self.documentdb_db = None
+        self.dynamodb_client = None
+        self.elasticache_client = None
+        self._exit_stack = AsyncExitStack()
+
+    async def get_documentdb_collection(self, collection_name: str):
+        """Get a specific DocumentDB collection"""
+        if self.documentdb_client is None:
+            await self._connect_to_documentdb()
+        return self.documentdb_db[collection_name]
+
+    async def get_dynamodb_client(self):
+        """Get the low-level async DynamoDB client"""
+        if self.dynamodb_client is None:
+            await self._connect_to_dynamodb()
+        return self.dynamodb_client
+
+    async def get_elasticache_connection(self):
+        """Get the async ElastiCache RedisCluster client"""
+        if self.elasticache_client is None:
+            await self._connect_to_elasticache()
+        return self.elasticache_client
+
+    async def _connect_to_documentdb(self):
+        """Connect to DocumentDB with PyMongo's async client (or Motor)"""
+        if not ASYNC_PYMONGO_AVAILABLE and not MOTOR_AVAILABLE:
+            print("ERROR: an async MongoDB driver is required but not available")
+            print("Please install pymongo>=4.13 or motor: pip install -U pymongo")
+            sys.exit(1)
+
+        host = os.environ.get('DOCUMENTDB_HOST')
+        port = os.environ.get('DOCUMENTDB_PORT', '27017')
+        database = os.environ.get('DOCUMENTDB_DATABASE', 'unicorn-ecommerce-dev')
+        ssl_ca_certs = os.environ.get('DOCUMENTDB_SSL_CA_CERTS')
+
+        if not host:
+            print("ERROR: Missing required DocumentDB environment variables:")
+            print("  DOCUMENTDB_HOST: ✗ Missing")
+            sys.exit(1)
+
+        try:
+            username, password = db_connections._get_documentdb_credentials()
+            if not username or not password:
+                print("ERROR: DocumentDB credentials not available from Secrets Manager or environment variables")
+                sys.exit(1)
+
+            connection_string, connection_options = db_connections._documentdb_client_settings(
+                host, port, database, username, password, ssl_ca_certs)
+            connection_options['maxPoolSize'] = self.max_connections
+
+            print(f"Connecting to DocumentDB at {host}:{port} (async)")
+            client_class = AsyncMongoClient if ASYNC_PYMONGO_AVAILABLE else AsyncIOMotorClient
+            client = client_class(connection_string, **connection_options)
+            await client.admin.command('ping')
+
+            self.documentdb_client = client
+            self.documentdb_db = client[database]
+            print(f"✅ Successfully connected to DocumentDB database: {database} (async)")
+
+        except Exception as e:
+            if getattr(e, 'code', None) == MONGO_AUTHENTICATION_FAILED:
+                db_connections.invalidate_database_credentials()
+            print(f"ERROR: Failed to connect to DocumentDB (async): {e}")
+            print(f"  Host: {host}")
+            print(f"  Port: {port}")
+            print(f"  Database: {database}")
+            sys.exit(1)
+
+    async def _connect_to_dynamodb(self):
+        """Create an aiobotocore DynamoDB client (honours AWS_ENDPOINT_URL_DYNAMODB)"""
+        if not AIOBOTOCORE_AVAILABLE:
+            print("ERROR: aiobotocore is required but not available")
+            print("Please install aiobotocore: pip install aiobotocore")
+            sys.exit(1)
+
+        region = os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION'))
+        if not region:
+            print("ERROR: Missing required AWS region environment variable:")
+            print("  AWS_REGION or AWS_DEFAULT_REGION must be set")
+            sys.exit(1)
+
+        try:
+            print(f"Connecting to DynamoDB in region: {region} (async)")
+            # botocore's default pool of 10 connections would cap the writes in flight
+            config = AioConfig(**dict(db_connections.pool_profile.botocore_config_kwargs(),
+                                      max_pool_connections=self.max_connections))
+            self.dynamodb_client = await self._exit_stack.enter_async_context(
+                get_session().create_client('dynamodb', region_name=region, config=config))
+            print(f"✅ Successfully connected to DynamoDB in region: {region} (async)")
+
+        except Exception as e:
+            print(f"ERROR: Failed to connect to DynamoDB (async): {e}")
+            print(f"  Region: {region}")
+            sys.exit(1)
+
+    async def _connect_to_elasticache(self):
+        """Connect to ElastiCache with redis.asyncio.RedisCluster"""
+        if not REDIS_ASYNCIO_AVAILABLE:
+            print("ERROR: redis>=4.3 is required for asyncio cluster support")
+            print("Please install redis: pip install -U redis")
+            sys.exit(1)
+
+        host = os.environ.get('ELASTICACHE_HOST')
+        port = os.environ.get('ELASTICACHE_PORT', '6379')
+
+        if not host:
+            print("ERROR: Missing required ElastiCache environment variables:")
+            print("  ELASTICACHE_HOST: ✗ Missing")
+            sys.exit(1)
+
+        try:
+            print(f"Connecting to ElastiCache at {host}:{port} (async)")
+            cluster_config = db_connections._elasticache_cluster_config(host, port)
+
+            # The asyncio cluster client names the coverage check differently and retries
+            # timeouts on its own
+            cluster_config['require_full_coverage'] = not cluster_config.pop('skip_full_coverage_check')
+            cluster_config.pop('retry_on_timeout', None)
+            cluster_config['max_connections'] = self.max_connections
+
+            client = AsyncRedisCluster(**cluster_config)
+            await client.ping()
+
+            self.elasticache_client = client
+            print(f"✅ Successfully connected to ElastiCache: {host}:{port} (async)")
+
+        except Exception as e:
+            print(f"ERROR: Failed to connect to ElastiCache (async): {e}")
+            print(f"  Host: {host}")
+            print(f"  Port: {port}")
+            sys.exit(1)
+
+    async def close_connections(self):
+        """Close all async database connections"""
+        if self.documentdb_client is not None:
+            close = self.documentdb_client.close()
+            if close is not None:
+                # AsyncMongoClient.close() is a coroutine; Motor's is synchronous
+                await close
+            self.documentdb_client = None
+            print("DocumentDB async connection closed")
+
+        if self.elasticache_client is not None:
+            await self.elasticache_client.aclose()
+            self.elasticache_client = None
+            print("ElastiCache async connection closed")
+
+        await self._exit_stack.aclose()
+        self.dynamodb_client = None
+        print("All async database connections closed")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close_connections()
+
+
+# Global instance for reuse across async seeders
+async_db_connections = AsyncDatabaseConnections()
+
+
+async def get_async_documentdb_collection(collection_name: str):
+    """Convenience function to get an async DocumentDB collection"""
+    return await async_db_connections.get_documentdb_collection(collection_name)
+
+
+async def get_async_dynamodb_client():
+    """Convenience function to get the async DynamoDB client"""
+    return await async_db_connections.get_dynamodb_client()
+
+
+async def get_async_elasticache_client():
+    """Convenience function to get the async ElastiCache client"""
+    return await async_db_connections.get_elasticache_connection()
+
+
+async def close_all_async_connections():
+    """Convenience function to close all async connections"""
+    await async_db_connections.close_connections()
@@ -0,0 +1,307 @@
+"""
+Async Seeding Tasks for Unicorn E-Commerce
+asyncio write paths for every seeder, run by seed_all.py --async
+
+Each task reuses its seeder's record preparation (in the process pool), index registry and
+cache key layout; only the writes differ. Every store is written from one event loop with up
+to --concurrency batches in flight, instead of a handful of writer threads. These are full
+reseeds; incremental and blue/green modes stay on the threaded path.
+"""
+import argparse
+import asyncio
+import inspect
+import os
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List
+
+from async_bulk import (
+    AsyncDocumentDBBulkLoader,
+    AsyncDynamoDBBulkLoader,
+    AsyncRedisBulkWriter,
+    count_items_async,
+    purge_namespace_async,
+    truncate_table_async
+)
+from async_connections import async_db_connections
+from autocomplete import autocomplete_options
+from data_loader import iter_records, output_file_exists
+from embedding_store import open_embedding_store
+from incremental import stamp_content_hash
+from index_registry import (
+    IndexSpec,
+    KNOWLEDGE_BASE_INDEXES,
+    PRODUCT_INDEXES,
+    REVIEW_INDEXES,
+    REVIEW_STATS_INDEXES,
+    sync_indexes_async
+)
+from prep_pool import parallel_prepare
+from redis_bulk import PurgeError
+
+
+async def seed_collection_async(collection_name: str, documents: Iterable[Dict[str, Any]],
+                                specs: List[IndexSpec], label: str, concurrency: int) -> bool:
+    """Replace a DocumentDB collection's documents, sync its indexes and verify the count"""
+    collection = await async_db_connections.get_documentdb_collection(collection_name)
+
+    print(f"Clearing existing {label.lower()} documents...")
+    delete_result = await collection.delete_many({})
+    print(f"Deleted {delete_result.deleted_count} existing {label.lower()} documents")
+
+    expected_count = 0
+
+    def counted_documents():
+        nonlocal expected_count
+        for document in documents:
+            expected_count += 1
+            # Failed records are reported by the preparation worker and show up in the count check
+            if document is not None:
+                yield document
+
+    loader = AsyncDocumentDBBulkLoader(collection, concurrency=concurrency)
+    inserted_count = await loader.load(counted_documents())
+    loader.print_stats(f"{label} async bulk load")
+    print(f"Successfully seeded {inserted_count} {label.lower()} documents to DocumentDB")
+
+    indexes_ok = await sync_indexes_async(collection, specs)
+
+    actual_count = await collection.count_documents({})
+    print(f"Verification: {actual_count} {label.lower()} documents found in DocumentDB collection {collection_name}")
+    return actual_count == expected_count and indexes_ok
+
+
+async def seed_table_async(table_env_var: str, items: Iterator[Dict[str, Any]], label: str,
+                           concurrency: int, segments: int = 8) -> bool:
+    """Replace a DynamoDB table's items and verify the count"""
+    table_name = os.environ.get(table_env_var)
+    if not table_name:
+        print(f"ERROR: Missing required DynamoDB table environment variable: {table_env_var}")
+        return False
+    client = await async_db_connections.get_dynamodb_client()
+
+    print(f"Clearing existing {label.lower()} records...")
+    await truncate_table_async(client, table_name, segments=segments, concurrency=concurrency)
+
+    record_count = 0
+
+    def counted_items():
+        nonlocal record_count
+        for item in items:
+            record_count += 1
+            if item is not None:
+                yield item
+
+    loader = AsyncDynamoDBBulkLoader(client, table_name, concurrency=concurrency)
+    inserted_count = await loader.load(counted_items())
+    loader.print_stats(f"{label} async bulk load")
+    print(f"Successfully seeded {inserted_count} {label.lower()} records to DynamoDB")
+
+    actual_count = await count_items_async(client, table_name, segments=segments)
+    print(f"Verification: {actual_count} records found in DynamoDB table")
+    return actual_count == record_count
+
+
+async def seed_products_async(args: argparse.Namespace) -> bool:
+    """Seed products to DocumentDB"""
+    from product_seeder import EMBEDDING_FILTER, ProductSeeder, prepare_product_for_load, report_embedding_coverage
+
+    if not output_file_exists('products.json'):
+        print("No products found. Please run product_generator.py first.")
+        return False
+
+    if not ProductSeeder.validate_product_data(iter_records('products.json', ProductSeeder.VALIDATION_FIELDS)):
+        if not args.force:
+            print("Product data validation failed (use --force to seed anyway)")
+            return False
+        print("Warning: Product data validation failed - continuing because --force is set")
+
+    embeddings = open_embedding_store('products.json')
+    prepare = partial(prepare_product_for_load, embeddings_source='products.json' if embeddings else None)
+    documents = parallel_prepare(iter_records('products.json'), prepare, processes=args.prep_processes)
+    if not await seed_collection_async('products', documents, PRODUCT_INDEXES, 'Product', args.concurrency):
+        return False
+
+    # Same embedding coverage check as the threaded path: vector search needs the embeddings
+    collection = await async_db_connections.get_documentdb_collection('products')
+    print("\nVerifying embeddings...")
+    return report_embedding_coverage(
+        await collection.count_documents(EMBEDDING_FILTER),
+        await collection.count_documents({}),
+        await collection.find_one(EMBEDDING_FILTER)
+    )
+
+
+async def seed_inventory_async(args: argparse.Namespace) -> bool:
+    """Seed inventory to DynamoDB"""
+    from inventory_seeder import InventorySeeder, prepare_inventory_for_load
+
+    if not output_file_exists('inventory.json'):
+        print("No inventory records found. Please run inventory_generator.py first.")
+        return False
+
+    InventorySeeder.validate_inventory_product_correlation(
+        iter_records('inventory.json', InventorySeeder.VALIDATION_FIELDS))
+
+    def valid_items():
+        prepared = parallel_prepare(iter_records('inventory.json'), prepare_inventory_for_load,
+                                    processes=args.prep_processes)
+        for i, item in enumerate(prepared):
+            if item is not None and 'productId' not in item:
+                print(f"Skipping record {i+1}: missing productId")
+                item = None
+            yield item
+
+    return await seed_table_async('INVENTORY_TABLE', valid_items(), 'Inventory', args.concurrency)
+
+
+async def seed_reviews_async(args: argparse.Namespace) -> bool:
+    """Seed reviews to DocumentDB (skipped when reviews.json is absent)"""
+    if not output_file_exists('reviews.json'):
+        print("No reviews.json found. Skipping review seeding.")
+        return True
+
+    documents = parallel_prepare(iter_records('reviews.json'), stamp_content_hash,
+                                 processes=args.prep_processes)
+    return await seed_collection_async('reviews', documents, REVIEW_INDEXES, 'Review', args.concurrency)
+
+
+async def _aiter_batches(cursor, batch_size: int):
+    """Group an async cursor's documents into lists of at most batch_size"""
+    batch = []
+    async for document in cursor:
+        batch.append(document)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def seed_review_stats_async(args: argparse.Namespace) -> bool:
+    """Materialize per-product review stats into products and review_stats (skipped when reviews.json is absent)"""
+    from review_aggregates import (
+        REVIEW_STATS_COLLECTION,
+        WRITE_BATCH_SIZE,
+        empty_stats,
+        product_fields,
+        refresh_requests,
+        review_stats_pipeline,
+        stats_from_group
+    )
+
+    if not output_file_exists('reviews.json'):
+        print("No reviews.json found. Skipping review aggregation.")
+        return True
+
+    reviews = await async_db_connections.get_documentdb_collection('reviews')
+    products = await async_db_connections.get_documentdb_collection('products')
+    stats = await async_db_connections.get_documentdb_collection(REVIEW_STATS_COLLECTION)
+    if not await sync_indexes_async(stats, REVIEW_STATS_INDEXES):
+        return False
+
+    updated_at = datetime.now().isoformat()
+    print("Aggregating review statistics per product...")
+    cursor = reviews.aggregate(review_stats_pipeline())
+    if inspect.isawaitable(cursor):
+        cursor = await cursor
+    product_count = 0
+    async for batch in _aiter_batches(cursor, WRITE_BATCH_SIZE):
+        requests = [refresh_requests(stats_from_group(group, updated_at)) for group in batch]
+        await asyncio.gather(stats.bulk_write([request for request, _ in requests], ordered=False),
+                             products.bulk_write([request for _, request in requests], ordered=False))
+        product_count += len(batch)
+    print(f"Materialized review stats for {product_count:,} products")
+
+    await stats.delete_many({'updatedAt': {'$ne': updated_at}})
+    await products.update_many({'reviewStats.updatedAt': {'$ne': updated_at}},
+                               {'$set': product_fields(empty_stats(updated_at))})
+    return True
+
+
+async def seed_knowledge_base_async(args: argparse.Namespace) -> bool:
+    """Seed knowledge base articles to DocumentDB"""
+    from knowledge_base_seeder import prepare_article_for_load
+
+    if not output_file_exists('knowledge_base.json'):
+        print("No knowledge_base.json found. Skipping knowledge base seeding.")
+        return True
+
+    embeddings = open_embedding_store('knowledge_base.json')
+    prepare = partial(prepare_article_for_load, embeddings_source='knowledge_base.json' if embeddings else None)
+    documents = parallel_prepare(iter_records('knowledge_base.json'), prepare, processes=args.prep_processes)
+    return await seed_collection_async('knowledge_base', documents, KNOWLEDGE_BASE_INDEXES, 'Knowledge base',
+                                       args.concurrency)
+
+
+async def seed_search_analytics_async(args: argparse.Namespace) -> bool:
+    """Seed search behaviors to DynamoDB"""
+    from search_analytics_seeder import prepare_search_analytics_for_load
+
+    if not output_file_exists('search_behaviors.json'):
+        print("No search_behaviors.json found. Skipping search analytics seeding.")
+        return True
+
+    items = parallel_prepare(iter_records('search_behaviors.json'), prepare_search_analytics_for_load,
+                             processes=args.prep_processes)
+    return await seed_table_async('SEARCH_ANALYTICS_TABLE', items, 'Search analytics', args.concurrency)
+
+
+async def seed_elasticache_async(args: argparse.Namespace) -> bool:
+    """Seed popular search terms to ElastiCache"""
+    from database_connections import get_elasticache_client
+    from elasticache_seeder import (
+        SEARCH_CACHE_PATTERNS,
+        iter_popular_term_writes,
+        queue_search_behavior_writes,
+        verify_search_cache
+    )
+
+    if not output_file_exists('popular_search_terms.json'):
+        print("No popular_search_terms.json found. Skipping ElastiCache seeding.")
+        return True
+
+    client = await async_db_connections.get_elasticache_connection()
+    print("🔄 Seeding popular search terms to ElastiCache...")
+
+    try:
+        deleted_count = await purge_namespace_async(client, SEARCH_CACHE_PATTERNS)
+    except PurgeError as e:
+        print(f"❌ Could not clear existing cache: {e}")
+        return False
+    if deleted_count:
+        print(f"✅ Cleared {deleted_count} existing search cache keys")
+
+    writer = AsyncRedisBulkWriter(client, concurrency=args.concurrency)
+    await writer.queue_from(iter_popular_term_writes(writer, iter_records('popular_search_terms.json'),
+                                                     **autocomplete_options(args)))
+    await writer.flush()
+    writer.print_stats("Search term cache writes (async)")
+    if writer.errors:
+        print("❌ Search term cache writes failed")
+        return False
+
+    # Behaviors are not critical, matching the threaded path
+    behavior_writer = AsyncRedisBulkWriter(client, concurrency=args.concurrency)
+    queue_search_behavior_writes(behavior_writer)
+    await behavior_writer.flush()
+    if behavior_writer.errors:
+        print(f"⚠️  Failed to seed search behaviors to ElastiCache (non-critical): {behavior_writer.first_error}")
+
+    # The verification checks are synchronous, so they run on the threaded client off the event loop
+    def verify() -> bool:
+        return verify_search_cache(get_elasticache_client(), args.autocomplete_mode, args.autocomplete_top_k)
+
+    return await asyncio.to_thread(verify)
+
+
+# seed_all.py task name -> async write path
+ASYNC_SEED_TASKS = {
+    'products': seed_products_async,
+    'inventory': seed_inventory_async,
+    'elasticache': seed_elasticache_async,
+    'reviews': seed_reviews_async,
+    'review_stats': seed_review_stats_async,
+    'knowledge_base': seed_knowledge_base_async,
+    'search_analytics': seed_search_analytics_async,
+}
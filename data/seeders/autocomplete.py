@@ -0,0 +1,304 @@
+"""
+Autocomplete Index Builder for Unicorn E-Commerce
+Builds ranked autocomplete data from popular search terms and serves prefix lookups.
+
+Two Redis layouts are supported:
+  * prefix     - one search:autocomplete:<prefix> JSON list per prefix
+  * sorted_set - two sorted sets holding every term, queried with ZRANGEBYLEX, plus a small
+                 top-K sorted set per short prefix, whose lexicographic range is too wide to rank
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+# Key layout for the per-prefix JSON mode
+AUTOCOMPLETE_PREFIX_NAMESPACE = 'search:autocomplete'
+
+# Key layout for the sorted set mode: every term in a lexicographic set (score 0, member
+# "<term>\x00<searchVolume>") plus a completion set scored by searchVolume, and the top-K
+# terms of each prefix up to the indexed length in <ranked key>:<prefix>
+AUTOCOMPLETE_LEX_KEY = 'search:autocomplete_lex'
+AUTOCOMPLETE_RANKED_KEY = 'search:autocomplete_ranked'
+AUTOCOMPLETE_MODES = ('prefix', 'sorted_set')
+
+_MEMBER_SEPARATOR = '\x00'
+
+
+def add_autocomplete_arguments(parser: argparse.ArgumentParser):
+    """Add the autocomplete layout options shared by every ElastiCache seeding entry point"""
+    parser.add_argument('--autocomplete-prefix-length', type=int, default=4,
+                        help='Longest autocomplete prefix to index, 0 for full term length (default: 4)')
+    parser.add_argument('--autocomplete-top-k', type=int, default=10,
+                        help='Suggestions kept per autocomplete prefix (default: 10)')
+    parser.add_argument('--autocomplete-term-limit', type=int, default=None,
+                        help='Index only the N highest-volume terms (default: all terms)')
+    parser.add_argument('--autocomplete-mode', choices=AUTOCOMPLETE_MODES, default='prefix',
+                        help='Store autocomplete as per-prefix JSON keys or as sorted sets (default: prefix)')
+
+
+def autocomplete_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """The autocomplete keyword arguments (for ElastiCacheSeeder or the popular-term queue functions) parsed from args"""
+    return {
+        'autocomplete_mode': args.autocomplete_mode,
+        'autocomplete_prefix_length': args.autocomplete_prefix_length,
+        'autocomplete_top_k': args.autocomplete_top_k,
+        'autocomplete_term_limit': args.autocomplete_term_limit,
+    }
+
+
+def rank_terms(terms_data: List[Dict[str, Any]], term_limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Deduplicate terms (keeping the highest volume) and sort them by searchVolume descending"""
+    best = {}
+    for term_data in terms_data:
+        term = term_data['term'].lower()
+        volume = term_data.get('searchVolume', 0)
+        if term not in best or volume > best[term]['searchVolume']:
+            best[term] = {'term': term, 'searchVolume': volume}
+
+    ranked = sorted(best.values(), key=lambda t: (-t['searchVolume'], t['term']))
+    return ranked[:term_limit] if term_limit else ranked
+
+
+def build_autocomplete_index(terms_data: List[Dict[str, Any]],
+                             max_prefix_length: Optional[int] = 4,
+                             top_k: int = 10,
+                             term_limit: Optional[int] = None) -> Dict[str, List[str]]:
+    """
+    Build a prefix -> top-K terms map ranked by searchVolume.
+
+    max_prefix_length of None (or 0) indexes every prefix up to the full term length;
+    term_limit of None indexes every term rather than only the most popular ones.
+    """
+    index: Dict[str, List[str]] = {}
+    # Terms arrive in rank order, so the first top_k terms seen for a prefix are its best ones
+    for term_data in rank_terms(terms_data, term_limit):
+        term = term_data['term']
+        length = len(term) if not max_prefix_length else min(len(term), max_prefix_length)
+
+        for i in range(1, length + 1):
+            suggestions = index.setdefault(term[:i], [])
+            if len(suggestions) < top_k:
+                suggestions.append(term)
+
+    return index
+
+
+def iter_prefix_autocomplete_writes(writer, autocomplete_index: Dict[str, List[str]],
+                                    namespace: str = AUTOCOMPLETE_PREFIX_NAMESPACE, ttl: int = 3600) -> Iterator[None]:
+    """Queue one JSON suggestion list per prefix, yielding after each so async callers can flush"""
+    for prefix, suggestions in autocomplete_index.items():
+        writer.setex(f"{namespace}:{prefix}", ttl, json.dumps(suggestions))
+        yield
+
+
+def write_prefix_autocomplete(writer, autocomplete_index: Dict[str, List[str]],
+                              namespace: str = AUTOCOMPLETE_PREFIX_NAMESPACE, ttl: int = 3600) -> int:
+    """Queue one JSON suggestion list per prefix on a RedisBulkWriter"""
+    for _ in iter_prefix_autocomplete_writes(writer, autocomplete_index, namespace=namespace, ttl=ttl):
+        pass
+    return len(autocomplete_index)
+
+
+def iter_sorted_set_autocomplete_writes(writer, ranked: List[Dict[str, Any]],
+                                        max_prefix_length: Optional[int] = 4, top_k: int = 10,
+                                        lex_key: str = AUTOCOMPLETE_LEX_KEY,
+                                        ranked_key: str = AUTOCOMPLETE_RANKED_KEY,
+                                        ttl: int = 3600, members_per_command: int = 1000) -> Iterator[None]:
+    """Queue the sorted sets for terms already passed through rank_terms, yielding after each ZADD"""
+    # Replace rather than merge so removed terms disappear; same-key commands keep their order
+    writer.add('delete', lex_key)
+    writer.add('delete', ranked_key)
+
+    for i in range(0, len(ranked), members_per_command):
+        chunk = ranked[i:i + members_per_command]
+        writer.add('zadd', lex_key, {
+            f"{t['term']}{_MEMBER_SEPARATOR}{t['searchVolume']}": 0 for t in chunk
+        })
+        writer.add('zadd', ranked_key, {t['term']: t['searchVolume'] for t in chunk})
+        yield
+
+    writer.add('expire', lex_key, ttl)
+    writer.add('expire', ranked_key, ttl)
+
+    # Short prefixes match too many terms to rank from the lexicographic set at lookup time
+    volumes = {t['term']: t['searchVolume'] for t in ranked}
+    for prefix, suggestions in build_autocomplete_index(ranked, max_prefix_length, top_k).items():
+        prefix_key = f"{ranked_key}:{prefix}"
+        writer.add('delete', prefix_key)
+        writer.add('zadd', prefix_key, {term: volumes[term] for term in suggestions})
+        writer.add('expire', prefix_key, ttl)
+        yield
+
+
+def write_sorted_set_autocomplete(writer, terms_data: List[Dict[str, Any]],
+                                  term_limit: Optional[int] = None,
+                                  max_prefix_length: Optional[int] = 4, top_k: int = 10,
+                                  lex_key: str = AUTOCOMPLETE_LEX_KEY,
+                                  ranked_key: str = AUTOCOMPLETE_RANKED_KEY,
+                                  ttl: int = 3600, members_per_command: int = 1000) -> int:
+    """Queue the lexicographic, score-ranked and per-prefix top-K sorted sets on a RedisBulkWriter"""
+    ranked = rank_terms(terms_data, term_limit)
+    for _ in iter_sorted_set_autocomplete_writes(writer, ranked, max_prefix_length=max_prefix_length, top_k=top_k,
+                                                 lex_key=lex_key, ranked_key=ranked_key,
+                                                 ttl=ttl, members_per_command=members_per_command):
+        pass
+    return len(ranked)
+
+
+def autocomplete_lookup(redis_client, prefix: str, limit: int = 10, max_prefix_length: Optional[int] = 4,
+                        scan_limit: int = 1000,
+                        lex_key: str = AUTOCOMPLETE_LEX_KEY,
+                        ranked_key: str = AUTOCOMPLETE_RANKED_KEY) -> List[str]:
+    """
+    Return up to `limit` completions for `prefix`, highest searchVolume first.
+
+    Prefixes up to max_prefix_length (the length the sets were written with) are read from
+    their top-K set in one round trip, so limit should not exceed the top_k they were written
+    with. Longer prefixes rank their ZRANGEBYLEX matches, fetched `scan_limit` at a time until
+    every match has been seen, so the ranking is exact at any term count.
+    """
+    prefix = (prefix or '').lstrip().lower()
+    if not prefix:
+        return list(redis_client.zrevrange(ranked_key, 0, limit - 1))
+
+    if not max_prefix_length or len(prefix) <= max_prefix_length:
+        suggestions = redis_client.zrevrange(f"{ranked_key}:{prefix}", 0, limit - 1)
+        if suggestions:
+            return list(suggestions)
+        # No set: no term has this prefix, or the sets were written with a shorter max_prefix_length
+
+    encoded = prefix.encode('utf-8')
+    candidates = []
+    offset = 0
+    while True:
+        # 0xff never occurs in UTF-8, so it bounds every term that starts with the prefix
+        members = redis_client.zrangebylex(lex_key, b'[' + encoded, b'[' + encoded + b'\xff',
+                                           start=offset, num=scan_limit)
+        for member in members:
+            if isinstance(member, bytes):
+                member = member.decode('utf-8')
+            term, _, volume = member.rpartition(_MEMBER_SEPARATOR)
+            candidates.append((-int(volume or 0), term))
+        # Keep only the best `limit` between pages so memory stays bounded
+        candidates = heapq.nsmallest(limit, candidates)
+        if len(members) < scan_limit:
+            break
+        offset += scan_limit
+    return [term for _, term in candidates]
+
+
+def _memory_usage(redis_client, keys: List[str]) -> Optional[int]:
+    """Sum MEMORY USAGE over keys, or None when the server does not support it"""
+    try:
+        return sum(redis_client.memory_usage(key) or 0 for key in keys)
+    except Exception:
+        return None
+
+
+def _time_lookups(lookup, prefixes: List[str], iterations: int) -> float:
+    """Return the mean latency of lookup(prefix) in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for prefix in prefixes:
+            lookup(prefix)
+    return (time.perf_counter() - start) * 1000 / (iterations * len(prefixes))
+
+
+def compare_autocomplete_layouts(redis_client, terms_data: List[Dict[str, Any]],
+                                 max_prefix_length: Optional[int] = 4, top_k: int = 10,
+                                 iterations: int = 100, namespace: str = 'bench:autocomplete',
+                                 sample_prefixes: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Write both layouts under a scratch namespace and compare keyspace, memory and lookup latency.
+
+    The scratch keys are removed afterwards, so this is safe to run against a live cache.
+    """
+    from redis_bulk import RedisBulkWriter
+
+    index = build_autocomplete_index(terms_data, max_prefix_length=max_prefix_length, top_k=top_k)
+    prefix_keys = [f"{namespace}:prefix:{prefix}" for prefix in index]
+    lex_key = f"{namespace}:lex"
+    ranked_key = f"{namespace}:ranked"
+
+    # The sorted set layout keeps a top-K set per prefix the prefix layout indexes
+    ranked_prefix_keys = [f"{ranked_key}:{prefix}" for prefix in index]
+    sorted_set_keys = [lex_key, ranked_key] + ranked_prefix_keys
+
+    with RedisBulkWriter(redis_client) as writer:
+        write_prefix_autocomplete(writer, index, namespace=f"{namespace}:prefix")
+        term_count = write_sorted_set_autocomplete(writer, terms_data, max_prefix_length=max_prefix_length,
+                                                   top_k=top_k, lex_key=lex_key, ranked_key=ranked_key)
+
+    if sample_prefixes is None:
+        sample_prefixes = sorted({t['term'][:n] for t in rank_terms(terms_data, 20) for n in (1, 2, 3)})
+
+    def prefix_lookup(prefix):
+        value = redis_client.get(f"{namespace}:prefix:{prefix[:max_prefix_length] if max_prefix_length else prefix}")
+        return json.loads(value) if value else []
+
+    def sorted_set_lookup(prefix):
+        return autocomplete_lookup(redis_client, prefix, limit=top_k, max_prefix_length=max_prefix_length,
+                                   lex_key=lex_key, ranked_key=ranked_key)
+
+    try:
+        results = {
+            'terms': term_count,
+            'prefix': {
+                'keys': len(prefix_keys),
+                'payload_bytes': sum(len(k) + len(json.dumps(v)) for k, v in zip(prefix_keys, index.values())),
+                'memory_bytes': _memory_usage(redis_client, prefix_keys),
+                'lookup_ms': _time_lookups(prefix_lookup, sample_prefixes, iterations),
+            },
+            'sorted_set': {
+                'keys': len(sorted_set_keys),
+                # Lexicographic member + ranked member + 8-byte score per term, plus the prefix sets
+                'payload_bytes': sum(len(f"{t['term']}{_MEMBER_SEPARATOR}{t['searchVolume']}") + len(t['term']) + 8
+                                     for t in rank_terms(terms_data))
+                                 + sum(len(k) + sum(len(term) + 8 for term in v)
+                                       for k, v in zip(ranked_prefix_keys, index.values())),
+                'memory_bytes': _memory_usage(redis_client, sorted_set_keys),
+                'lookup_ms': _time_lookups(sorted_set_lookup, sample_prefixes, iterations),
+            },
+        }
+    finally:
+        with RedisBulkWriter(redis_client) as writer:
+            for key in prefix_keys + sorted_set_keys:
+                writer.add('delete', key)
+
+    return results
+
+
+def main():
+    """Compare the prefix and sorted set autocomplete layouts against ElastiCache"""
+    parser = argparse.ArgumentParser(description='Compare autocomplete storage layouts')
+    parser.add_argument('--file', default=os.path.join(os.path.dirname(__file__), '..', 'output', 'popular_search_terms.json'),
+                        help='Popular search terms JSON file')
+    parser.add_argument('--iterations', type=int, default=100, help='Lookup iterations per sample prefix')
+    parser.add_argument('--max-prefix-length', type=int, default=4, help='Prefix layout max prefix length (0 = full)')
+    args = parser.parse_args()
+
+    from database_connections import get_elasticache_client
+
+    with open(args.file, 'r', encoding='utf-8') as f:
+        terms_data = json.load(f)
+
+    results = compare_autocomplete_layouts(get_elasticache_client(), terms_data,
+                                           max_prefix_length=args.max_prefix_length,
+                                           iterations=args.iterations)
+
+    print(f"📊 Autocomplete layout comparison ({results['terms']} terms)")
+    print(f"{'Layout':<12}{'Keys':>8}{'Payload (B)':>14}{'Memory (B)':>14}{'Lookup (ms)':>14}")
+    for layout in AUTOCOMPLETE_MODES:
+        r = results[layout]
+        memory = f"{r['memory_bytes']:,}" if r['memory_bytes'] is not None else 'n/a'
+        print(f"{layout:<12}{r['keys']:>8,}{r['payload_bytes']:>14,}{memory:>14}{r['lookup_ms']:>14.3f}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Columnar Snapshots for Unicorn E-Commerce Seeders
+Converts the JSON arrays in data/output into compressed, typed, column-per-member .npz snapshots
+
+For products.json the snapshot is data/output/products.snapshot.npz, a zip of .npy members:
+  * __schema__                 - JSON: source file, row count, and each column's name and type
+  * <column>                   - int64, float64 or bool values; embeddings as a rows x dims float32 matrix
+  * <column>.data / .offsets   - strings, and nested fields such as specifications encoded as JSON,
+                                 in one UTF-8 buffer with each row's character offset
+  * <column>.state             - per row: 0 value, 1 null, 2 key missing (only when needed)
+  * <column>.isint             - which rows of a mixed int/float column were ints
+
+Every member is compressed on its own, so reading a few columns never decompresses the
+others. data_loader.iter_records() reads a snapshot when it is at least as new as its JSON
+file, and falls back to the JSON otherwise.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from data_loader import iter_json_records, output_file_exists, output_path
+
+# numpy is imported only when a snapshot is written or read
+NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+
+SNAPSHOT_FILES = [
+    'products.json',
+    'inventory.json',
+    'reviews.json',
+    'knowledge_base.json',
+    'search_behaviors.json',
+    'popular_search_terms.json',
+]
+
+# Lists under this key are stored as fixed-width float32 vectors (as in the embedding sidecars)
+VECTOR_FIELDS = {'embedding'}
+
+SCHEMA_MEMBER = '__schema__'
+SNAPSHOT_VERSION = 1
+
+# Rows converted to Python objects at a time when iterating records
+_BLOCK_ROWS = 4096
+
+_VALUE, _NULL, _MISSING = 0, 1, 2
+_ABSENT = object()
+
+
+def snapshot_path(filename: str) -> str:
+    """Return the .snapshot.npz path for a data file"""
+    stem, _ = os.path.splitext(output_path(filename))
+    return f"{stem}.snapshot.npz"
+
+
+def snapshot_is_current(filename: str) -> bool:
+    """True when a data file's snapshot exists and is not older than the JSON file"""
+    path = snapshot_path(filename)
+    if not os.path.exists(path):
+        return False
+    source = output_path(filename)
+    return not os.path.exists(source) or os.path.getmtime(path) >= os.path.getmtime(source)
+
+
+def _kind(value: Any) -> str:
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int' if -2 ** 63 <= value < 2 ** 63 else 'json'
+    if isinstance(value, float):
+        return 'float'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, list) and value and all(isinstance(x, (int, float)) and not isinstance(x, bool)
+                                                 for x in value):
+        return f"vector:{len(value)}"
+    return 'json'
+
+
+def _column_type(name: str, kinds: set) -> Dict[str, Any]:
+    """Pick the narrowest storage type that holds every non-null value of a column"""
+    kinds = kinds - {'null'}
+    if kinds == {'bool'}:
+        return {'type': 'bool'}
+    if kinds == {'int'}:
+        return {'type': 'int'}
+    if kinds and kinds <= {'int', 'float'}:
+        return {'type': 'float', 'mixedInt': len(kinds) == 2}
+    if kinds == {'string'}:
+        return {'type': 'string'}
+    if name in VECTOR_FIELDS and len(kinds) == 1 and next(iter(kinds)).startswith('vector:'):
+        return {'type': 'vector', 'dimensions': int(next(iter(kinds)).split(':')[1])}
+    return {'type': 'json'}
+
+
+def write_snapshot(filename: str) -> Dict[str, Any]:
+    """
+    Convert a data file to its columnar snapshot and return the snapshot's schema.
+
+    The JSON is streamed twice: once to infer each column's type, once to fill the arrays.
+    The snapshot replaces any existing one only once it is fully written.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("numpy is required to write columnar snapshots. Install with: pip install numpy")
+    import numpy as np
+
+    kinds: Dict[str, set] = {}
+    present: Dict[str, int] = {}
+    rows = 0
+    for record in iter_json_records(filename):
+        rows += 1
+        for key, value in record.items():
+            kinds.setdefault(key, set()).add(_kind(value))
+            present[key] = present.get(key, 0) + 1
+
+    columns = []
+    for name, column_kinds in kinds.items():
+        column = dict(_column_type(name, column_kinds), name=name)
+        column['hasState'] = 'null' in column_kinds or present[name] < rows
+        columns.append(column)
+
+    arrays: Dict[str, Any] = {}
+    # Text columns are collected as strings; offsets count characters so a reader can decode once and slice
+    texts: Dict[str, List[str]] = {}
+    lengths: Dict[str, int] = {}
+    for column in columns:
+        name, kind = column['name'], column['type']
+        if kind in ('string', 'json'):
+            texts[name] = []
+            lengths[name] = 0
+            arrays[f"{name}.offsets"] = np.zeros(rows + 1, dtype=np.int64)
+        elif kind == 'vector':
+            arrays[name] = np.zeros((rows, column['dimensions']), dtype=np.float32)
+        else:
+            arrays[name] = np.zeros(rows, dtype={'int': np.int64, 'float': np.float64, 'bool': np.bool_}[kind])
+        if column['hasState']:
+            arrays[f"{name}.state"] = np.zeros(rows, dtype=np.uint8)
+        if column.get('mixedInt'):
+            arrays[f"{name}.isint"] = np.zeros(rows, dtype=np.bool_)
+
+    for row, record in enumerate(iter_json_records(filename)):
+        for column in columns:
+            name, kind = column['name'], column['type']
+            value = record.get(name, _ABSENT)
+            if value is _ABSENT or value is None:
+                arrays[f"{name}.state"][row] = _MISSING if value is _ABSENT else _NULL
+            if kind == 'string':
+                text = value if isinstance(value, str) else ''
+            elif kind == 'json':
+                # Null and missing rows hold "null" so a block of rows decodes as one JSON array
+                text = json.dumps(None if value is _ABSENT else value, ensure_ascii=False, separators=(',', ':'))
+            else:
+                if value is not _ABSENT and value is not None:
+                    arrays[name][row] = value
+                    if column.get('mixedInt') and isinstance(value, int):
+                        arrays[f"{name}.isint"][row] = True
+                continue
+            texts[name].append(text)
+            lengths[name] += len(text)
+            arrays[f"{name}.offsets"][row + 1] = lengths[name]
+
+    for name, parts in texts.items():
+        arrays[f"{name}.data"] = np.frombuffer(''.join(parts).encode('utf-8'), dtype=np.uint8)
+
+    schema = {'version': SNAPSHOT_VERSION, 'source': os.path.basename(filename), 'rows': rows, 'columns': columns}
+    arrays[SCHEMA_MEMBER] = np.frombuffer(json.dumps(schema).encode('utf-8'), dtype=np.uint8)
+
+    path = snapshot_path(filename)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp_path, path)
+    return schema
+
+
+class ColumnarSnapshot:
+    """Read-only view of a columnar snapshot that decompresses only the columns it is asked for"""
+
+    def __init__(self, filename: str):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required to read columnar snapshots. Install with: pip install numpy")
+        import numpy as np
+
+        self.path = snapshot_path(filename)
+        self._npz = np.load(self.path, allow_pickle=False)
+        schema = json.loads(self._npz[SCHEMA_MEMBER].tobytes())
+        if schema.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"{self.path} has snapshot version {schema.get('version')}, expected {SNAPSHOT_VERSION}")
+        self.rows: int = schema['rows']
+        self.columns: Dict[str, Dict[str, Any]] = {column['name']: column for column in schema['columns']}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def close(self):
+        self._npz.close()
+
+    def _column_reader(self, name: str):
+        """Load one column's arrays and return a function converting a row range to Python values"""
+        column = self.columns[name]
+        kind = column['type']
+        state = self._npz[f"{name}.state"] if column['hasState'] else None
+
+        if kind in ('string', 'json'):
+            text = self._npz[f"{name}.data"].tobytes().decode('utf-8')
+            offsets = self._npz[f"{name}.offsets"]
+
+            def convert(start: int, stop: int) -> List[Any]:
+                bounds = offsets[start:stop + 1].tolist()
+                values = [text[a:b] for a, b in zip(bounds, bounds[1:])]
+                if kind == 'json':
+                    return json.loads('[' + ','.join(values) + ']')
+                return values
+        else:
+            values = self._npz[name]
+            isint = self._npz[f"{name}.isint"] if column.get('mixedInt') else None
+
+            def convert(start: int, stop: int) -> List[Any]:
+                block = values[start:stop].tolist()
+                if isint is not None:
+                    for i in isint[start:stop].nonzero()[0].tolist():
+                        block[i] = int(block[i])
+                return block
+
+        if state is None:
+            return convert
+
+        def convert_with_state(start: int, stop: int) -> List[Any]:
+            block = convert(start, stop)
+            for i, flag in enumerate(state[start:stop].tolist()):
+                if flag:
+                    block[i] = _ABSENT if flag == _MISSING else None
+            return block
+
+        return convert_with_state
+
+    def iter_records(self, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield records with the given columns (all by default), in the source file's order.
+
+        Columns a record did not have are left out of it, as in the JSON. Requested columns
+        that the snapshot does not have are ignored.
+        """
+        names = [name for name in (columns or list(self.columns)) if name in self.columns]
+        readers = [self._column_reader(name) for name in names]
+        for start in range(0, self.rows, _BLOCK_ROWS):
+            stop = min(start + _BLOCK_ROWS, self.rows)
+            blocks = [reader(start, stop) for reader in readers]
+            if any(self.columns[name]['hasState'] for name in names):
+                for values in zip(*blocks):
+                    yield {name: value for name, value in zip(names, values) if value is not _ABSENT}
+            else:
+                for values in zip(*blocks):
+                    yield dict(zip(names, values))
+        if not names:
+            for _ in range(self.rows):
+                yield {}
+
+
+def open_snapshot(filename: str) -> Optional[ColumnarSnapshot]:
+    """Open a data file's snapshot, or return None when there is no current one to read"""
+    if not NUMPY_AVAILABLE or not snapshot_is_current(filename):
+        return None
+    return ColumnarSnapshot(filename)
+
+
+def _time_load(load, repeat: int) -> float:
+    """Best-of-repeat seconds to exhaust the iterator returned by load()"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in load():
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_snapshot(filename: str, columns: Optional[List[str]] = None, repeat: int = 3) -> Dict[str, Any]:
+    """Compare size and load time of a data file's JSON and snapshot, for all columns and for a subset"""
+    snapshot = ColumnarSnapshot(filename)
+    try:
+        columns = [name for name in (columns or []) if name in snapshot.columns] or list(snapshot.columns)[:1]
+        result = {
+            'file': filename,
+            'rows': len(snapshot),
+            'columns': columns,
+            'jsonBytes': os.path.getsize(output_path(filename)),
+            'snapshotBytes': os.path.getsize(snapshot.path),
+            'jsonLoadSeconds': _time_load(lambda: iter_json_records(filename), repeat),
+            'snapshotLoadSeconds': _time_load(snapshot.iter_records, repeat),
+            'jsonColumnsSeconds': _time_load(
+                lambda: ({k: r[k] for k in columns if k in r} for r in iter_json_records(filename)), repeat),
+            'snapshotColumnsSeconds': _time_load(lambda: snapshot.iter_records(columns), repeat),
+        }
+    finally:
+        snapshot.close()
+    return result
+
+
+def print_benchmark(results: List[Dict[str, Any]]):
+    """Print the size and load-time comparison as a table"""
+    print(f"\n{'File':<28}{'Rows':>8}{'JSON MB':>9}{'Snap MB':>9}{'JSON s':>9}{'Snap s':>9}"
+          f"{'Cols JSON s':>13}{'Cols Snap s':>13}  Columns")
+    for r in results:
+        print(f"{r['file']:<28}{r['rows']:>8,}{r['jsonBytes'] / 1e6:>9.2f}{r['snapshotBytes'] / 1e6:>9.2f}"
+              f"{r['jsonLoadSeconds']:>9.3f}{r['snapshotLoadSeconds']:>9.3f}"
+              f"{r['jsonColumnsSeconds']:>13.3f}{r['snapshotColumnsSeconds']:>13.4f}  {', '.join(r['columns'])}")
+
+
+def main():
+    """Convert data files to columnar snapshots, optionally benchmarking them against the JSON"""
+    parser = argparse.ArgumentParser(description='Write compressed columnar snapshots of the data/output JSON files')
+    parser.add_argument('files', nargs='*', help=f"Data files to convert (default: {', '.join(SNAPSHOT_FILES)})")
+    parser.add_argument('--benchmark', action='store_true', help='Compare load times and sizes against the JSON')
+    parser.add_argument('--columns', nargs='+', metavar='COLUMN',
+                        help='Columns for the selective-load benchmark (default: each file\'s first column)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per load; the fastest counts (default: 3)')
+    parser.add_argument('--output', help='Also write the benchmark results to this JSON file')
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("❌ numpy is required for columnar snapshots. Install with: pip install numpy")
+        return False
+
+    filenames = args.files or [name for name in SNAPSHOT_FILES if output_file_exists(name)]
+    results = []
+    for filename in filenames:
+        if not output_file_exists(filename):
+            print(f"❌ {output_path(filename)} not found")
+            return False
+        try:
+            schema = write_snapshot(filename)
+        except (OSError, ValueError) as e:
+            print(f"❌ Failed to convert {filename}: {e}")
+            return False
+        types = {}
+        for column in schema['columns']:
+            types[column['type']] = types.get(column['type'], 0) + 1
+        print(f"✅ Wrote {schema['rows']:,} rows x {len(schema['columns'])} columns to {snapshot_path(filename)} "
+              f"({', '.join(f'{count} {kind}' for kind, count in sorted(types.items()))})")
+        if args.benchmark:
+            results.append(benchmark_snapshot(filename, args.columns, repeat=args.repeat))
+
+    if results:
+        print_benchmark(results)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"Wrote benchmark results to {args.output}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Schema-Driven Type Converters for Unicorn E-Commerce Seeders
+Compiles a per-collection field schema into a specialized record conversion function
+
+A schema maps field paths to conversion kinds:
+  * 'createdAt'               - top-level field
+  * 'supplier.supplierRating' - field of a nested document
+  * 'movements[].unitCost'    - field of every document in a list
+
+Only the listed paths are visited, so a record costs a handful of dict lookups instead of a
+recursive walk over every value (including 1536-element embedding lists).
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from itertools import cycle, islice
+from typing import Any, Callable, Dict, List
+
+# Conversion kinds
+DATETIME = 'datetime'      # ISO-8601 string -> datetime (DocumentDB)
+ISO_STRING = 'iso_string'  # datetime -> ISO-8601 string (DynamoDB)
+DECIMAL = 'decimal'        # float -> Decimal (DynamoDB)
+SET = 'set'                # list -> set (DynamoDB string/number sets)
+
+# Per-collection schemas, derived from the generated data in data/output
+PRODUCT_DOCUMENT_SCHEMA = {
+    'createdAt': DATETIME,
+    'updatedAt': DATETIME,
+}
+
+INVENTORY_ITEM_SCHEMA = {
+    'unitCost': DECIMAL,
+    'totalValue': DECIMAL,
+    'supplier.supplierRating': DECIMAL,
+}
+
+SEARCH_ANALYTICS_ITEM_SCHEMA: Dict[str, str] = {}
+
+
+def parse_datetime(value: str):
+    """Parse an ISO-8601 string (with optional Z suffix), returning it unchanged if it is not one"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return value
+
+
+def to_decimal(value: float) -> Decimal:
+    """Convert a float to the Decimal DynamoDB expects, via its shortest string form"""
+    return Decimal(str(value))
+
+
+# Each kind: (type the value must have, expression template applied to variable v)
+_KINDS = {
+    DATETIME: ('str', '_parse_datetime(v)'),
+    ISO_STRING: ('_datetime', 'v.isoformat()'),
+    DECIMAL: ('float', '_to_decimal(v)'),
+    SET: ('list', 'set(v)'),
+}
+
+_GLOBALS = {
+    '_parse_datetime': parse_datetime,
+    '_to_decimal': to_decimal,
+    '_datetime': datetime,
+}
+
+
+def _build_tree(schema: Dict[str, str]) -> Dict[str, Any]:
+    """Turn dotted paths into a nested {field: kind | subtree} tree; '[]' marks list fields"""
+    tree: Dict[str, Any] = {}
+    for path, kind in schema.items():
+        if kind not in _KINDS:
+            raise ValueError(f"Unknown conversion kind for {path}: {kind}. Available: {', '.join(_KINDS)}")
+        node = tree
+        parts = path.split('.')
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+            if not isinstance(node, dict):
+                raise ValueError(f"Schema path {path} descends into a converted field")
+        node[parts[-1]] = kind
+    return tree
+
+
+def _emit(tree: Dict[str, Any], target: str, lines: List[str], indent: int, counter: List[int]):
+    """Emit statements converting the fields of tree inside the dict bound to target"""
+    pad = '    ' * indent
+    for field, node in tree.items():
+        is_list = field.endswith('[]')
+        key = repr(field[:-2] if is_list else field)
+        counter[0] += 1
+        var = f"v{counter[0]}"
+        lines.append(f"{pad}{var} = {target}.get({key})")
+
+        if not isinstance(node, dict):
+            value_type, expression = _KINDS[node]
+            if is_list:
+                lines.append(f"{pad}if {var}.__class__ is list:")
+                lines.append(f"{pad}    {target}[{key}] = [{expression} if v.__class__ is {value_type} else v "
+                             f"for v in {var}]")
+            else:
+                lines.append(f"{pad}if {var}.__class__ is {value_type}:")
+                lines.append(f"{pad}    v = {var}")
+                lines.append(f"{pad}    {target}[{key}] = {expression}")
+            continue
+
+        if is_list:
+            # Copy the list and each nested document so the input record is never mutated
+            item = f"item{counter[0]}"
+            lines.append(f"{pad}if {var}.__class__ is list:")
+            lines.append(f"{pad}    {var} = [dict(x) if x.__class__ is dict else x for x in {var}]")
+            lines.append(f"{pad}    {target}[{key}] = {var}")
+            lines.append(f"{pad}    for {item} in {var}:")
+            lines.append(f"{pad}        if {item}.__class__ is dict:")
+            _emit(node, item, lines, indent + 3, counter)
+        else:
+            lines.append(f"{pad}if {var}.__class__ is dict:")
+            lines.append(f"{pad}    {var} = dict({var})")
+            lines.append(f"{pad}    {target}[{key}] = {var}")
+            _emit(node, var, lines, indent + 1, counter)
+
+
+def compile_converter(schema: Dict[str, str], name: str = 'convert') -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Compile a field schema into a function that returns a converted copy of a record.
+
+    Only the containers on a converted path are copied; the input record is never mutated.
+    The generated source is kept on the function as __source__ for inspection.
+    """
+    lines = [f"def {name}(record):", "    out = dict(record)"]
+    _emit(_build_tree(schema), 'out', lines, 1, [0])
+    lines.append("    return out")
+    source = '\n'.join(lines) + '\n'
+
+    # __name__ lets module-level converters be pickled by reference for process pools
+    namespace = dict(_GLOBALS, __name__=__name__)
+    exec(compile(source, f"<converter {name}>", 'exec'), namespace)
+    converter = namespace[name]
+    converter.__source__ = source
+    return converter
+
+
+# Compiled converters used by the seeders
+prepare_product_document = compile_converter(PRODUCT_DOCUMENT_SCHEMA, 'prepare_product_document')
+prepare_inventory_item = compile_converter(INVENTORY_ITEM_SCHEMA, 'prepare_inventory_item')
+prepare_search_analytics_item = compile_converter(SEARCH_ANALYTICS_ITEM_SCHEMA, 'prepare_search_analytics_item')
+
+
+def recursive_prepare_product(product: Dict[str, Any]) -> Dict[str, Any]:
+    """The previous recursive product converter, kept as the benchmark and equivalence baseline"""
+    def convert_recursive(obj):
+        if isinstance(obj, str):
+            if obj.endswith('Z') or '+' in obj[-6:] or obj.count('T') == 1:
+                try:
+                    return datetime.fromisoformat(obj.replace('Z', '+00:00'))
+                except ValueError:
+                    return obj
+            return obj
+        elif isinstance(obj, dict):
+            return {k: convert_recursive(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [convert_recursive(item) for item in obj]
+        else:
+            return obj
+
+    return convert_recursive(product)
+
+
+def _benchmark(label: str, func: Callable, records: List[Dict[str, Any]], count: int) -> float:
+    """Run func over count records (cycling the pool) and return records/sec"""
+    start = time.perf_counter()
+    for record in islice(cycle(records), count):
+        func(record)
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"  {label:<12}{elapsed:>10.2f}s {rate:>14,.0f} records/sec")
+    return rate
+
+
+def main():
+    """Benchmark compiled converters against the recursive ones they replace"""
+    parser = argparse.ArgumentParser(description='Benchmark compiled vs recursive record converters')
+    parser.add_argument('--records', type=int, default=1_000_000, help='Records converted per converter')
+    parser.add_argument('--with-embeddings', action='store_true',
+                        help='Keep product embeddings (as when no embedding sidecar is used)')
+    args = parser.parse_args()
+
+    from data_loader import iter_json_records
+    from database_connections import prepare_for_dynamodb
+
+    cases = [
+        ('products.json', recursive_prepare_product, prepare_product_document),
+        ('inventory.json', prepare_for_dynamodb, prepare_inventory_item),
+        ('search_behaviors.json', prepare_for_dynamodb, prepare_search_analytics_item),
+    ]
+
+    success = True
+    for filename, recursive, compiled in cases:
+        records = list(iter_json_records(filename))
+        if filename == 'products.json' and not args.with_embeddings:
+            records = [{k: v for k, v in r.items() if k != 'embedding'} for r in records]
+
+        mismatches = sum(1 for r in records if recursive(r) != compiled(r))
+        print(f"\n{filename}: {len(records):,} distinct records, {args.records:,} conversions each")
+        if mismatches:
+            print(f"  ❌ {mismatches} records convert differently")
+            success = False
+
+        recursive_rate = _benchmark('recursive', recursive, records, args.records)
+        compiled_rate = _benchmark('compiled', compiled, records, args.records)
+        if recursive_rate:
+            print(f"  Speedup: {compiled_rate / recursive_rate:.1f}x")
+    return success
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
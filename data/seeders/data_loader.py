@@ -0,0 +1,137 @@
+"""
+Streaming Data Loader for Unicorn E-Commerce Seeders
+Reads the JSON arrays in data/output incrementally so memory stays flat as datasets grow
+"""
+import json
+import os
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# SEED_DATA_DIR points the seeders at another copy of the data, e.g. one written by dataset_scaler.py
+OUTPUT_DIR = os.environ.get('SEED_DATA_DIR') or os.path.join(os.path.dirname(__file__), '..', 'output')
+
+_WHITESPACE = ' \t\r\n'
+_INCOMPLETE = object()
+
+
+def output_path(filename: str) -> str:
+    """Resolve a bare filename to data/output; paths are returned unchanged"""
+    if os.path.dirname(filename):
+        return filename
+    return os.path.join(OUTPUT_DIR, filename)
+
+
+def _skip(buffer: str, pos: int, chars: str) -> int:
+    """Advance pos past any of chars"""
+    while pos < len(buffer) and buffer[pos] in chars:
+        pos += 1
+    return pos
+
+
+def iter_json_records(filename: str, chunk_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Only the current element and at most one read chunk are held in memory, so a
+    multi-gigabyte file costs the same as a small one.
+    """
+    decoder = json.JSONDecoder()
+    with open(output_path(filename), 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size)
+        pos = _skip(buffer, 0, _WHITESPACE)
+        if pos >= len(buffer) or buffer[pos] != '[':
+            raise ValueError(f"{filename} does not contain a top-level JSON array")
+        pos += 1
+        eof = False
+
+        while True:
+            pos = _skip(buffer, pos, _WHITESPACE + ',')
+            if pos < len(buffer) and buffer[pos] == ']':
+                return
+
+            obj = _INCOMPLETE
+            if pos < len(buffer):
+                try:
+                    obj, end = decoder.raw_decode(buffer, pos)
+                    # A number cut at the buffer edge parses short ("2." of "2.5"), so only
+                    # accept an element once the delimiter that follows it has been read
+                    if not eof and (end >= len(buffer) or buffer[end] not in _WHITESPACE + ',]'):
+                        obj = _INCOMPLETE
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+
+            if obj is not _INCOMPLETE:
+                yield obj
+                pos = end
+                continue
+
+            if eof:
+                raise ValueError(f"{filename} ends before its JSON array is closed")
+
+            # Drop consumed text and read at least as much again as the partial element,
+            # so very large elements are re-parsed a logarithmic number of times
+            buffer = buffer[pos:]
+            pos = 0
+            chunk = f.read(max(chunk_size, len(buffer)))
+            if not chunk:
+                eof = True
+            buffer += chunk
+
+
+def iter_records(filename: str, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield a data file's records, keeping only the given columns if any are listed.
+
+    Reads the file's columnar snapshot (see columnar_snapshot.py) when one is at least as new
+    as the JSON, which decompresses only the requested columns; otherwise streams the JSON.
+    """
+    from columnar_snapshot import open_snapshot
+
+    snapshot = open_snapshot(filename)
+    if snapshot is not None:
+        try:
+            yield from snapshot.iter_records(columns)
+        finally:
+            snapshot.close()
+        return
+
+    records = iter_json_records(filename)
+    if columns is None:
+        yield from records
+    else:
+        for record in records:
+            yield {column: record[column] for column in columns if column in record}
+
+
+def batched(records: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Group any iterable into lists of at most batch_size items"""
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_json_batches(filename: str, batch_size: int = 100) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the elements of a top-level JSON array in fixed-size batches"""
+    return batched(iter_json_records(filename), batch_size)
+
+
+def write_json_array(path: str, records: Iterable[Dict[str, Any]]) -> int:
+    """Write records as an indented JSON array without holding them all in memory; return the count"""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for record in records:
+            f.write(',\n  ' if count else '\n  ')
+            f.write(json.dumps(record, ensure_ascii=False, default=str))
+            count += 1
+        f.write('\n]\n')
+    return count
+
+
+def output_file_exists(filename: str) -> bool:
+    """Check whether a generated data file is present"""
+    return os.path.exists(output_path(filename))
@@ -1,35 +1,40 @@
 """
 Common Database Connection Handler for Unicorn E-Commerce Seeders
 Provides centralized connection management for DocumentDB, DynamoDB, and ElastiCache
+
+Connections are opened lazily on first use, and each driver (pymongo, boto3, redis) is imported
+only when its store is first used, so a seeder pays the import cost of its own store only
+(see startup_profile.py). Credentials are fetched from Secrets Manager once
+and cached (see secrets_cache.py), DynamoDB table handles are described once per process, and
+a forked child drops the parent's clients and reconnects on its own first use.
+
+Pool sizes, timeouts, keepalive, compression and retries come from one named profile
+(pool_profiles.py), and each pool is pre-warmed to the profile's size when it connects.
 """
+import importlib.util
 import os
 import sys
 import json
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from decimal import Decimal
+from functools import partial
 from typing import Optional, Dict, Any
 from urllib.parse import quote_plus
 
-# Check for required dependencies
-try:
-    import pymongo
-    from pymongo import MongoClient
-    PYMONGO_AVAILABLE = True
-except ImportError:
-    PYMONGO_AVAILABLE = False
+# Check for required dependencies without importing them; each driver is imported on first use
+PYMONGO_AVAILABLE = importlib.util.find_spec('pymongo') is not None
+BOTO3_AVAILABLE = importlib.util.find_spec('boto3') is not None
+REDIS_AVAILABLE = importlib.util.find_spec('redis') is not None
 
-try:
-    import boto3
-    from botocore.exceptions import ClientError
-    BOTO3_AVAILABLE = True
-except ImportError:
-    BOTO3_AVAILABLE = False
+# Server error code for a rejected username or password
+MONGO_AUTHENTICATION_FAILED = 18
 
-try:
-    import redis
-    REDIS_AVAILABLE = True
-except ImportError:
-    REDIS_AVAILABLE = False
+from instrumentation import instrumentation
+from pool_profiles import PoolProfile, get_pool_profile
+from secrets_cache import SecretsCache
 
 
 class DatabaseConnections:
@@ -39,28 +44,93 @@ class DatabaseConnections:
         self.documentdb_client = None
         self.documentdb_db = None
         self.dynamodb_resource = None
+        self.boto3_session = None
         self.elasticache_client = None
         self._region = None
         self._database_name = None
         self._secrets_client = None
+        self._secrets_cache = SecretsCache.from_environment()
+        self._pool_profile: Optional[PoolProfile] = None
+        # DynamoDB Table handles and DescribeTable results by table name, each fetched once
+        self._dynamodb_tables = {}
+        self._dynamodb_descriptions = {}
+        # Serializes lazy connection setup when seeders share this instance across threads
+        self._connect_lock = threading.RLock()
+        
+        if hasattr(os, 'register_at_fork'):
+            # A weak reference keeps the fork hook from holding short-lived instances alive
+            reset = weakref.WeakMethod(self._reset_after_fork)
+            os.register_at_fork(after_in_child=lambda: reset() and reset()())
+    
+    def _reset_after_fork(self):
+        """
+        Forget the parent's clients in a forked child so they are recreated on first use.
+        
+        Sockets, boto3 sessions and the lock are not safe to share across fork(); the parent's
+        clients are dropped without being closed, since closing them would also close the
+        parent's sockets. Cached credentials stay valid and are kept.
+        """
+        self.documentdb_client = None
+        self.documentdb_db = None
+        self.dynamodb_resource = None
+        self.boto3_session = None
+        self.elasticache_client = None
+        self._secrets_client = None
+        self._dynamodb_tables = {}
+        self._dynamodb_descriptions = {}
+        self._connect_lock = threading.RLock()
+    
+    @property
+    def pool_profile(self) -> PoolProfile:
+        """The connection pool profile, from SEED_POOL_PROFILE unless set_pool_profile() chose one"""
+        if self._pool_profile is None:
+            try:
+                self._pool_profile = get_pool_profile()
+            except ValueError as e:
+                print(f"ERROR: {e}")
+                sys.exit(1)
+        return self._pool_profile
+    
+    def set_pool_profile(self, name: str):
+        """Choose the pool profile for connections opened from now on"""
+        self._pool_profile = get_pool_profile(name)
+        if self.documentdb_client or self.dynamodb_resource or self.elasticache_client:
+            print(f"WARNING: pool profile set to '{name}' after connecting; open connections keep their settings")
+    
+    def get_dynamodb_config(self):
+        """botocore Config for DynamoDB clients, from the pool profile"""
+        return self.pool_profile.botocore_config()
     
     def _get_secrets_client(self):
         """Get or create AWS Secrets Manager client"""
         if self._secrets_client is None:
+            import boto3
             region = os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'))
             self._secrets_client = boto3.client('secretsmanager', region_name=region)
         return self._secrets_client
     
+    def _fetch_secret(self, secret_name: str) -> Dict[str, Any]:
+        """Read and parse one secret from AWS Secrets Manager"""
+        response = self._get_secrets_client().get_secret_value(SecretId=secret_name)
+        return json.loads(response['SecretString'])
+    
+    def _database_secret_name(self) -> str:
+        """Name of the Secrets Manager secret holding the database credentials"""
+        project_name = os.environ.get('PROJECT_NAME', 'unicorn-ecommerce')
+        environment = os.environ.get('ENVIRONMENT', 'dev')
+        return f"{project_name}-{environment}-database-credentials"
+    
+    def invalidate_database_credentials(self):
+        """Drop the cached credentials after an authentication failure, so a rotated secret is refetched"""
+        self._secrets_cache.invalidate(self._database_secret_name())
+        print("Cleared cached database credentials; they are fetched again on the next connection")
+    
     def _get_database_credentials(self):
-        """Retrieve database credentials from AWS Secrets Manager"""
+        """Retrieve database credentials from AWS Secrets Manager (cached for SEED_SECRETS_TTL seconds)"""
         try:
-            project_name = os.environ.get('PROJECT_NAME', 'unicorn-ecommerce')
-            environment = os.environ.get('ENVIRONMENT', 'dev')
-            secret_name = f"{project_name}-{environment}-database-credentials"
+            secret_name = self._database_secret_name()
             
-            secrets_client = self._get_secrets_client()
-            response = secrets_client.get_secret_value(SecretId=secret_name)
-            secret = json.loads(response['SecretString'])
+            secret = self._secrets_cache.get(secret_name, lambda: self._fetch_secret(secret_name))
             
             return {
                 'docdb_username': secret['docdb_username'],
@@ -103,7 +173,9 @@ class DatabaseConnections:
     def get_documentdb_connection(self):
         """Get DocumentDB connection and database"""
         if self.documentdb_client is None:
-            self._connect_to_documentdb()
+            with self._connect_lock:
+                if self.documentdb_client is None:
+                    self._connect_to_documentdb()
         return self.documentdb_client, self.documentdb_db
     
     def get_documentdb_collection(self, collection_name: str):
@@ -114,36 +186,134 @@ class DatabaseConnections:
     def get_dynamodb_table(self, table_env_var: str):
         """Get DynamoDB table using environment variable name"""
         if self.dynamodb_resource is None:
-            self._connect_to_dynamodb()
+            with self._connect_lock:
+                if self.dynamodb_resource is None:
+                    self._connect_to_dynamodb()
         
         table_name = os.environ.get(table_env_var)
         if not table_name:
             print(f"ERROR: Missing required DynamoDB table environment variable: {table_env_var}")
             sys.exit(1)
         
-        try:
-            table = self.dynamodb_resource.Table(table_name)
-            # Test the connection by describing the table
-            table_description = table.meta.client.describe_table(TableName=table_name)
-            print(f"✅ Connected to DynamoDB table: {table_name}")
-            print(f"   Table status: {table_description['Table']['TableStatus']}")
+        table = self._dynamodb_tables.get(table_name)
+        if table is not None:
             return table
-        except Exception as e:
-            print(f"ERROR: Failed to connect to DynamoDB table {table_name}: {e}")
-            sys.exit(1)
+        
+        with self._connect_lock:
+            if table_name not in self._dynamodb_tables:
+                try:
+                    table = self.dynamodb_resource.Table(table_name)
+                    # Test the connection by describing the table
+                    table_description = self.describe_dynamodb_table(table_name)
+                    print(f"✅ Connected to DynamoDB table: {table_name}")
+                    print(f"   Table status: {table_description['TableStatus']}")
+                    self._dynamodb_tables[table_name] = table
+                except Exception as e:
+                    print(f"ERROR: Failed to connect to DynamoDB table {table_name}: {e}")
+                    sys.exit(1)
+            return self._dynamodb_tables[table_name]
+    
+    def describe_dynamodb_table(self, table_name: str) -> Dict[str, Any]:
+        """Return a table's DescribeTable attributes, calling DescribeTable at most once per table"""
+        description = self._dynamodb_descriptions.get(table_name)
+        if description is None:
+            if self.dynamodb_resource is None:
+                with self._connect_lock:
+                    if self.dynamodb_resource is None:
+                        self._connect_to_dynamodb()
+            with self._connect_lock:
+                description = self._dynamodb_descriptions.get(table_name)
+                if description is None:
+                    # Kept apart from the Table handle, whose meta.data boto3 clears after every action
+                    response = self.dynamodb_resource.meta.client.describe_table(TableName=table_name)
+                    description = self._dynamodb_descriptions[table_name] = response['Table']
+        return description
+    
+    def forget_dynamodb_table(self, table_name: str):
+        """Drop a memoized table handle and description, e.g. after the table was deleted and recreated"""
+        with self._connect_lock:
+            self._dynamodb_tables.pop(table_name, None)
+            self._dynamodb_descriptions.pop(table_name, None)
+    
+    def get_boto3_session(self):
+        """Get the boto3 session backing the DynamoDB connection"""
+        if self.dynamodb_resource is None:
+            with self._connect_lock:
+                if self.dynamodb_resource is None:
+                    self._connect_to_dynamodb()
+        return self.boto3_session
     
     def get_elasticache_connection(self):
         """Get ElastiCache Redis connection"""
         if self.elasticache_client is None:
-            self._connect_to_elasticache()
+            with self._connect_lock:
+                if self.elasticache_client is None:
+                    self._connect_to_elasticache()
         return self.elasticache_client
     
+    def _documentdb_client_settings(self, host: str, port: str, database: str, username: str,
+                                    password: str, ssl_ca_certs: Optional[str] = None):
+        """Build the DocumentDB connection string and client options (shared with the async client)"""
+        # URL encode username and password to handle special characters
+        encoded_username = quote_plus(username)
+        encoded_password = quote_plus(password)
+        
+        # Build connection string with properly encoded credentials and TLS settings
+        connection_string = f'mongodb://{encoded_username}:{encoded_password}@{host}:{port}/{database}?tls=true&tlsAllowInvalidCertificates=true&replicaSet=rs0&readPreference=secondaryPreferred&retryWrites=false'
+        
+        # Pool size, timeouts, compression and read retries come from the pool profile
+        connection_options = self.pool_profile.mongo_options()
+        
+        # Add SSL CA certificate file if provided
+        if ssl_ca_certs:
+            connection_options['tlsCAFile'] = ssl_ca_certs
+            print(f"Using SSL CA certificate file: {ssl_ca_certs}")
+        
+        return connection_string, connection_options
+    
+    def _elasticache_cluster_config(self, host: str, port: str) -> Dict[str, Any]:
+        """Build the RedisCluster keyword arguments (shared with the async client)"""
+        # TLS/SSL is required for Valkey Serverless
+        ssl_enabled = True
+        
+        # Base configuration for RedisCluster; pool size, timeouts and keepalive come from the pool profile
+        cluster_config = {
+            'host': host,
+            'port': int(port),
+            'decode_responses': True,
+            'skip_full_coverage_check': True,  # Essential for serverless
+            **self.pool_profile.redis_options()
+        }
+        
+        # Add authentication if credentials are available
+        # if username and password:
+        #     cluster_config['username'] = username
+        #     cluster_config['password'] = password
+        #     print("ElastiCache AUTH credentials configured from Secrets Manager")
+        # else:
+        #     print("ElastiCache AUTH credentials not available, connecting without authentication")
+        
+        # Add TLS/SSL configuration (required for Valkey Serverless)
+        if ssl_enabled:
+            import ssl
+            cluster_config.update({
+                'ssl': True,
+                'ssl_cert_reqs': ssl.CERT_NONE,  # Don't verify certificates for managed service
+                'ssl_check_hostname': False,     # Don't check hostname for managed service
+                'ssl_ca_certs': None            # Use system CA bundle
+            })
+            print("ElastiCache TLS/SSL enabled for Valkey Serverless")
+        
+        return cluster_config
+    
     def _connect_to_documentdb(self):
         """Connect to DocumentDB using environment variables and Secrets Manager"""
         if not PYMONGO_AVAILABLE:
             print("ERROR: pymongo is required but not available")
             print("Please install pymongo: pip install pymongo")
             sys.exit(1)
+        from pymongo import MongoClient
+        from pymongo.errors import OperationFailure
         
         # Get connection details from environment variables
         host = os.environ.get('DOCUMENTDB_HOST')
@@ -165,26 +335,14 @@ class DatabaseConnections:
                 print("ERROR: DocumentDB credentials not available from Secrets Manager or environment variables")
                 sys.exit(1)
             
-            # URL encode username and password to handle special characters
-            encoded_username = quote_plus(username)
-            encoded_password = quote_plus(password)
-            
-            # Build connection string with properly encoded credentials and TLS settings
-            connection_string = f'mongodb://{encoded_username}:{encoded_password}@{host}:{port}/{database}?tls=true&tlsAllowInvalidCertificates=true&replicaSet=rs0&readPreference=secondaryPreferred&retryWrites=false'
+            connection_string, connection_options = self._documentdb_client_settings(
+                host, port, database, username, password, ssl_ca_certs)
             
-            print(f"Connecting to DocumentDB at {host}:{port}")
+            if instrumentation.enabled:
+                connection_options['event_listeners'] = [instrumentation.mongo_listener(),
+                                                         instrumentation.mongo_pool_listener()]
             
-            # Prepare connection options
-            connection_options = {
-                'serverSelectionTimeoutMS': 10000,  # 10 second timeout
-                'connectTimeoutMS': 10000,
-                'socketTimeoutMS': 10000
-            }
-            
-            # Add SSL CA certificate file if provided
-            if ssl_ca_certs:
-                connection_options['tlsCAFile'] = ssl_ca_certs
-                print(f"Using SSL CA certificate file: {ssl_ca_certs}")
+            print(f"Connecting to DocumentDB at {host}:{port} ({self.pool_profile.name} pool profile)")
             
             # Connect to DocumentDB
             self.documentdb_client = MongoClient(
@@ -199,8 +357,13 @@ class DatabaseConnections:
             self._database_name = database
             
             print(f"✅ Successfully connected to DocumentDB database: {database}")
+            if connection_options['minPoolSize']:
+                # pymongo's background task opens minPoolSize connections to each server
+                print(f"   Pre-warming {connection_options['minPoolSize']} pooled connection(s) per server")
             
         except Exception as e:
+            if isinstance(e, OperationFailure) and e.code == MONGO_AUTHENTICATION_FAILED:
+                self.invalidate_database_credentials()
             print(f"ERROR: Failed to connect to DocumentDB: {e}")
             print(f"Connection details:")
             print(f"  Host: {host}")
@@ -216,6 +379,7 @@ class DatabaseConnections:
             print("ERROR: boto3 is required but not available")
             print("Please install boto3: pip install boto3")
             sys.exit(1)
+        import boto3
         
         # Get connection details from environment variables
         region = os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION'))
@@ -226,11 +390,15 @@ class DatabaseConnections:
             sys.exit(1)
         
         try:
-            print(f"Connecting to DynamoDB in region: {region}")
+            print(f"Connecting to DynamoDB in region: {region} ({self.pool_profile.name} pool profile)")
             
-            # Connect to DynamoDB
-            self.dynamodb_resource = boto3.resource('dynamodb', region_name=region)
+            # Connect to DynamoDB through a shared session so bulk workers can build their own clients
+            self.boto3_session = boto3.session.Session(region_name=region)
+            if instrumentation.enabled:
+                instrumentation.instrument_boto3_session(self.boto3_session)
+            self.dynamodb_resource = self.boto3_session.resource('dynamodb', config=self.get_dynamodb_config())
             self._region = region
+            self._prewarm_dynamodb(self.pool_profile.prewarm_connections)
             
             print(f"✅ Successfully connected to DynamoDB in region: {region}")
             
@@ -246,6 +414,7 @@ class DatabaseConnections:
             print("ERROR: redis is required but not available")
             print("Please install redis: pip install redis")
             sys.exit(1)
+        import redis
         
         # Get connection details from environment variables
         host = os.environ.get('ELASTICACHE_HOST')
@@ -257,55 +426,35 @@ class DatabaseConnections:
             print("\nPlease ensure the environment variables are set correctly.")
             sys.exit(1)
         
+        cluster_config = {}
         try:
-            print(f"Connecting to ElastiCache at {host}:{port}")
+            print(f"Connecting to ElastiCache at {host}:{port} ({self.pool_profile.name} pool profile)")
             
             # Get authentication credentials from Secrets Manager
             # username, password = self._get_elasticache_credentials()
             
-            # TLS/SSL is required for Valkey Serverless
-            ssl_enabled = True
-            
-            # Base configuration for RedisCluster
-            cluster_config = {
-                'host': host,
-                'port': int(port),
-                'decode_responses': True,
-                'skip_full_coverage_check': True,  # Essential for serverless
-                'socket_connect_timeout': 10,
-                'socket_timeout': 10,
-                'retry_on_timeout': True,
-                'max_connections': 10
-            }
-            
-            # Add authentication if credentials are available
-            # if username and password:
-            #     cluster_config['username'] = username
-            #     cluster_config['password'] = password
-            #     print("ElastiCache AUTH credentials configured from Secrets Manager")
-            # else:
-            #     print("ElastiCache AUTH credentials not available, connecting without authentication")
-            
-            # Add TLS/SSL configuration (required for Valkey Serverless)
-            if ssl_enabled:
-                import ssl
-                cluster_config.update({
-                    'ssl': True,
-                    'ssl_cert_reqs': ssl.CERT_NONE,  # Don't verify certificates for managed service
-                    'ssl_check_hostname': False,     # Don't check hostname for managed service
-                    'ssl_ca_certs': None            # Use system CA bundle
-                })
-                print("ElastiCache TLS/SSL enabled for Valkey Serverless")
+            cluster_config = self._elasticache_cluster_config(host, port)
+            # Wait up to pool_timeout for a free connection instead of failing when a node's pool is
+            # exhausted. RedisCluster only builds its per-node pools with connection_pool_class when
+            # it is created from a URL, so host, port and TLS go into one
+            scheme = 'rediss' if cluster_config.pop('ssl', False) else 'redis'
+            url = f"{scheme}://{cluster_config.pop('host')}:{cluster_config.pop('port')}"
+            cluster_config['connection_pool_class'] = partial(redis.BlockingConnectionPool,
+                                                              timeout=self.pool_profile.pool_timeout)
             
             # Connect to ElastiCache Redis using RedisCluster for serverless compatibility
-            self.elasticache_client = redis.RedisCluster(**cluster_config)
+            self.elasticache_client = redis.RedisCluster.from_url(url, **cluster_config)
             
             # Test the connection
             self.elasticache_client.ping()
+            if instrumentation.enabled:
+                instrumentation.instrument_redis_client(self.elasticache_client)
+            self._prewarm_redis(self.elasticache_client, self.pool_profile.prewarm_connections)
             
             print(f"✅ Successfully connected to ElastiCache: {host}:{port}")
             
         except redis.AuthenticationError as e:
+            self.invalidate_database_credentials()
             print(f"ERROR: ElastiCache authentication failed: {e}")
             print("Please check your ElastiCache credentials in Secrets Manager")
             sys.exit(1)
@@ -314,9 +463,41 @@ class DatabaseConnections:
             print(f"Connection details:")
             print(f"  Host: {host}")
             print(f"  Port: {port}")
-            print(f"  AUTH Credentials: {'✓ Configured' if username and password else '✗ Not configured'}")
+            auth_configured = cluster_config.get('username') and cluster_config.get('password')
+            print(f"  AUTH Credentials: {'✓ Configured' if auth_configured else '✗ Not configured'}")
             sys.exit(1)
     
+    def _prewarm_dynamodb(self, count: int):
+        """Open count HTTP connections (and resolve credentials) with concurrent DescribeEndpoints calls"""
+        if count <= 0:
+            return
+        client = self.dynamodb_resource.meta.client
+        try:
+            with ThreadPoolExecutor(max_workers=count) as executor:
+                list(executor.map(lambda _: client.describe_endpoints(), range(count)))
+            print(f"   Pre-warmed {count} DynamoDB connection(s)")
+        except Exception as e:
+            # Warming is an optimization; the first real request opens connections anyway
+            print(f"WARNING: Could not pre-warm DynamoDB connections: {e}")
+    
+    def _prewarm_redis(self, client, count: int):
+        """Open count connections in every node's pool and return them to the pool"""
+        if count <= 0:
+            return
+        if hasattr(client, 'get_nodes'):
+            pools = [node.redis_connection.connection_pool for node in client.get_nodes()
+                     if node.redis_connection is not None]
+        else:
+            pools = [client.connection_pool]
+        try:
+            for pool in pools:
+                connections = [pool.get_connection() for _ in range(count)]
+                for connection in connections:
+                    pool.release(connection)
+            print(f"   Pre-warmed {count} ElastiCache connection(s) on each of {len(pools)} node(s)")
+        except Exception as e:
+            print(f"WARNING: Could not pre-warm ElastiCache connections: {e}")
+    
     def close_connections(self):
         """Close all database connections"""
         if self.documentdb_client:
@@ -373,6 +554,26 @@ def get_dynamodb_table(table_env_var: str):
     return db_connections.get_dynamodb_table(table_env_var)
 
 
+def describe_dynamodb_table(table_name: str):
+    """Convenience function to get a table's cached DescribeTable attributes"""
+    return db_connections.describe_dynamodb_table(table_name)
+
+
+def get_dynamodb_config():
+    """Convenience function to get the pool profile's botocore Config"""
+    return db_connections.get_dynamodb_config()
+
+
+def set_pool_profile(name: str):
+    """Convenience function to choose the connection pool profile"""
+    db_connections.set_pool_profile(name)
+
+
+def get_boto3_session():
+    """Convenience function to get the shared boto3 session"""
+    return db_connections.get_boto3_session()
+
+
 def get_elasticache_client():
     """Convenience function to get ElastiCache client"""
     return db_connections.get_elasticache_connection()
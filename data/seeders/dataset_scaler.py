@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dataset Scaler for Unicorn E-Commerce
+Streams N-times larger, deterministic copies of the data/output JSON files for load testing
+
+Copy 0 is the shipped data; every further copy suffixes its ids with -<copy>, so references
+stay intact within a copy:
+- inventory and review productIds match the products of the same copy
+- search behaviors reference terms that exist in the scaled popular_search_terms.json
+- embeddings are perturbed with seeded noise, keeping their dimension and length
+
+Records are read and written one at a time, so scaling to millions of records takes the
+memory of one record. The same seed always produces byte-identical files.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import zlib
+from typing import Any, Dict, Iterator, List, Optional
+
+from data_loader import OUTPUT_DIR, iter_json_records, output_file_exists, write_json_array
+from embedding_store import EMBEDDING_FIELD, open_embedding_store
+
+# Id fields suffixed in every copy after the first
+SCALED_ID_FIELDS = {
+    'products.json': ['productId'],
+    'inventory.json': ['productId', 'sku'],
+    'reviews.json': ['reviewId', 'productId', 'userId'],
+    'knowledge_base.json': ['contentId'],
+    'search_behaviors.json': ['searchId', 'userId', 'sessionId'],
+    'popular_search_terms.json': ['term'],
+}
+
+MANIFEST_FILENAME = 'scale_manifest.json'
+
+
+def scaled_id(value: Any, copy: int) -> Any:
+    """Return the id of value in the given copy (copy 0 keeps the original)"""
+    return f"{value}-{copy}" if copy else value
+
+
+class DatasetScaler:
+    """Deterministic, streaming N-times scaler for the generated data files"""
+
+    def __init__(self, scale: int, seed: int = 0, embedding_noise: float = 0.05):
+        if scale < 1:
+            raise ValueError(f"scale must be at least 1, got {scale}")
+        self.scale = scale
+        self.seed = seed
+        self.embedding_noise = embedding_noise
+        self._terms: Optional[List[str]] = None
+
+    def _rng(self, filename: str, copy: int) -> random.Random:
+        # String seeds are hashed with SHA-512, so this does not depend on PYTHONHASHSEED
+        return random.Random(f"{self.seed}:{filename}:{copy}")
+
+    def _real_terms(self) -> List[str]:
+        """Distinct source search terms, in file order"""
+        if self._terms is None:
+            terms = {}
+            if output_file_exists('popular_search_terms.json'):
+                for record in iter_json_records('popular_search_terms.json'):
+                    terms.setdefault(record['term'], None)
+            self._terms = list(terms)
+        return self._terms
+
+    def _real_term(self, term: str) -> str:
+        """Map a search term onto one that exists in popular_search_terms.json"""
+        terms = self._real_terms()
+        if not terms:
+            return term
+        # The same unknown term always maps to the same real one, keeping the term distribution's shape
+        return terms[zlib.crc32(term.encode('utf-8')) % len(terms)]
+
+    def perturb_embedding(self, vector: List[float], rng: random.Random) -> List[float]:
+        """Add uniform noise scaled to the vector's RMS, then restore the original length"""
+        norm = math.sqrt(sum(x * x for x in vector))
+        if not norm:
+            return list(vector)
+        spread = 2 * self.embedding_noise * norm / math.sqrt(len(vector))
+        uniform = rng.random
+        noisy = [x + spread * (uniform() - 0.5) for x in vector]
+        factor = norm / math.sqrt(sum(x * x for x in noisy))
+        return [round(x * factor, 6) for x in noisy]
+
+    def scale_records(self, filename: str) -> Iterator[Dict[str, Any]]:
+        """Yield the scaled records of one data file, streaming the source once per copy"""
+        id_fields = SCALED_ID_FIELDS.get(filename, [])
+        # Embeddings moved to a sidecar are joined back so every copy carries its own vector
+        embeddings = open_embedding_store(filename)
+        remap_terms = filename == 'search_behaviors.json'
+        real_terms = set(self._real_terms()) if remap_terms else None
+
+        for copy in range(self.scale):
+            rng = self._rng(filename, copy)
+            for record in iter_json_records(filename):
+                if embeddings is not None:
+                    embeddings.attach_one(record)
+                if copy:
+                    for field in id_fields:
+                        if record.get(field) is not None:
+                            record[field] = scaled_id(record[field], copy)
+                    if record.get(EMBEDDING_FIELD):
+                        record[EMBEDDING_FIELD] = self.perturb_embedding(record[EMBEDDING_FIELD], rng)
+                if remap_terms and record.get('searchTerm') is not None:
+                    term = record['searchTerm']
+                    if term not in real_terms:
+                        term = self._real_term(term)
+                    record['searchTerm'] = scaled_id(term, copy)
+                yield record
+
+    def write(self, filename: str, target_dir: str) -> int:
+        """Write the scaled copy of one data file to target_dir and return its record count"""
+        return write_json_array(os.path.join(target_dir, filename), self.scale_records(filename))
+
+    def write_all(self, target_dir: str, filenames: Optional[List[str]] = None) -> Dict[str, int]:
+        """Write every available data file, plus a manifest, and return each file's record count"""
+        if os.path.realpath(target_dir) == os.path.realpath(OUTPUT_DIR):
+            raise ValueError("Refusing to overwrite the source data files; choose another directory")
+        os.makedirs(target_dir, exist_ok=True)
+
+        counts = {}
+        for filename in filenames or list(SCALED_ID_FIELDS):
+            if output_file_exists(filename):
+                counts[filename] = self.write(filename, target_dir)
+
+        manifest = {
+            'scale': self.scale,
+            'seed': self.seed,
+            'embeddingNoise': self.embedding_noise,
+            'records': counts,
+        }
+        with open(os.path.join(target_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        return counts
+
+
+def main():
+    """Write a scaled copy of data/output"""
+    parser = argparse.ArgumentParser(description='Write a deterministic N-times scaled copy of data/output')
+    parser.add_argument('--scale', type=int, required=True, help='Copies of the shipped data to write')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--embedding-noise', type=float, default=0.05,
+                        help='Noise added to copied embeddings, relative to their RMS value (default: 0.05)')
+    parser.add_argument('--files', nargs='+', choices=sorted(SCALED_ID_FIELDS), metavar='FILE',
+                        help='Data files to scale (default: all that exist)')
+    parser.add_argument('--output-dir', help='Target directory (default: data/output/scaled-<scale>x)')
+    args = parser.parse_args()
+
+    target_dir = args.output_dir or os.path.join(OUTPUT_DIR, f"scaled-{args.scale}x")
+    scaler = DatasetScaler(args.scale, seed=args.seed, embedding_noise=args.embedding_noise)
+    try:
+        counts = scaler.write_all(target_dir, args.files)
+    except (OSError, ValueError) as e:
+        print(f"❌ Failed to scale dataset: {e}")
+        return False
+
+    print(f"✅ Wrote {args.scale}x dataset (seed {args.seed}) to {target_dir}")
+    for filename, count in counts.items():
+        print(f"   {filename}: {count:,} records")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
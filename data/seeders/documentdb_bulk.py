@@ -0,0 +1,282 @@
+"""
+DocumentDB Bulk Operations for Unicorn E-Commerce Seeders
+Provides a multi-threaded, unordered bulk loader with byte-sized batches
+"""
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import bson
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from pymongo import InsertOne, ReplaceOne
+from pymongo.errors import AutoReconnect, BulkWriteError, OperationFailure
+from pymongo.write_concern import WriteConcern
+
+from instrumentation import instrumentation
+
+# Write concern profiles for DocumentDB writes. bulk_load acknowledges from the primary
+# without waiting for the journal; DocumentDB still persists every acknowledged write to
+# its storage quorum, so this only trims latency on stand-ins that honour j/w
+WRITE_CONCERN_PROFILES = {
+    'default': WriteConcern(),
+    'bulk_load': WriteConcern(w=1, j=False),
+}
+
+# Embedding documents are ~30 KB each, so batches are capped by bytes before count
+DEFAULT_MAX_BATCH_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_BATCH_DOCS = 1000
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Blue/green reseeds load into <name>_shadow and rename it over the live collection
+SHADOW_SUFFIX = '_shadow'
+RETIRED_SUFFIX = '_retired'
+
+
+def create_shadow_collection(collection, keep_existing: bool = False):
+    """
+    Return an empty shadow collection next to collection, dropping any leftover from a failed run.
+
+    A resumed load passes keep_existing to continue filling the shadow it was interrupted in.
+    """
+    shadow = collection.database[collection.name + SHADOW_SUFFIX]
+    if not keep_existing:
+        shadow.drop()
+    return shadow
+
+
+def promote_shadow_collection(shadow, live_name: str):
+    """
+    Atomically replace the live collection with a fully loaded and indexed shadow collection.
+
+    renameCollection with dropTarget swaps the shadow in and drops the old collection in one
+    step, so readers see either the old catalog or the new one. Where dropTarget is rejected,
+    the old collection is renamed aside first, leaving only a brief window without it.
+    """
+    database = shadow.database
+    try:
+        shadow.rename(live_name, dropTarget=True)
+        print(f"✅ Swapped {shadow.name} in as {live_name}")
+        return
+    except OperationFailure as e:
+        print(f"⚠️  renameCollection with dropTarget failed ({e}); swapping in two steps")
+
+    retired_name = live_name + RETIRED_SUFFIX
+    database.drop_collection(retired_name)
+    if live_name in database.list_collection_names():
+        database[live_name].rename(retired_name)
+    shadow.rename(live_name)
+    database.drop_collection(retired_name)
+    print(f"✅ Swapped {shadow.name} in as {live_name}")
+
+
+class DocumentDBBulkLoader:
+    """
+    Load documents into a DocumentDB collection from several worker threads.
+
+    Documents are BSON-encoded once on the producer side, grouped into batches capped by
+    serialized size, and written with unordered bulk_write calls over the shared MongoClient
+    (which is thread-safe and pools connections). Network errors are retried with exponential
+    backoff and full jitter; duplicate key errors on a retry count as already written.
+
+    Given a run journal checkpoint, documents the interrupted run committed are skipped, and
+    every batch written in full is committed to the journal.
+    """
+
+    def __init__(self, collection, workers: int = 4, max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+                 max_batch_docs: int = DEFAULT_MAX_BATCH_DOCS, write_concern: str = 'bulk_load',
+                 max_retries: int = 5, base_delay: float = 0.1, max_delay: float = 5.0):
+        if write_concern not in WRITE_CONCERN_PROFILES:
+            raise ValueError(f"Unknown write concern profile: {write_concern}. "
+                             f"Available: {', '.join(WRITE_CONCERN_PROFILES)}")
+
+        self.collection = collection.with_options(write_concern=WRITE_CONCERN_PROFILES[write_concern])
+        self.workers = max(1, workers)
+        self.max_batch_bytes = max(1, max_batch_bytes)
+        self.max_batch_docs = max(1, max_batch_docs)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+
+        # Throughput statistics
+        self.docs_written = 0
+        self.docs_failed = 0
+        self.docs_skipped = 0
+        self.bytes_written = 0
+        self.batches = 0
+        self.retries = 0
+        self.elapsed = 0.0
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _backoff(self, attempt: int):
+        """Sleep with exponential backoff and full jitter"""
+        time.sleep(self._backoff_delay(attempt))
+
+    def _build_requests(self, batch: List[RawBSONDocument], key_field: Optional[str]) -> list:
+        """Build InsertOne requests, or upserting ReplaceOne requests keyed on key_field"""
+        if key_field is None:
+            return [InsertOne(doc) for doc in batch]
+        return [ReplaceOne({key_field: doc[key_field]}, doc, upsert=True) for doc in batch]
+
+    def _write_batch(self, batch: List[RawBSONDocument], batch_bytes: int, key_field: Optional[str] = None) -> int:
+        """Write one batch with an unordered bulk_write, retrying network errors; return the failed count"""
+        attempt = 0
+        while True:
+            try:
+                result = self.collection.bulk_write(self._build_requests(batch, key_field), ordered=False)
+                written = result.inserted_count + result.upserted_count + result.matched_count
+                failed = 0
+                break
+            except BulkWriteError as e:
+                written, failed = self._bulk_write_error_counts(e, len(batch), attempt)
+                break
+            except AutoReconnect as e:
+                if attempt >= self.max_retries:
+                    print(f"Failed to write batch of {len(batch)} documents to {self.collection.name}: {e}")
+                    written, failed = 0, len(batch)
+                    break
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                instrumentation.record_retry('documentdb')
+                self._backoff(attempt)
+
+        self._record_batch(len(batch), batch_bytes, written, failed)
+        return failed
+
+    def _bulk_write_error_counts(self, error: BulkWriteError, batch_size: int, attempt: int) -> Tuple[int, int]:
+        """Return (written, failed) for a batch whose unordered bulk_write raised BulkWriteError"""
+        errors = error.details.get('writeErrors', [])
+        # After a retry, duplicates are documents the lost attempt already inserted
+        duplicates = sum(1 for err in errors if attempt and err.get('code') == DUPLICATE_KEY_ERROR)
+        written = (error.details.get('nInserted', 0) + error.details.get('nUpserted', 0)
+                   + error.details.get('nMatched', 0) + duplicates)
+        failed = len(errors) - duplicates
+        if failed:
+            print(f"{failed} of {batch_size} documents failed to write to {self.collection.name}: "
+                  f"{errors[0].get('errmsg')}")
+        return written, failed
+
+    def _record_batch(self, batch_size: int, batch_bytes: int, written: int, failed: int):
+        """Add a finished batch to the throughput statistics"""
+        with self._lock:
+            self.batches += 1
+            self.docs_written += written
+            self.docs_failed += failed
+            self.bytes_written += batch_bytes * written // batch_size
+
+    def _worker(self, batches: "queue.Queue", checkpoint=None):
+        """Drain batches from the shared queue until the end-of-input marker arrives"""
+        while True:
+            item = batches.get()
+            if item is None:
+                return
+            batch, batch_bytes, key_field, positions = item
+            try:
+                failed = self._write_batch(batch, batch_bytes, key_field)
+                # Partly failed batches stay uncommitted and are replayed by a resumed run
+                if checkpoint is not None and not failed:
+                    checkpoint.commit(positions)
+            except Exception as e:
+                # Keep draining so the producer never blocks on a dead worker
+                print(f"Failed to write batch of {len(batch)} documents to {self.collection.name}: {e}")
+                with self._lock:
+                    self.docs_failed += len(batch)
+
+    def _iter_batches(self, documents: Iterable[Dict[str, Any]], assign_ids: bool,
+                      checkpoint=None) -> Iterable[Tuple[List[RawBSONDocument], int, List[int]]]:
+        """
+        Encode documents once and group them into batches capped by bytes and count.
+
+        Each batch comes with the stream positions of its documents; documents the checkpoint
+        has as committed are skipped.
+        """
+        batch, batch_bytes, positions = [], 0, []
+        for position, document in enumerate(documents):
+            if checkpoint is not None and checkpoint.is_committed(position):
+                self.docs_skipped += 1
+                continue
+            # The driver cannot add an _id to pre-encoded documents, so assign it here as insert_many would
+            if assign_ids and '_id' not in document:
+                document['_id'] = ObjectId()
+            raw = RawBSONDocument(bson.encode(document))
+            size = len(raw.raw)
+            if batch and (batch_bytes + size > self.max_batch_bytes or len(batch) >= self.max_batch_docs):
+                yield batch, batch_bytes, positions
+                batch, batch_bytes, positions = [], 0, []
+            batch.append(raw)
+            batch_bytes += size
+            positions.append(position)
+        if batch:
+            yield batch, batch_bytes, positions
+
+    def load(self, documents: Iterable[Dict[str, Any]], checkpoint=None) -> int:
+        """Insert all documents and return how many were written successfully"""
+        return self._run(documents, key_field=None, checkpoint=checkpoint)
+
+    def upsert(self, documents: Iterable[Dict[str, Any]], key_field: str, checkpoint=None) -> int:
+        """Replace (or insert) each document matched on key_field and return how many were written"""
+        return self._run(documents, key_field=key_field, checkpoint=checkpoint)
+
+    def delete(self, key_field: str, keys: Iterable[Any], chunk_size: int = 1000) -> int:
+        """Delete the documents whose key_field is in keys and return how many were deleted"""
+        deleted = 0
+        keys = list(keys)
+        start = time.perf_counter()
+        for i in range(0, len(keys), chunk_size):
+            deleted += self.collection.delete_many({key_field: {'$in': keys[i:i + chunk_size]}}).deleted_count
+        self.elapsed += time.perf_counter() - start
+        return deleted
+
+    def _run(self, documents: Iterable[Dict[str, Any]], key_field: Optional[str], checkpoint=None) -> int:
+        """Feed encoded batches to the worker threads and wait for them to finish"""
+        written_before = self.docs_written
+        # A bounded queue keeps memory flat when documents come from a generator
+        batches = queue.Queue(maxsize=self.workers * 2)
+        threads = [threading.Thread(target=self._worker, args=(batches, checkpoint), daemon=True)
+                   for _ in range(self.workers)]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            # Upserts keep the stored _id, so only plain inserts get a client-side one
+            batch_iter = self._iter_batches(documents, assign_ids=key_field is None, checkpoint=checkpoint)
+            for batch, batch_bytes, positions in batch_iter:
+                batches.put((batch, batch_bytes, key_field, positions))
+        finally:
+            for _ in threads:
+                batches.put(None)
+            for thread in threads:
+                thread.join()
+            self.elapsed += time.perf_counter() - start
+
+        return self.docs_written - written_before
+
+    @property
+    def docs_per_second(self) -> float:
+        """Average document throughput across all loads"""
+        return self.docs_written / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        """Average BSON throughput across all loads"""
+        return self.bytes_written / (1024 * 1024) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def print_stats(self, label: str = "DocumentDB bulk load"):
+        """Print throughput statistics for this loader"""
+        print(f"{label}: {self.docs_written:,} documents ({self.bytes_written / (1024 * 1024):,.1f} MB) "
+              f"written by {self.workers} workers in {self.elapsed:.2f}s "
+              f"({self.docs_per_second:,.0f} docs/sec, {self.mb_per_second:,.1f} MB/sec)")
+        print(f"  Batches: {self.batches:,}, retries: {self.retries:,}")
+        if self.docs_skipped:
+            print(f"  Skipped (committed by the interrupted run): {self.docs_skipped:,}")
+        if self.docs_failed:
+            print(f"  Failed documents: {self.docs_failed:,}")
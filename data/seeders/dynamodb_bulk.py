@@ -0,0 +1,321 @@
+"""
+DynamoDB Bulk Operations for Unicorn E-Commerce Seeders
+Provides parallel, schema-aware table truncation and a multi-threaded bulk loader
+"""
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List
+
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+
+# Import common database connections
+from database_connections import describe_dynamodb_table, get_boto3_session, get_dynamodb_config
+from instrumentation import instrumentation
+
+# DynamoDB limit for a single BatchWriteItem request
+BATCH_WRITE_LIMIT = 25
+
+# Errors that mean "slow down and try again" rather than "this request is invalid"
+RETRYABLE_ERROR_CODES = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'InternalServerError',
+    'ServiceUnavailable',
+}
+
+
+def get_key_attributes(table) -> List[str]:
+    """Return the table's key attribute names from its (cached) KeySchema"""
+    return [key['AttributeName'] for key in describe_dynamodb_table(table.name)['KeySchema']]
+
+
+def truncate_table(table, segments: int = 8) -> int:
+    """
+    Delete every item in a DynamoDB table and return the number of items deleted.
+
+    Runs a paginated parallel scan with one segment per worker thread, projecting only the key
+    attributes, and deletes through a batch writer owned by each worker.
+    """
+    segments = max(1, segments)
+    key_names = get_key_attributes(table)
+    attribute_names = {f"#k{i}": name for i, name in enumerate(key_names)}
+    projection = ', '.join(attribute_names)
+
+    # boto3 resources are not thread-safe, so every worker gets its own Table handle
+    session = get_boto3_session()
+    worker_tables = [session.resource('dynamodb', config=get_dynamodb_config()).Table(table.name)
+                     for _ in range(segments)]
+
+    def delete_segment(segment: int) -> int:
+        worker_table = worker_tables[segment]
+        scan_kwargs = {
+            'Segment': segment,
+            'TotalSegments': segments,
+            'ProjectionExpression': projection,
+            'ExpressionAttributeNames': attribute_names,
+        }
+        deleted = 0
+        with worker_table.batch_writer() as batch:
+            while True:
+                response = worker_table.scan(**scan_kwargs)
+                for item in response.get('Items', []):
+                    batch.delete_item(Key={name: item[name] for name in key_names})
+                    deleted += 1
+
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    break
+                scan_kwargs['ExclusiveStartKey'] = last_key
+        return deleted
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        deleted_count = sum(executor.map(delete_segment, range(segments)))
+    elapsed = time.perf_counter() - start
+
+    rate = deleted_count / elapsed if elapsed > 0 else 0.0
+    print(f"Truncated {table.name}: {deleted_count:,} items deleted across {segments} segments "
+          f"in {elapsed:.2f}s ({rate:,.0f} items/sec)")
+    return deleted_count
+
+
+def scan_attributes(table, attribute_names: List[str], segments: int = 8) -> List[Dict[str, Any]]:
+    """
+    Return every item in a table projected to the given attributes.
+
+    Uses the same paginated parallel scan as truncate_table, one segment per worker thread.
+    """
+    segments = max(1, segments)
+    placeholders = {f"#a{i}": name for i, name in enumerate(attribute_names)}
+    projection = ', '.join(placeholders)
+
+    session = get_boto3_session()
+    worker_tables = [session.resource('dynamodb', config=get_dynamodb_config()).Table(table.name)
+                     for _ in range(segments)]
+
+    def scan_segment(segment: int) -> List[Dict[str, Any]]:
+        worker_table = worker_tables[segment]
+        scan_kwargs = {
+            'Segment': segment,
+            'TotalSegments': segments,
+            'ProjectionExpression': projection,
+            'ExpressionAttributeNames': placeholders,
+        }
+        items = []
+        while True:
+            response = worker_table.scan(**scan_kwargs)
+            items.extend(response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return items
+            scan_kwargs['ExclusiveStartKey'] = last_key
+
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        return [item for items in executor.map(scan_segment, range(segments)) for item in items]
+
+
+def count_items(table) -> int:
+    """Count every item in a table, following scan pagination"""
+    scan_kwargs = {'Select': 'COUNT'}
+    total = 0
+    while True:
+        response = table.scan(**scan_kwargs)
+        total += response['Count']
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return total
+        scan_kwargs['ExclusiveStartKey'] = last_key
+
+
+class DynamoDBBulkLoader:
+    """
+    Load items into a DynamoDB table from several worker threads.
+
+    Each worker owns a low-level client created from the shared session and calls
+    batch_write_item directly, retrying UnprocessedItems and throttling errors with
+    exponential backoff and full jitter. Consumed write capacity is tracked per request.
+
+    Given a run journal checkpoint, items the interrupted run committed are skipped, and every
+    batch written in full is committed to the journal. Puts overwrite, so replaying a batch
+    that was in flight is idempotent.
+    """
+
+    def __init__(self, table_name: str, workers: int = 4, max_retries: int = 10,
+                 base_delay: float = 0.05, max_delay: float = 5.0):
+        self.table_name = table_name
+        self.workers = max(1, workers)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._clients = self._create_clients()
+        self._serializer = TypeSerializer()
+        self._lock = threading.Lock()
+
+        # Throughput statistics
+        self.items_written = 0
+        self.items_failed = 0
+        self.items_skipped = 0
+        self.requests = 0
+        self.retries = 0
+        self.consumed_capacity = 0.0
+        self.elapsed = 0.0
+
+    def _create_clients(self) -> list:
+        """Create one low-level client per worker from the shared session"""
+        # Clients are thread-safe once created; create them up front
+        session = get_boto3_session()
+        return [session.client('dynamodb', config=get_dynamodb_config()) for _ in range(self.workers)]
+
+    def _serialize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a resource-style item (Decimal numbers) into the low-level attribute format"""
+        return {key: self._serializer.serialize(value) for key, value in item.items()}
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _backoff(self, attempt: int):
+        """Sleep with exponential backoff and full jitter"""
+        time.sleep(self._backoff_delay(attempt))
+
+    def _build_request(self, kind: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a PutRequest for an item or a DeleteRequest for a key"""
+        if kind == 'delete':
+            return {'DeleteRequest': {'Key': self._serialize(item)}}
+        return {'PutRequest': {'Item': self._serialize(item)}}
+
+    def _write_batch(self, client, batch: List[Dict[str, Any]], kind: str = 'put') -> bool:
+        """
+        Write one batch of up to 25 requests, retrying unprocessed items until done or out of retries.
+
+        Returns True when every request in the batch succeeded.
+        """
+        request_items = {self.table_name: [self._build_request(kind, item) for item in batch]}
+        pending = len(batch)
+        attempt = 0
+
+        while pending:
+            try:
+                response = client.batch_write_item(RequestItems=request_items, ReturnConsumedCapacity='TOTAL')
+            except ClientError as e:
+                code = e.response.get('Error', {}).get('Code')
+                if code in RETRYABLE_ERROR_CODES and attempt < self.max_retries:
+                    attempt += 1
+                    with self._lock:
+                        self.retries += 1
+                    instrumentation.record_retry('dynamodb')
+                    self._backoff(attempt)
+                    continue
+                print(f"Failed to write batch of {pending} items to {self.table_name}: {e}")
+                with self._lock:
+                    self.items_failed += pending
+                return False
+
+            unprocessed = self._record_response(response, pending)
+            pending = len(unprocessed)
+            if not pending:
+                return True
+            if attempt >= self.max_retries:
+                print(f"Giving up on {pending} unprocessed items for {self.table_name} after {attempt} retries")
+                with self._lock:
+                    self.items_failed += pending
+                return False
+
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+            instrumentation.record_retry('dynamodb')
+            request_items = {self.table_name: unprocessed}
+            self._backoff(attempt)
+
+    def _record_response(self, response: Dict[str, Any], pending: int) -> List[Dict[str, Any]]:
+        """Add a batch_write_item response to the statistics and return its unprocessed requests"""
+        unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+        capacity = sum(c.get('CapacityUnits', 0) for c in response.get('ConsumedCapacity', []))
+        with self._lock:
+            self.requests += 1
+            self.items_written += pending - len(unprocessed)
+            self.consumed_capacity += capacity
+        return unprocessed
+
+    def _worker(self, client, batches: "queue.Queue", checkpoint=None):
+        """Drain batches from the shared queue until the end-of-input marker arrives"""
+        while True:
+            work = batches.get()
+            if work is None:
+                return
+            kind, batch, positions = work
+            try:
+                # Partly failed batches stay uncommitted and are replayed by a resumed run
+                if self._write_batch(client, batch, kind) and checkpoint is not None:
+                    checkpoint.commit(positions)
+            except Exception as e:
+                # Keep draining so the producer never blocks on a dead worker
+                print(f"Failed to write batch of {len(batch)} items to {self.table_name}: {e}")
+                with self._lock:
+                    self.items_failed += len(batch)
+
+    def load(self, items: Iterable[Dict[str, Any]], checkpoint=None) -> int:
+        """Write all items and return how many were written successfully"""
+        return self._run(items, 'put', checkpoint=checkpoint)
+
+    def delete(self, keys: Iterable[Dict[str, Any]]) -> int:
+        """Delete the items with the given primary keys and return how many requests succeeded"""
+        return self._run(keys, 'delete')
+
+    def _run(self, items: Iterable[Dict[str, Any]], kind: str, checkpoint=None) -> int:
+        """Feed put or delete requests to the worker threads in batches of 25"""
+        written_before = self.items_written
+        # A bounded queue keeps memory flat when items come from a generator
+        batches = queue.Queue(maxsize=self.workers * 4)
+        threads = [
+            threading.Thread(target=self._worker, args=(client, batches, checkpoint), daemon=True)
+            for client in self._clients
+        ]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            batch, positions = [], []
+            for position, item in enumerate(items):
+                if checkpoint is not None and checkpoint.is_committed(position):
+                    self.items_skipped += 1
+                    continue
+                batch.append(item)
+                positions.append(position)
+                if len(batch) == BATCH_WRITE_LIMIT:
+                    batches.put((kind, batch, positions))
+                    batch, positions = [], []
+            if batch:
+                batches.put((kind, batch, positions))
+        finally:
+            for _ in threads:
+                batches.put(None)
+            for thread in threads:
+                thread.join()
+            self.elapsed += time.perf_counter() - start
+
+        return self.items_written - written_before
+
+    @property
+    def items_per_second(self) -> float:
+        """Average write throughput across all loads"""
+        return self.items_written / self.elapsed if self.elapsed > 0 else 0.0
+
+    def print_stats(self, label: str = "DynamoDB bulk load"):
+        """Print throughput and capacity statistics for this loader"""
+        print(f"{label}: {self.items_written:,} items written by {self.workers} workers in {self.elapsed:.2f}s "
+              f"({self.items_per_second:,.0f} items/sec)")
+        print(f"  Requests: {self.requests:,}, retries: {self.retries:,}, "
+              f"consumed capacity: {self.consumed_capacity:,.1f} WCU")
+        if self.items_skipped:
+            print(f"  Skipped (committed by the interrupted run): {self.items_skipped:,}")
+        if self.items_failed:
+            print(f"  Failed items: {self.items_failed:,}")
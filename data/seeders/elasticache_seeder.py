@@ -3,21 +3,321 @@
 ElastiCache Seeder for Unicorn E-Commerce
 Seeds popular search terms and auto-complete suggestions to ElastiCache (Redis)
 """
+import argparse
 import json
 import os
 import sys
 import redis
 from datetime import datetime
-from typing import List, Dict, Any
+from collections import deque
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 
 # Import common database connections
 from database_connections import get_elasticache_client
+from data_loader import iter_records, output_file_exists, output_path
+from redis_bulk import RedisBulkWriter, count_keys, purge_namespace, scan_keys
+from instrumentation import instrumentation
+from autocomplete import (
+    AUTOCOMPLETE_LEX_KEY,
+    AUTOCOMPLETE_MODES,
+    AUTOCOMPLETE_RANKED_KEY,
+    add_autocomplete_arguments,
+    autocomplete_lookup,
+    autocomplete_options,
+    build_autocomplete_index,
+    iter_prefix_autocomplete_writes,
+    iter_sorted_set_autocomplete_writes,
+    rank_terms
+)
+
+# Key patterns owned by this seeder, purged before every reseed
+SEARCH_CACHE_PATTERNS = [
+    'search:popular_terms',
+    'search:trending_terms',
+    'search:analytics:*',
+    'search_suggestions:*',
+    'search:category:*',
+    'search:autocomplete:*',
+    AUTOCOMPLETE_LEX_KEY,
+    AUTOCOMPLETE_RANKED_KEY,
+    f"{AUTOCOMPLETE_RANKED_KEY}:*",
+]
+
+def queue_popular_term_writes(writer, terms_data: Iterable[Dict[str, Any]], autocomplete_mode: str = 'prefix',
+                              autocomplete_prefix_length: Optional[int] = 4, autocomplete_top_k: int = 10,
+                              autocomplete_term_limit: Optional[int] = None):
+    """Queue every popular-term cache write on a RedisBulkWriter, which flushes itself as its buffer fills"""
+    for _ in iter_popular_term_writes(writer, terms_data, autocomplete_mode, autocomplete_prefix_length,
+                                      autocomplete_top_k, autocomplete_term_limit):
+        pass
+
+
+def iter_popular_term_writes(writer, terms_data: Iterable[Dict[str, Any]], autocomplete_mode: str = 'prefix',
+                             autocomplete_prefix_length: Optional[int] = 4, autocomplete_top_k: int = 10,
+                             autocomplete_term_limit: Optional[int] = None) -> Iterator[None]:
+    """
+    Queue every popular-term cache write on writer, yielding after each term and autocomplete batch.
+
+    Nothing is flushed here; AsyncRedisBulkWriter.queue_from() awaits a flush between steps
+    whenever the buffer fills, so the threaded and async seeders share the same key layout.
+    """
+    # Stream terms once: analytics and suggestions are written as they arrive, while only
+    # the top-50/top-10 lists and slim (term, volume) pairs are kept in memory
+    popular_terms_list = []
+    trending_terms = []
+    categories = {}
+    ranked_terms = []
+    analytics_count = 0
+
+    for i, term_data in enumerate(terms_data):
+        search_term = term_data['term']
+
+        # Prepare popular terms list (top 50 terms)
+        if i < 50:
+            popular_terms_list.append({
+                'term': term_data['term'],
+                'searchVolume': term_data['searchVolume'],
+                'rank': term_data['rank'],
+                'category': term_data['category'],
+                'popularityScore': term_data.get('popularityScore', 0),
+                'clickThroughRate': term_data.get('clickThroughRate', 0),
+                'conversionRate': term_data.get('conversionRate', 0)
+            })
+
+        # Prepare trending terms (top 10 as trending)
+        if i < 10:
+            trending_terms.append({
+                'term': term_data['term'],
+                'searchVolume': term_data['searchVolume'],
+                'category': term_data['category'],
+                'popularityScore': term_data.get('popularityScore', 0)
+            })
+
+        # Cache full term analytics (30 minutes TTL)
+        analytics_data = {
+            'term': search_term,
+            'searchVolume': term_data['searchVolume'],
+            'category': term_data['category'],
+            'rank': term_data['rank'],
+            'clickThroughRate': term_data.get('clickThroughRate', 0),
+            'conversionRate': term_data.get('conversionRate', 0),
+            'bounceRate': term_data.get('bounceRate', 0),
+            'avgSessionDuration': term_data.get('avgSessionDuration', 0),
+            'seasonality': term_data.get('seasonality', 'year-round'),
+            'trendData': term_data.get('trendData', [])
+        }
+
+        cache_key = f"search:analytics:{search_term}"
+        writer.setex(
+            cache_key,
+            1800,  # 30 minutes TTL
+            json.dumps(analytics_data)
+        )
+        analytics_count += 1
+
+        # Cache related terms for suggestions
+        related_terms = term_data.get('relatedTerms', [])
+        if related_terms:
+            suggestions_key = f"search_suggestions:{search_term}"
+            writer.setex(
+                suggestions_key,
+                1800,  # 30 minutes TTL
+                json.dumps(related_terms)
+            )
+
+        # Collect auto-complete data by category
+        slim_term = {
+            'term': term_data['term'],
+            'searchVolume': term_data['searchVolume']
+        }
+        categories.setdefault(term_data['category'], []).append(slim_term)
+        ranked_terms.append(slim_term)
+        yield
+
+    # Cache popular terms list (1 hour TTL)
+    writer.setex(
+        'search:popular_terms',
+        3600,  # 1 hour TTL
+        json.dumps(popular_terms_list)
+    )
+    print(f"✅ Cached {len(popular_terms_list)} popular search terms")
+
+    print(f"✅ Cached analytics for {analytics_count} search terms")
+
+    # Cache trending terms (2 hours TTL)
+    writer.setex(
+        'search:trending_terms',
+        7200,  # 2 hours TTL
+        json.dumps(trending_terms)
+    )
+    print(f"✅ Cached {len(trending_terms)} trending search terms")
+
+    # Sort by search volume and cache top terms per category
+    for category, terms in categories.items():
+        sorted_terms = sorted(terms, key=lambda x: x['searchVolume'], reverse=True)
+        cache_key = f"search:category:{category}"
+        writer.setex(
+            cache_key,
+            3600,  # 1 hour TTL
+            json.dumps([t['term'] for t in sorted_terms[:20]])  # Top 20 terms per category
+        )
+
+    print(f"✅ Cached search terms for {len(categories)} categories")
+
+    if autocomplete_mode == 'sorted_set':
+        # Two sorted sets plus a top-K set per short prefix give exact lookups at any prefix length
+        ranked = rank_terms(ranked_terms, autocomplete_term_limit)
+        yield from iter_sorted_set_autocomplete_writes(
+            writer,
+            ranked,
+            max_prefix_length=autocomplete_prefix_length,
+            top_k=autocomplete_top_k,
+            ttl=3600  # 1 hour TTL
+        )
+        print(f"✅ Indexed {len(ranked)} autocomplete terms in sorted sets")
+    else:
+        # Build the ranked prefix -> top-K map in memory and write it in bulk
+        autocomplete_index = build_autocomplete_index(
+            ranked_terms,
+            max_prefix_length=autocomplete_prefix_length,
+            top_k=autocomplete_top_k,
+            term_limit=autocomplete_term_limit
+        )
+        yield from iter_prefix_autocomplete_writes(writer, autocomplete_index, ttl=3600)  # 1 hour TTL
+        print(f"✅ Created {len(autocomplete_index)} autocomplete prefix entries")
+
+
+def queue_search_behavior_writes(writer, behaviors_filename: str = "search_behaviors.json") -> bool:
+    """
+    Queue the recent-behaviors and analytics-summary cache writes on a RedisBulkWriter
+    (or AsyncRedisBulkWriter); returns False when there is no behaviors file to cache.
+    """
+    filepath = output_path(behaviors_filename)
+    
+    if not os.path.exists(filepath):
+        print(f"⚠️  No search behaviors file found at {filepath}")
+        return False
+    
+    print(f"🔄 Caching recent search behaviors...")
+    
+    # Cache recent searches (last 100) for real-time analytics, streaming the file
+    recent_searches = list(deque(iter_records(filepath), maxlen=100))
+    
+    writer.setex(
+        'search:recent_behaviors',
+        1800,  # 30 minutes TTL
+        json.dumps(recent_searches)
+    )
+    
+    print(f"✅ Cached {len(recent_searches)} recent search behaviors")
+    
+    # Cache search analytics summary
+    summary_filepath = output_path('search_analytics_summary.json')
+    if os.path.exists(summary_filepath):
+        with open(summary_filepath, 'r', encoding='utf-8') as f:
+            summary_data = json.load(f)
+        
+        writer.setex(
+            'search:analytics_summary',
+            3600,  # 1 hour TTL
+            json.dumps(summary_data)
+        )
+        print("✅ Cached search analytics summary")
+    
+    return True
+
+
+def verify_search_cache(redis_client, autocomplete_mode: str = 'prefix', autocomplete_top_k: int = 10) -> bool:
+    """Verify that the popular-term cache keys were written (takes a synchronous Redis client)"""
+    try:
+        print("🔍 Verifying cached data...")
+        
+        # Check popular terms
+        popular_terms = redis_client.get('search:popular_terms')
+        if popular_terms:
+            terms_data = json.loads(popular_terms)
+            print(f"✅ Popular terms cache: {len(terms_data)} terms")
+            
+            # Show sample data
+            if terms_data:
+                sample_term = terms_data[0]
+                print(f"   Sample: '{sample_term['term']}' - {sample_term['searchVolume']:,} searches")
+        else:
+            print("❌ Popular terms cache is empty")
+            return False
+        
+        # Check trending terms
+        trending_terms = redis_client.get('search:trending_terms')
+        if trending_terms:
+            trending_data = json.loads(trending_terms)
+            print(f"✅ Trending terms cache: {len(trending_data)} terms")
+        else:
+            print("❌ Trending terms cache is empty")
+            return False
+        
+        # Check analytics keys
+        analytics_count = count_keys(redis_client, 'search:analytics:*')
+        print(f"✅ Search analytics: {analytics_count} terms cached")
+        
+        # Check suggestion keys
+        suggestion_count = count_keys(redis_client, 'search_suggestions:*')
+        print(f"✅ Auto-complete suggestions: {suggestion_count} terms cached")
+        
+        # Check category keys
+        category_count = count_keys(redis_client, 'search:category:*')
+        print(f"✅ Category searches: {category_count} categories cached")
+        
+        # Check autocomplete prefix keys
+        autocomplete_count = count_keys(redis_client, 'search:autocomplete:*')
+        print(f"✅ Autocomplete prefixes: {autocomplete_count} prefix entries")
+        
+        # Check sorted set autocomplete
+        lex_count = redis_client.zcard(AUTOCOMPLETE_LEX_KEY)
+        if lex_count:
+            print(f"✅ Sorted set autocomplete: {lex_count} terms indexed")
+            ranked_prefix_count = count_keys(redis_client, f"{AUTOCOMPLETE_RANKED_KEY}:*")
+            print(f"✅ Ranked autocomplete prefixes: {ranked_prefix_count} prefix sets")
+            sample_prefix = redis_client.zrevrange(AUTOCOMPLETE_RANKED_KEY, 0, 0)
+            if sample_prefix:
+                prefix = sample_prefix[0][:2]
+                suggestions = autocomplete_lookup(redis_client, prefix, limit=autocomplete_top_k)
+                print(f"   Sample autocomplete '{prefix}': {len(suggestions)} suggestions")
+        elif autocomplete_mode == 'sorted_set':
+            print("❌ Sorted set autocomplete is empty")
+            return False
+        
+        # Test a sample autocomplete lookup
+        sample_key = next(scan_keys(redis_client, 'search:autocomplete:*'), None)
+        if sample_key:
+            sample_key = sample_key.decode('utf-8') if isinstance(sample_key, bytes) else sample_key
+            sample_data = redis_client.get(sample_key)
+            if sample_data:
+                sample_terms = json.loads(sample_data)
+                prefix = sample_key.split(':')[-1]
+                print(f"   Sample autocomplete '{prefix}': {len(sample_terms)} suggestions")
+        
+        print("✅ ElastiCache verification completed successfully")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error verifying cache data: {e}")
+        return False
+
 
 class ElastiCacheSeeder:
     """Seed search terms and suggestions to ElastiCache (Redis)"""
     
-    def __init__(self):
+    def __init__(self, pipeline_chunk_size: int = 500, autocomplete_prefix_length: Optional[int] = 4,
+                 autocomplete_top_k: int = 10, autocomplete_term_limit: Optional[int] = None,
+                 autocomplete_mode: str = 'prefix'):
+        if autocomplete_mode not in AUTOCOMPLETE_MODES:
+            raise ValueError(f"autocomplete_mode must be one of {AUTOCOMPLETE_MODES}, got {autocomplete_mode!r}")
         self.redis_client = get_elasticache_client()
+        self.autocomplete_mode = autocomplete_mode
+        self.pipeline_chunk_size = pipeline_chunk_size
+        self.autocomplete_prefix_length = autocomplete_prefix_length  # None/0 indexes full term length
+        self.autocomplete_top_k = autocomplete_top_k
+        self.autocomplete_term_limit = autocomplete_term_limit  # None indexes every term
     
     def load_popular_terms_from_json(self, filename: str = "popular_search_terms.json") -> List[Dict[str, Any]]:
         """Load popular search terms from JSON file"""
@@ -37,7 +337,15 @@ class ElastiCacheSeeder:
             print(f"❌ Error loading popular search terms from JSON: {e}")
             return []
     
-    def seed_popular_terms_to_cache(self, terms_data: List[Dict[str, Any]]) -> bool:
+    def iter_popular_terms(self, filename: str = "popular_search_terms.json",
+                           columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream popular search terms from the data file one at a time (only the given columns, if any)"""
+        if not output_file_exists(filename):
+            print(f"❌ No popular search terms file found at {output_path(filename)}")
+            return iter(())
+        return iter_records(filename, columns)
+    
+    def seed_popular_terms_to_cache(self, terms_data: Iterable[Dict[str, Any]]) -> bool:
         """Seed popular search terms to ElastiCache"""
         try:
             if not self.redis_client:
@@ -46,163 +354,36 @@ class ElastiCacheSeeder:
             
             print("🔄 Seeding popular search terms to ElastiCache...")
             
-            # Clear existing popular terms cache
+            # Clear existing search cache with SCAN + batched UNLINK (never KEYS/DEL); a failed
+            # purge fails the seed, since fresh keys written over stale ones would pass as a reseed
             try:
-                # Clear all search-related keys
-                keys_to_delete = []
-                keys_to_delete.extend(self.redis_client.keys('search:popular_terms'))
-                keys_to_delete.extend(self.redis_client.keys('search:trending_terms'))
-                keys_to_delete.extend(self.redis_client.keys('search_suggestions:*'))
-                keys_to_delete.extend(self.redis_client.keys('search:category:*'))
-                keys_to_delete.extend(self.redis_client.keys('search:autocomplete:*'))
-                
-                if keys_to_delete:
-                    self.redis_client.delete(*keys_to_delete)
-                    print(f"✅ Cleared {len(keys_to_delete)} existing search cache keys")
+                with instrumentation.stage('elasticache', 'clear'):
+                    deleted_count = purge_namespace(self.redis_client, SEARCH_CACHE_PATTERNS)
+                if deleted_count:
+                    print(f"✅ Cleared {deleted_count} existing search cache keys")
             except Exception as e:
-                print(f"⚠️  Warning: Could not clear existing cache: {e}")
-            
-            # Prepare popular terms list (top 50 terms)
-            popular_terms_list = []
-            for term_data in terms_data[:50]:  # Top 50 terms
-                popular_terms_list.append({
-                    'term': term_data['term'],
-                    'searchVolume': term_data['searchVolume'],
-                    'rank': term_data['rank'],
-                    'category': term_data['category'],
-                    'popularityScore': term_data.get('popularityScore', 0),
-                    'clickThroughRate': term_data.get('clickThroughRate', 0),
-                    'conversionRate': term_data.get('conversionRate', 0)
-                })
-            
-            # Cache popular terms list (1 hour TTL)
-            self.redis_client.setex(
-                'search:popular_terms',
-                3600,  # 1 hour TTL
-                json.dumps(popular_terms_list)
-            )
-            print(f"✅ Cached {len(popular_terms_list)} popular search terms")
-            
-            # Cache individual term data with analytics (30 minutes TTL)
-            analytics_count = 0
-            for term_data in terms_data:
-                search_term = term_data['term']
-                
-                # Cache full term analytics
-                analytics_data = {
-                    'term': search_term,
-                    'searchVolume': term_data['searchVolume'],
-                    'category': term_data['category'],
-                    'rank': term_data['rank'],
-                    'clickThroughRate': term_data.get('clickThroughRate', 0),
-                    'conversionRate': term_data.get('conversionRate', 0),
-                    'bounceRate': term_data.get('bounceRate', 0),
-                    'avgSessionDuration': term_data.get('avgSessionDuration', 0),
-                    'seasonality': term_data.get('seasonality', 'year-round'),
-                    'trendData': term_data.get('trendData', [])
-                }
-                
-                cache_key = f"search:analytics:{search_term}"
-                self.redis_client.setex(
-                    cache_key,
-                    1800,  # 30 minutes TTL
-                    json.dumps(analytics_data)
-                )
-                analytics_count += 1
-                
-                # Cache related terms for suggestions
-                related_terms = term_data.get('relatedTerms', [])
-                if related_terms:
-                    suggestions_key = f"search_suggestions:{search_term}"
-                    self.redis_client.setex(
-                        suggestions_key,
-                        1800,  # 30 minutes TTL
-                        json.dumps(related_terms)
-                    )
-            
-            print(f"✅ Cached analytics for {analytics_count} search terms")
-            
-            # Cache trending terms (2 hours TTL)
-            trending_terms = []
-            for term_data in terms_data[:10]:  # Top 10 as trending
-                trending_terms.append({
-                    'term': term_data['term'],
-                    'searchVolume': term_data['searchVolume'],
-                    'category': term_data['category'],
-                    'popularityScore': term_data.get('popularityScore', 0)
-                })
-            
-            self.redis_client.setex(
-                'search:trending_terms',
-                7200,  # 2 hours TTL
-                json.dumps(trending_terms)
-            )
-            print(f"✅ Cached {len(trending_terms)} trending search terms")
-            
-            # Cache auto-complete data by category
-            categories = {}
-            for term_data in terms_data:
-                category = term_data['category']
-                if category not in categories:
-                    categories[category] = []
-                categories[category].append({
-                    'term': term_data['term'],
-                    'searchVolume': term_data['searchVolume']
-                })
+                print(f"❌ Could not clear existing cache: {e}")
+                return False
             
-            # Sort by search volume and cache top terms per category
-            for category, terms in categories.items():
-                sorted_terms = sorted(terms, key=lambda x: x['searchVolume'], reverse=True)
-                cache_key = f"search:category:{category}"
-                self.redis_client.setex(
-                    cache_key,
-                    3600,  # 1 hour TTL
-                    json.dumps([t['term'] for t in sorted_terms[:20]])  # Top 20 terms per category
+            # Buffer writes and send them as slot-grouped pipelines instead of one round trip each
+            writer = RedisBulkWriter(self.redis_client, chunk_size=self.pipeline_chunk_size)
+            
+            with instrumentation.stage('elasticache', 'insert'):
+                queue_popular_term_writes(
+                    writer,
+                    terms_data,
+                    autocomplete_mode=self.autocomplete_mode,
+                    autocomplete_prefix_length=self.autocomplete_prefix_length,
+                    autocomplete_top_k=self.autocomplete_top_k,
+                    autocomplete_term_limit=self.autocomplete_term_limit
                 )
-            
-            print(f"✅ Cached search terms for {len(categories)} categories")
-            
-            # Cache autocomplete prefixes for fast lookup
-            autocomplete_count = 0
-            for term_data in terms_data[:100]:  # Top 100 terms for autocomplete
-                term = term_data['term'].lower()
                 
-                # Create prefix keys for autocomplete (1-4 characters)
-                for i in range(1, min(len(term) + 1, 5)):
-                    prefix = term[:i]
-                    prefix_key = f"search:autocomplete:{prefix}"
-                    
-                    # Get existing terms for this prefix or create new list
-                    try:
-                        existing_terms = self.redis_client.get(prefix_key)
-                        if existing_terms:
-                            terms_list = json.loads(existing_terms)
-                        else:
-                            terms_list = []
-                        
-                        # Add term if not already present
-                        if term not in terms_list:
-                            terms_list.append(term)
-                            # Keep only top 10 suggestions per prefix
-                            terms_list = terms_list[:10]
-                            
-                            self.redis_client.setex(
-                                prefix_key,
-                                3600,  # 1 hour TTL
-                                json.dumps(terms_list)
-                            )
-                            autocomplete_count += 1
-                    except Exception as e:
-                        # If there's an error, create new entry
-                        self.redis_client.setex(
-                            prefix_key,
-                            3600,
-                            json.dumps([term])
-                        )
-                        autocomplete_count += 1
-            
-            print(f"✅ Created {autocomplete_count} autocomplete prefix entries")
+                writer.flush()
+            writer.print_stats("Search term cache writes")
             
+            if writer.errors:
+                print("❌ Search term cache writes failed")
+                return False
             return True
             
         except Exception as e:
@@ -216,41 +397,13 @@ class ElastiCacheSeeder:
                 print("❌ Redis connection not available")
                 return False
             
-            filepath = os.path.join(os.path.dirname(__file__), '..', 'output', behaviors_filename)
-            
-            if not os.path.exists(filepath):
-                print(f"⚠️  No search behaviors file found at {filepath}")
-                return True  # Not critical, return success
-            
-            with open(filepath, 'r', encoding='utf-8') as f:
-                behaviors_data = json.load(f)
-            
-            print(f"🔄 Caching recent search behaviors...")
-            
-            # Cache recent searches (last 100) for real-time analytics
-            recent_searches = behaviors_data[-100:] if len(behaviors_data) > 100 else behaviors_data
-            
-            self.redis_client.setex(
-                'search:recent_behaviors',
-                1800,  # 30 minutes TTL
-                json.dumps(recent_searches)
-            )
-            
-            print(f"✅ Cached {len(recent_searches)} recent search behaviors")
-            
-            # Cache search analytics summary
-            summary_filepath = os.path.join(os.path.dirname(__file__), '..', 'output', 'search_analytics_summary.json')
-            if os.path.exists(summary_filepath):
-                with open(summary_filepath, 'r', encoding='utf-8') as f:
-                    summary_data = json.load(f)
-                
-                self.redis_client.setex(
-                    'search:analytics_summary',
-                    3600,  # 1 hour TTL
-                    json.dumps(summary_data)
-                )
-                print("✅ Cached search analytics summary")
+            writer = RedisBulkWriter(self.redis_client, chunk_size=self.pipeline_chunk_size)
+            queue_search_behavior_writes(writer, behaviors_filename)
+            writer.flush()
             
+            if writer.errors:
+                print(f"❌ Search behavior cache writes failed: {writer.first_error}")
+                return False
             return True
             
         except Exception as e:
@@ -259,91 +412,37 @@ class ElastiCacheSeeder:
     
     def verify_cache_data(self) -> bool:
         """Verify that data was properly cached"""
-        try:
-            if not self.redis_client:
-                print("❌ Redis connection not available for verification")
-                return False
-            
-            print("🔍 Verifying cached data...")
-            
-            # Check popular terms
-            popular_terms = self.redis_client.get('search:popular_terms')
-            if popular_terms:
-                terms_data = json.loads(popular_terms)
-                print(f"✅ Popular terms cache: {len(terms_data)} terms")
-                
-                # Show sample data
-                if terms_data:
-                    sample_term = terms_data[0]
-                    print(f"   Sample: '{sample_term['term']}' - {sample_term['searchVolume']:,} searches")
-            else:
-                print("❌ Popular terms cache is empty")
-                return False
-            
-            # Check trending terms
-            trending_terms = self.redis_client.get('search:trending_terms')
-            if trending_terms:
-                trending_data = json.loads(trending_terms)
-                print(f"✅ Trending terms cache: {len(trending_data)} terms")
-            else:
-                print("❌ Trending terms cache is empty")
-                return False
-            
-            # Check analytics keys
-            analytics_keys = self.redis_client.keys('search:analytics:*')
-            print(f"✅ Search analytics: {len(analytics_keys)} terms cached")
-            
-            # Check suggestion keys
-            suggestion_keys = self.redis_client.keys('search_suggestions:*')
-            print(f"✅ Auto-complete suggestions: {len(suggestion_keys)} terms cached")
-            
-            # Check category keys
-            category_keys = self.redis_client.keys('search:category:*')
-            print(f"✅ Category searches: {len(category_keys)} categories cached")
-            
-            # Check autocomplete prefix keys
-            autocomplete_keys = self.redis_client.keys('search:autocomplete:*')
-            print(f"✅ Autocomplete prefixes: {len(autocomplete_keys)} prefix entries")
-            
-            # Test a sample autocomplete lookup
-            if autocomplete_keys:
-                sample_key = autocomplete_keys[0].decode('utf-8') if isinstance(autocomplete_keys[0], bytes) else autocomplete_keys[0]
-                sample_data = self.redis_client.get(sample_key)
-                if sample_data:
-                    sample_terms = json.loads(sample_data)
-                    prefix = sample_key.split(':')[-1]
-                    print(f"   Sample autocomplete '{prefix}': {len(sample_terms)} suggestions")
-            
-            print("✅ ElastiCache verification completed successfully")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error verifying cache data: {e}")
+        if not self.redis_client:
+            print("❌ Redis connection not available for verification")
             return False
+        return verify_search_cache(self.redis_client, self.autocomplete_mode, self.autocomplete_top_k)
 
 
 def main():
     """Main function to seed ElastiCache with search data"""
     try:
+        # Parse command line arguments
+        parser = argparse.ArgumentParser(description='Seed popular search terms to ElastiCache')
+        parser.add_argument('--pipeline-chunk-size', type=int, default=500,
+                          help='Commands per Redis pipeline (default: 500)')
+        add_autocomplete_arguments(parser)
+        args = parser.parse_args()
+        
         print("🔍 Unicorn E-Commerce Popular Search Terms ElastiCache Seeder")
         print("=" * 70)
         print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         # Initialize seeder
-        seeder = ElastiCacheSeeder()
-        
-        # Load popular search terms
-        terms_data = seeder.load_popular_terms_from_json()
+        seeder = ElastiCacheSeeder(pipeline_chunk_size=args.pipeline_chunk_size, **autocomplete_options(args))
         
-        if not terms_data:
+        # Popular search terms are streamed from JSON so memory stays flat
+        if not output_file_exists("popular_search_terms.json"):
             print("❌ No popular search terms data available")
             print("Please run popular_search_terms_generator.py first to generate the data.")
             return False
         
-        print(f"\nLoaded {len(terms_data)} search terms for caching")
-        
         # Seed popular terms to cache
-        if not seeder.seed_popular_terms_to_cache(terms_data):
+        if not seeder.seed_popular_terms_to_cache(seeder.iter_popular_terms()):
             print("❌ Failed to seed popular terms to ElastiCache")
             return False
         
@@ -361,7 +460,10 @@ def main():
         print(f"   • Popular terms: search:popular_terms")
         print(f"   • Trending terms: search:trending_terms") 
         print(f"   • Analytics data: search:analytics:*")
-        print(f"   • Autocomplete: search:autocomplete:*")
+        if seeder.autocomplete_mode == 'sorted_set':
+            print(f"   • Autocomplete: {AUTOCOMPLETE_LEX_KEY}, {AUTOCOMPLETE_RANKED_KEY}")
+        else:
+            print(f"   • Autocomplete: search:autocomplete:*")
         print(f"   • Category terms: search:category:*")
         print(f"   • Related suggestions: search_suggestions:*")
         print(f"\n   Ready for high-performance search features!")
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Embedding Sidecar Store for Unicorn E-Commerce Seeders
+Keeps record embeddings in a memory-mapped float32 .npy file next to their JSON data file
+
+For products.json the sidecar is two files in data/output:
+  * products.embeddings.npy  - float32 matrix with one row per record
+  * products.embeddings.json - {"idField", "dimensions", "ids"}; ids[row] is the record id
+
+Converting a data file moves the embedding lists out of the JSON, which is where most of
+its bytes and parse time go. Seeders join the vectors back in at insert time.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# numpy is imported only when a sidecar is read or written, so seeders without one skip it
+NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+
+from data_loader import iter_json_records, output_file_exists, output_path, write_json_array
+
+EMBEDDING_FIELD = 'embedding'
+
+# Id field used to key each data file's sidecar rows
+EMBEDDING_ID_FIELDS = {
+    'products.json': 'productId',
+    'knowledge_base.json': 'contentId',
+}
+
+
+def sidecar_paths(filename: str) -> Tuple[str, str]:
+    """Return the (.npy matrix, .json id index) paths for a data file"""
+    stem, _ = os.path.splitext(output_path(filename))
+    return f"{stem}.embeddings.npy", f"{stem}.embeddings.json"
+
+
+def sidecar_exists(filename: str) -> bool:
+    """Check whether a data file has an embedding sidecar"""
+    return all(os.path.exists(path) for path in sidecar_paths(filename))
+
+
+class EmbeddingStore:
+    """Read-only, memory-mapped view of an embedding sidecar"""
+
+    def __init__(self, filename: str):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required to read embedding sidecars. Install with: pip install numpy")
+        import numpy as np
+
+        matrix_path, index_path = sidecar_paths(filename)
+        with open(index_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+
+        # mmap_mode='r' only reads the header; rows are paged in as they are touched
+        self.matrix = np.load(matrix_path, mmap_mode='r')
+        self.id_field = metadata['idField']
+        self.dimensions = metadata['dimensions']
+        self.ids: List[str] = metadata['ids']
+        self.index: Dict[str, int] = {record_id: row for row, record_id in enumerate(self.ids)}
+
+        if self.matrix.shape != (len(self.ids), self.dimensions):
+            raise ValueError(f"Embedding sidecar for {filename} is inconsistent: matrix {self.matrix.shape}, "
+                             f"{len(self.ids)} ids x {self.dimensions} dimensions")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, record_id) -> bool:
+        return record_id in self.index
+
+    def get(self, record_id):
+        """Return the float32 row for a record id (a view into the mapped file), or None"""
+        row = self.index.get(record_id)
+        return None if row is None else self.matrix[row]
+
+    def attach_one(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fill in a record's embedding from the sidecar and return the record.
+
+        Records that already carry an embedding, or whose id has no row, are left unchanged.
+        """
+        if record.get(EMBEDDING_FIELD) is None:
+            row = self.index.get(record.get(self.id_field))
+            if row is not None:
+                # BSON has no float32 array type, so hand the driver plain Python floats
+                record[EMBEDDING_FIELD] = self.matrix[row].tolist()
+        return record
+
+    def attach(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield records with their embeddings filled in from the sidecar"""
+        for record in records:
+            yield self.attach_one(record)
+
+
+def open_embedding_store(filename: str) -> Optional[EmbeddingStore]:
+    """Open a data file's sidecar, or return None when there is none to join"""
+    if not sidecar_exists(filename):
+        return None
+    if not NUMPY_AVAILABLE:
+        print(f"⚠️  Found an embedding sidecar for {filename} but numpy is not installed; "
+              f"records will be seeded without sidecar embeddings")
+        return None
+    store = EmbeddingStore(filename)
+    print(f"Joining {len(store):,} embeddings ({store.dimensions} dimensions) from sidecar for {filename}")
+    return store
+
+
+_process_stores: Dict[str, EmbeddingStore] = {}
+
+
+def get_embedding_store(filename: str) -> EmbeddingStore:
+    """Return this process's EmbeddingStore for filename, opening it on first use (for pool workers)"""
+    store = _process_stores.get(filename)
+    if store is None:
+        store = _process_stores[filename] = EmbeddingStore(filename)
+    return store
+
+
+def write_embedding_sidecar(filename: str, id_field: str, strip_json: bool = True) -> int:
+    """
+    Move the embeddings of a data file into a float32 .npy sidecar and return the row count.
+
+    The file is streamed twice: once to size the matrix, once to fill it. With strip_json the
+    data file is rewritten without its embedding lists. Existing files are only replaced once
+    the new ones are fully written.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("numpy is required to write embedding sidecars. Install with: pip install numpy")
+    import numpy as np
+
+    rows = 0
+    dimensions = None
+    for record in iter_json_records(filename):
+        embedding = record.get(EMBEDDING_FIELD)
+        if embedding is None:
+            continue
+        if dimensions is None:
+            dimensions = len(embedding)
+        elif len(embedding) != dimensions:
+            raise ValueError(f"{record.get(id_field)} has {len(embedding)} embedding dimensions, expected {dimensions}")
+        rows += 1
+
+    if not rows:
+        # Already converted (or never had embeddings); leave any existing sidecar alone
+        print(f"No embeddings found in {filename}; sidecar left unchanged")
+        return 0
+
+    matrix_path, index_path = sidecar_paths(filename)
+    data_path = output_path(filename)
+    tmp_matrix_path = matrix_path + '.tmp'
+    tmp_data_path = data_path + '.tmp'
+
+    matrix = np.lib.format.open_memmap(tmp_matrix_path, mode='w+', dtype=np.float32, shape=(rows, dimensions))
+    ids = []
+
+    def fill(records):
+        for record in records:
+            embedding = record.get(EMBEDDING_FIELD)
+            if embedding is not None:
+                matrix[len(ids)] = embedding
+                ids.append(record[id_field])
+                if strip_json:
+                    record = {k: v for k, v in record.items() if k != EMBEDDING_FIELD}
+            yield record
+
+    try:
+        if strip_json:
+            write_json_array(tmp_data_path, fill(iter_json_records(filename)))
+        else:
+            for _ in fill(iter_json_records(filename)):
+                pass
+        matrix.flush()
+        del matrix
+
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"{filename} contains duplicate {id_field} values; sidecar rows would be ambiguous")
+
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump({'idField': id_field, 'dimensions': dimensions, 'ids': ids}, f)
+        os.replace(tmp_matrix_path, matrix_path)
+        if strip_json:
+            os.replace(tmp_data_path, data_path)
+    finally:
+        for path in (tmp_matrix_path, tmp_data_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    size_mb = os.path.getsize(matrix_path) / (1024 * 1024)
+    print(f"✅ Wrote {rows:,} x {dimensions} float32 embeddings to {matrix_path} ({size_mb:.1f} MB)")
+    return rows
+
+
+def main():
+    """Convert data/output files to the embedding sidecar format"""
+    parser = argparse.ArgumentParser(description='Move JSON embeddings into float32 .npy sidecars')
+    parser.add_argument('files', nargs='*', default=sorted(EMBEDDING_ID_FIELDS),
+                        help='Data files to convert (default: all files with embeddings)')
+    parser.add_argument('--id-field', help='Record id field (default: known per data file)')
+    parser.add_argument('--keep-json-embeddings', action='store_true',
+                        help='Write the sidecar but leave embeddings in the JSON file')
+    args = parser.parse_args()
+
+    success = True
+    for filename in args.files:
+        id_field = args.id_field or EMBEDDING_ID_FIELDS.get(os.path.basename(filename))
+        if not id_field:
+            print(f"❌ No known id field for {filename}; pass --id-field")
+            success = False
+            continue
+        if not output_file_exists(filename):
+            print(f"❌ {output_path(filename)} not found")
+            success = False
+            continue
+        try:
+            write_embedding_sidecar(filename, id_field, strip_json=not args.keep_json_embeddings)
+        except Exception as e:
+            print(f"❌ Failed to convert {filename}: {e}")
+            success = False
+    return success
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
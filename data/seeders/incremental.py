@@ -0,0 +1,153 @@
+"""
+Incremental Reseeding for Unicorn E-Commerce Seeders
+Diffs records against content hashes stored alongside them and writes only the change set
+"""
+import hashlib
+import json
+import time
+from typing import Any, Dict, Iterable, Iterator, Set
+
+# Stored on every seeded document/item so the next run can tell what changed
+CONTENT_HASH_FIELD = 'contentHash'
+
+# Fields that are assigned by the store rather than carried by the source record
+_UNHASHED_FIELDS = {'_id', CONTENT_HASH_FIELD}
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """Return a stable SHA-256 of a record's content, independent of key order"""
+    content = {k: v for k, v in record.items() if k not in _UNHASHED_FIELDS}
+    # default=str covers datetimes and Decimals, which have stable string forms
+    canonical = json.dumps(content, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def stamp_content_hash(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Store a record's content hash on it and return the record"""
+    record[CONTENT_HASH_FIELD] = content_hash(record)
+    return record
+
+
+def with_content_hash(records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Stamp each record with its content hash (used by full reseeds so later diffs are cheap).
+
+    Records already stamped by the preparation stage keep their hash.
+    """
+    for record in records:
+        if CONTENT_HASH_FIELD not in record:
+            stamp_content_hash(record)
+        yield record
+
+
+class SyncResult:
+    """Counts of what an incremental sync did"""
+
+    def __init__(self):
+        self.existing = 0
+        self.unchanged = 0
+        self.written = 0
+        self.deleted = 0
+        self.skipped = 0
+        self.elapsed = 0.0
+
+    @property
+    def total(self) -> int:
+        """Records in the source after the sync"""
+        return self.unchanged + self.written
+
+    def print_summary(self, label: str):
+        """Print the change set applied by this sync"""
+        print(f"{label} incremental sync: {self.existing:,} existing, {self.unchanged:,} unchanged, "
+              f"{self.written:,} upserted, {self.deleted:,} deleted in {self.elapsed:.2f}s")
+        if self.skipped:
+            print(f"  Skipped {self.skipped:,} records without a key")
+
+
+def _diff(records: Iterable[Dict[str, Any]], existing: Dict[Any, str], key_of, seen: Set[Any],
+          result: SyncResult) -> Iterator[Dict[str, Any]]:
+    """Yield only records that are new or whose content hash differs from the stored one"""
+    for record in records:
+        key = key_of(record)
+        if key is None:
+            result.skipped += 1
+            continue
+        seen.add(key)
+
+        # The preparation stage may already have hashed the record in a worker process
+        digest = record.get(CONTENT_HASH_FIELD) or content_hash(record)
+        if existing.get(key) == digest:
+            result.unchanged += 1
+            continue
+        record[CONTENT_HASH_FIELD] = digest
+        yield record
+
+
+def _removed_keys(existing: Dict[Any, str], seen: Set[Any], label: str) -> list:
+    """Keys stored but absent from the source; an empty source deletes nothing as a safeguard"""
+    if not seen and existing:
+        print(f"⚠️  No source records for {label}; keeping {len(existing):,} existing records")
+        return []
+    return [key for key in existing if key not in seen]
+
+
+def sync_documentdb_collection(collection, documents: Iterable[Dict[str, Any]], key_field: str,
+                               loader) -> SyncResult:
+    """
+    Bring a DocumentDB collection in line with documents, writing only the differences.
+
+    New or changed documents are upserted on key_field through a DocumentDBBulkLoader, and
+    documents whose key no longer appears in the source are deleted.
+    """
+    result = SyncResult()
+    start = time.perf_counter()
+
+    # Upserts and deletes match on key_field, which index_registry declares as a unique index
+    existing = {
+        doc[key_field]: doc.get(CONTENT_HASH_FIELD)
+        for doc in collection.find({}, {key_field: 1, CONTENT_HASH_FIELD: 1, '_id': 0})
+        if key_field in doc
+    }
+    result.existing = len(existing)
+
+    seen = set()
+    result.written = loader.upsert(_diff(documents, existing, lambda d: d.get(key_field), seen, result), key_field)
+    result.deleted = loader.delete(key_field, _removed_keys(existing, seen, collection.name))
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def sync_dynamodb_table(table, items: Iterable[Dict[str, Any]], loader, segments: int = 8) -> SyncResult:
+    """
+    Bring a DynamoDB table in line with items, writing only the differences.
+
+    Stored hashes are read with a key-and-hash-only parallel scan. New or changed items are
+    put through a DynamoDBBulkLoader, and items whose key no longer appears are deleted.
+    """
+    # Imported here so the DocumentDB seeders do not load boto3
+    from dynamodb_bulk import get_key_attributes, scan_attributes
+
+    result = SyncResult()
+    start = time.perf_counter()
+
+    key_names = get_key_attributes(table)
+
+    def key_of(item):
+        if any(name not in item for name in key_names):
+            return None
+        return tuple(item[name] for name in key_names)
+
+    existing = {
+        key_of(item): item.get(CONTENT_HASH_FIELD)
+        for item in scan_attributes(table, key_names + [CONTENT_HASH_FIELD], segments=segments)
+    }
+    result.existing = len(existing)
+
+    seen = set()
+    result.written = loader.load(_diff(items, existing, key_of, seen, result))
+    removed = _removed_keys(existing, seen, table.name)
+    result.deleted = loader.delete(dict(zip(key_names, key)) for key in removed)
+
+    result.elapsed = time.perf_counter() - start
+    return result
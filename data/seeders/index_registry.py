@@ -0,0 +1,229 @@
+"""
+DocumentDB Index Registry for Unicorn E-Commerce Seeders
+Declares every collection's indexes in one place and syncs them against list_indexes()
+"""
+import inspect
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import IndexModel
+from pymongo.errors import PyMongoError
+
+# Index options that change an index's behaviour and therefore take part in diffing
+_COMPARED_OPTIONS = ('unique', 'sparse', 'expireAfterSeconds', 'partialFilterExpression', 'vectorOptions')
+
+# Set when DOCUMENTDB_HOST is plain MongoDB (e.g. the benchmark's local stand-in), which
+# rejects DocumentDB-only index types such as vector indexes
+STAND_IN_ENV_VAR = 'DOCUMENTDB_STAND_IN'
+
+
+class IndexSpec:
+    """Declarative definition of a single index"""
+
+    def __init__(self, keys: List[Tuple[str, Any]], name: Optional[str] = None,
+                 documentdb_only: bool = False, **options):
+        self.keys = list(keys)
+        # Same default naming as create_index, so existing indexes line up with their spec
+        self.name = name or '_'.join(f"{field}_{direction}" for field, direction in self.keys)
+        # Skipped when syncing against a MongoDB stand-in
+        self.documentdb_only = documentdb_only
+        self.options = options
+
+    def to_model(self) -> IndexModel:
+        """Build the IndexModel passed to create_indexes"""
+        return IndexModel(self.keys, name=self.name, **self.options)
+
+    def matches(self, existing: Dict[str, Any]) -> bool:
+        """True when an index from list_indexes() has this spec's keys and options"""
+        if _comparable_keys(_normalize_keys(existing)) != _comparable_keys(self.keys):
+            return False
+        return all(existing.get(option) == self.options.get(option) for option in _COMPARED_OPTIONS)
+
+
+def _normalize_keys(existing: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """Return an existing index's keys in spec form, expanding text indexes back to their fields"""
+    keys = []
+    for field, direction in existing['key'].items():
+        if field == '_fts':
+            # Text indexes are reported as _fts/_ftsx; the indexed fields are in weights
+            keys.extend((text_field, 'text') for text_field in existing.get('weights', {}))
+        elif field != '_ftsx':
+            keys.append((field, direction))
+    return keys
+
+
+def _comparable_keys(keys: List[Tuple[str, Any]]) -> Tuple[List[Tuple[str, Any]], frozenset]:
+    """
+    Split keys into the ordered non-text keys and the set of text fields.
+
+    Field order does not matter within a text index, and the server reports text fields in
+    weights order (sorted by name) rather than declaration order.
+    """
+    text_fields = frozenset(field for field, direction in keys if direction == 'text')
+    return [(field, direction) for field, direction in keys if direction != 'text'], text_fields
+
+
+PRODUCT_INDEXES = [
+    IndexSpec([('productId', 1)], unique=True),
+    IndexSpec([('category', 1)]),
+    IndexSpec([('name', 'text')]),
+    IndexSpec([('tags', 1)]),
+    IndexSpec([('currentPrice', 1)]),
+    IndexSpec([('rating', 1)]),
+    IndexSpec([('inStock', 1)]),
+    IndexSpec([('category', 1), ('currentPrice', 1)]),
+    IndexSpec([('category', 1), ('rating', -1)]),
+    IndexSpec([('inStock', 1), ('category', 1)]),
+    # HNSW vector index for embedding similarity search
+    IndexSpec([('embedding', 'vector')], name='vss_index', documentdb_only=True, vectorOptions={
+        'type': 'hnsw',
+        'similarity': 'euclidean',
+        'dimensions': 1536,
+        'm': 16,
+        'efConstruction': 64,
+    }),
+]
+
+REVIEW_INDEXES = [
+    IndexSpec([('reviewId', 1)], unique=True),
+    IndexSpec([('productId', 1)]),
+    IndexSpec([('rating', 1)]),
+    IndexSpec([('sentiment', 1)]),
+    IndexSpec([('createdAt', -1)]),
+    IndexSpec([('verified', 1)]),
+    IndexSpec([('productId', 1), ('rating', -1)]),
+    IndexSpec([('productId', 1), ('createdAt', -1)]),
+    IndexSpec([('sentiment', 1), ('rating', -1)]),
+]
+
+REVIEW_STATS_INDEXES = [
+    IndexSpec([('productId', 1)], unique=True),
+]
+
+KNOWLEDGE_BASE_INDEXES = [
+    IndexSpec([('contentId', 1)], unique=True),
+    IndexSpec([('category', 1)]),
+    IndexSpec([('tags', 1)]),
+    # DocumentDB allows one text index per collection, so title and content share it
+    IndexSpec([('title', 'text'), ('content', 'text')]),
+    IndexSpec([('createdAt', -1)]),
+]
+
+INDEX_REGISTRY = {
+    'products': PRODUCT_INDEXES,
+    'reviews': REVIEW_INDEXES,
+    'review_stats': REVIEW_STATS_INDEXES,
+    'knowledge_base': KNOWLEDGE_BASE_INDEXES,
+}
+
+
+def is_stand_in() -> bool:
+    """True when the DocumentDB target is a MongoDB stand-in (DOCUMENTDB_STAND_IN is set)"""
+    return os.environ.get(STAND_IN_ENV_VAR, '').lower() in ('1', 'true', 'yes')
+
+
+def skipped_specs(specs: List[IndexSpec]) -> List[IndexSpec]:
+    """The specs not built on the current target: DocumentDB-only ones when it is a stand-in"""
+    return [spec for spec in specs if spec.documentdb_only] if is_stand_in() else []
+
+
+def _plan_index_sync(collection_name: str, existing_indexes: List[Dict[str, Any]],
+                     specs: List[IndexSpec]) -> Tuple[List[str], List[IndexSpec], List[str]]:
+    """Diff list_indexes() output against specs: (changed names to drop, missing specs, stale names)"""
+    existing = {index['name']: index for index in existing_indexes if index['name'] != '_id_'}
+    declared = {spec.name for spec in specs}
+
+    skipped = skipped_specs(specs)
+    if skipped:
+        print(f"⏭️  Skipping DocumentDB-only index(es) on {collection_name} for the stand-in: "
+              f"{', '.join(spec.name for spec in skipped)}")
+        specs = [spec for spec in specs if not spec.documentdb_only]
+
+    changed = []
+    missing = []
+    for spec in specs:
+        current = existing.get(spec.name)
+        if current is not None and spec.matches(current):
+            continue
+        if current is not None:
+            print(f"Index {spec.name} on {collection_name} differs from its spec; rebuilding")
+            changed.append(spec.name)
+        missing.append(spec)
+
+    stale = [name for name in existing if name not in declared]
+    return changed, missing, stale
+
+
+def sync_indexes(collection, specs: List[IndexSpec], drop_stale: bool = True) -> bool:
+    """
+    Bring a collection's indexes in line with specs and return True when all are in place.
+
+    Existing indexes are read with list_indexes(). Indexes whose definition changed are dropped
+    and rebuilt, undeclared indexes are dropped (unless drop_stale is False), and every missing
+    index is created in a single create_indexes call.
+    """
+    changed, missing, stale = _plan_index_sync(collection.name, list(collection.list_indexes()), specs)
+    for name in changed:
+        collection.drop_index(name)
+
+    if stale and drop_stale:
+        for name in stale:
+            collection.drop_index(name)
+        print(f"Dropped {len(stale)} stale index(es) on {collection.name}: {', '.join(stale)}")
+
+    if not missing:
+        print(f"✅ All {len(specs) - len(skipped_specs(specs))} indexes on {collection.name} are up to date")
+        return True
+
+    try:
+        collection.create_indexes([spec.to_model() for spec in missing])
+        print(f"✅ Created {len(missing)} index(es) on {collection.name}: {', '.join(s.name for s in missing)}")
+        return True
+    except PyMongoError as e:
+        print(f"⚠️  Batched index creation on {collection.name} failed ({e}); retrying one at a time")
+
+    # Build what can be built so one bad spec does not leave the rest missing
+    failed = []
+    for spec in missing:
+        try:
+            collection.create_indexes([spec.to_model()])
+        except PyMongoError as e:
+            print(f"❌ Failed to create index {spec.name} on {collection.name}: {e}")
+            failed.append(spec.name)
+    return not failed
+
+
+async def sync_indexes_async(collection, specs: List[IndexSpec], drop_stale: bool = True) -> bool:
+    """sync_indexes for an async (PyMongo async or Motor) collection"""
+    cursor = collection.list_indexes()
+    if inspect.isawaitable(cursor):
+        # PyMongo's async list_indexes() is a coroutine returning the cursor; Motor's is not
+        cursor = await cursor
+    changed, missing, stale = _plan_index_sync(collection.name, await cursor.to_list(None), specs)
+    for name in changed:
+        await collection.drop_index(name)
+
+    if stale and drop_stale:
+        for name in stale:
+            await collection.drop_index(name)
+        print(f"Dropped {len(stale)} stale index(es) on {collection.name}: {', '.join(stale)}")
+
+    if not missing:
+        print(f"✅ All {len(specs) - len(skipped_specs(specs))} indexes on {collection.name} are up to date")
+        return True
+
+    try:
+        await collection.create_indexes([spec.to_model() for spec in missing])
+        print(f"✅ Created {len(missing)} index(es) on {collection.name}: {', '.join(s.name for s in missing)}")
+        return True
+    except PyMongoError as e:
+        print(f"⚠️  Batched index creation on {collection.name} failed ({e}); retrying one at a time")
+
+    failed = []
+    for spec in missing:
+        try:
+            await collection.create_indexes([spec.to_model()])
+        except PyMongoError as e:
+            print(f"❌ Failed to create index {spec.name} on {collection.name}: {e}")
+            failed.append(spec.name)
+    return not failed
@@ -0,0 +1,485 @@
+"""
+Hot-Path Instrumentation for Unicorn E-Commerce Seeders
+Counts round trips, latency, bytes sent and retries per store and command, and times named seeding stages
+
+Also records how long callers waited for a pooled connection (DocumentDB and ElastiCache) and how
+often a DynamoDB client's connection pool overflowed, to size the pools in pool_profiles.py.
+
+Instrumentation is off by default and costs one attribute check per stage when off. Turn it on
+with enable_instrumentation() (seed_all.py --metrics-json / --metrics-prom) or SEED_INSTRUMENTATION=1
+before any connection is opened, since the hooks are attached as each client is created:
+
+- DocumentDB: pymongo command and connection pool listeners
+- DynamoDB: boto3 event hooks on the shared session (every client built from it is covered)
+  and a filter on urllib3's "connection pool is full" warning
+- ElastiCache: an instrumented connection class and a timed checkout on every node's connection pool
+
+Results export as JSON or as a Prometheus textfile (for node_exporter's textfile collector).
+"""
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style; +Inf is implied
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_PREFIX = 'seeder'
+
+# Scope (usually the collection or table) of the innermost active stage in this thread
+_current_scope: contextvars.ContextVar = contextvars.ContextVar('instrumentation_scope', default=None)
+
+
+class CommandStats:
+    """Counters and latency histogram for one store command"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.latency_count = 0
+        self.latency_sum = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds: float):
+        self.latency_count += 1
+        self.latency_sum += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                return
+        self.bucket_counts[-1] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'bytesSent': self.bytes_sent,
+            'latency': {
+                'count': self.latency_count,
+                'sumSeconds': round(self.latency_sum, 6),
+                'buckets': {str(bound): count for bound, count in
+                            zip(LATENCY_BUCKETS + ('+Inf',), self.bucket_counts)},
+            },
+        }
+
+
+class Instrumentation:
+    """Thread-safe collector for store commands, retries and stage timings"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._redis_classes: Dict[type, type] = {}
+        self.reset()
+
+    def reset(self):
+        """Discard everything recorded so far"""
+        with self._lock:
+            self.commands: Dict[Tuple[str, str], CommandStats] = {}
+            self.retries: Dict[str, int] = {}
+            self.stages: Dict[Tuple[str, str], list] = {}
+            # store -> [checkouts, total wait seconds, longest wait seconds]
+            self.pool_waits: Dict[str, list] = {}
+            self.pool_overflows: Dict[str, int] = {}
+
+    def _command(self, store: str, command: str) -> CommandStats:
+        stats = self.commands.get((store, command))
+        if stats is None:
+            stats = self.commands[(store, command)] = CommandStats()
+        return stats
+
+    def record_request(self, store: str, command: str, bytes_sent: int = 0):
+        """Count one round trip to a store"""
+        with self._lock:
+            stats = self._command(store, command)
+            stats.requests += 1
+            stats.bytes_sent += bytes_sent
+
+    def record_response(self, store: str, command: str, seconds: float, error: bool = False):
+        """Record how long a command took, and whether it failed"""
+        with self._lock:
+            stats = self._command(store, command)
+            stats.observe(seconds)
+            if error:
+                stats.errors += 1
+
+    def record_retry(self, store: str, count: int = 1):
+        """Count retries made by the bulk loaders or the driver"""
+        if not self.enabled or count <= 0:
+            return
+        with self._lock:
+            self.retries[store] = self.retries.get(store, 0) + count
+
+    def record_pool_wait(self, store: str, seconds: float):
+        """Record one connection checkout and how long it waited for a free pooled connection"""
+        if not self.enabled:
+            return
+        with self._lock:
+            totals = self.pool_waits.setdefault(store, [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+
+    def record_pool_overflow(self, store: str):
+        """Count a connection discarded because the client's pool was already full"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.pool_overflows[store] = self.pool_overflows.get(store, 0) + 1
+
+    def record_stage(self, name: str, seconds: float, scope: Optional[str] = None):
+        """Add time to a stage; scope defaults to that of the enclosing stage()"""
+        if not self.enabled:
+            return
+        key = (scope or _current_scope.get() or 'global', name)
+        with self._lock:
+            totals = self.stages.setdefault(key, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+
+    @contextmanager
+    def stage(self, scope: str, name: str):
+        """Time a named stage (load, prepare, clear, insert, index, verify) of a seeder"""
+        if not self.enabled:
+            yield
+            return
+        token = _current_scope.set(scope)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _current_scope.reset(token)
+            self.record_stage(name, time.perf_counter() - start, scope)
+
+    def round_trips(self, store: Optional[str] = None) -> int:
+        """Requests sent so far, to one store or to all of them"""
+        with self._lock:
+            return sum(stats.requests for (s, _), stats in self.commands.items() if store in (None, s))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Everything recorded so far, grouped by store and by stage scope"""
+        with self._lock:
+            stores: Dict[str, Any] = {}
+            for (store, command), stats in sorted(self.commands.items()):
+                entry = stores.setdefault(store, {'roundTrips': 0, 'bytesSent': 0,
+                                                  'retries': self.retries.get(store, 0), 'commands': {}})
+                entry['roundTrips'] += stats.requests
+                entry['bytesSent'] += stats.bytes_sent
+                entry['commands'][command] = stats.to_dict()
+            for store, count in self.retries.items():
+                stores.setdefault(store, {'roundTrips': 0, 'bytesSent': 0, 'retries': count, 'commands': {}})
+            for store, (checkouts, seconds, longest) in sorted(self.pool_waits.items()):
+                entry = stores.setdefault(store, {'roundTrips': 0, 'bytesSent': 0, 'retries': 0, 'commands': {}})
+                entry['poolWait'] = {'checkouts': checkouts, 'sumSeconds': round(seconds, 6),
+                                     'maxSeconds': round(longest, 6)}
+            for store, count in self.pool_overflows.items():
+                entry = stores.setdefault(store, {'roundTrips': 0, 'bytesSent': 0, 'retries': 0, 'commands': {}})
+                entry['poolOverflows'] = count
+
+            stages: Dict[str, Any] = {}
+            for (scope, name), (seconds, count) in sorted(self.stages.items()):
+                stages.setdefault(scope, {})[name] = {'seconds': round(seconds, 6), 'count': count}
+        return {'stores': stores, 'stages': stages}
+
+    def write_json(self, path: str):
+        """Write the metrics as JSON"""
+        _write_atomically(path, json.dumps(self.to_dict(), indent=2))
+
+    def write_prometheus(self, path: str):
+        """Write the metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+
+        with self._lock:
+            commands = sorted(self.commands.items())
+            retries = sorted(self.retries.items())
+            stages = sorted(self.stages.items())
+            pool_waits = sorted((store, list(totals)) for store, totals in self.pool_waits.items())
+            pool_overflows = sorted(self.pool_overflows.items())
+
+        metric('requests_total', 'counter', 'Round trips sent to each store, by command')
+        for (store, command), stats in commands:
+            lines.append(f"{METRIC_PREFIX}_requests_total{_labels(store=store, command=command)} {stats.requests}")
+        metric('request_errors_total', 'counter', 'Commands that failed, by store and command')
+        for (store, command), stats in commands:
+            lines.append(f"{METRIC_PREFIX}_request_errors_total{_labels(store=store, command=command)} {stats.errors}")
+        metric('request_bytes_total', 'counter', 'Request bytes sent to each store, by command')
+        for (store, command), stats in commands:
+            lines.append(f"{METRIC_PREFIX}_request_bytes_total{_labels(store=store, command=command)} {stats.bytes_sent}")
+        metric('retries_total', 'counter', 'Retried requests, by store')
+        for store, count in retries:
+            lines.append(f"{METRIC_PREFIX}_retries_total{_labels(store=store)} {count}")
+
+        metric('pool_checkouts_total', 'counter', 'Connections checked out of a pool, by store')
+        for store, (checkouts, _, _) in pool_waits:
+            lines.append(f"{METRIC_PREFIX}_pool_checkouts_total{_labels(store=store)} {checkouts}")
+        metric('pool_wait_seconds_total', 'counter', 'Time spent waiting for a pooled connection, by store')
+        for store, (_, seconds, _) in pool_waits:
+            lines.append(f"{METRIC_PREFIX}_pool_wait_seconds_total{_labels(store=store)} {seconds:.6f}")
+        metric('pool_wait_max_seconds', 'gauge', 'Longest wait for a pooled connection, by store')
+        for store, (_, _, longest) in pool_waits:
+            lines.append(f"{METRIC_PREFIX}_pool_wait_max_seconds{_labels(store=store)} {longest:.6f}")
+        metric('pool_overflows_total', 'counter', 'Connections discarded because the pool was full, by store')
+        for store, count in pool_overflows:
+            lines.append(f"{METRIC_PREFIX}_pool_overflows_total{_labels(store=store)} {count}")
+
+        metric('request_duration_seconds', 'histogram', 'Command latency, by store and command')
+        for (store, command), stats in commands:
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), stats.bucket_counts):
+                cumulative += count
+                labels = _labels(store=store, command=command, le=str(bound))
+                lines.append(f"{METRIC_PREFIX}_request_duration_seconds_bucket{labels} {cumulative}")
+            labels = _labels(store=store, command=command)
+            lines.append(f"{METRIC_PREFIX}_request_duration_seconds_sum{labels} {stats.latency_sum:.6f}")
+            lines.append(f"{METRIC_PREFIX}_request_duration_seconds_count{labels} {stats.latency_count}")
+
+        metric('stage_seconds_total', 'counter', 'Wall time spent in each seeding stage')
+        for (scope, name), (seconds, _) in stages:
+            lines.append(f"{METRIC_PREFIX}_stage_seconds_total{_labels(scope=scope, stage=name)} {seconds:.6f}")
+        metric('stage_runs_total', 'counter', 'Times each seeding stage ran')
+        for (scope, name), (_, count) in stages:
+            lines.append(f"{METRIC_PREFIX}_stage_runs_total{_labels(scope=scope, stage=name)} {count}")
+
+        _write_atomically(path, '\n'.join(lines) + '\n')
+
+    def mongo_listener(self):
+        """A pymongo CommandListener feeding this collector (pass it in event_listeners)"""
+        from pymongo import monitoring
+        import bson
+
+        instrumentation = self
+
+        class MongoCommandRecorder(monitoring.CommandListener):
+            def started(self, event):
+                # Raw batch documents are copied, not re-encoded, so this stays cheap for bulk writes
+                instrumentation.record_request('documentdb', event.command_name, len(bson.encode(event.command)))
+
+            def succeeded(self, event):
+                instrumentation.record_response('documentdb', event.command_name, event.duration_micros / 1e6)
+
+            def failed(self, event):
+                instrumentation.record_response('documentdb', event.command_name, event.duration_micros / 1e6,
+                                                error=True)
+
+        return MongoCommandRecorder()
+
+    def mongo_pool_listener(self):
+        """A pymongo ConnectionPoolListener recording checkout waits (pass it in event_listeners)"""
+        from pymongo import monitoring
+
+        instrumentation = self
+
+        class MongoPoolRecorder(monitoring.ConnectionPoolListener):
+            def connection_checked_out(self, event):
+                # duration (pymongo 4.7+) covers waiting for a free connection and opening a new one
+                duration = getattr(event, 'duration', None)
+                if duration is not None:
+                    instrumentation.record_pool_wait('documentdb', duration)
+
+            # pymongo requires every pool event handler; only checkouts are recorded
+            def pool_created(self, event):
+                pass
+
+            def pool_ready(self, event):
+                pass
+
+            def pool_cleared(self, event):
+                pass
+
+            def pool_closed(self, event):
+                pass
+
+            def connection_created(self, event):
+                pass
+
+            def connection_ready(self, event):
+                pass
+
+            def connection_closed(self, event):
+                pass
+
+            def connection_check_out_started(self, event):
+                pass
+
+            def connection_check_out_failed(self, event):
+                pass
+
+            def connection_checked_in(self, event):
+                pass
+
+        return MongoPoolRecorder()
+
+    def instrument_boto3_session(self, session):
+        """Register event hooks on a boto3 session; clients created from it afterwards are covered"""
+        events = session.events
+
+        def before_call(context, **kwargs):
+            context['instrumentation_start'] = time.perf_counter()
+
+        def before_send(request, event_name, **kwargs):
+            # Fires once per HTTP attempt, so driver retries count as round trips
+            body = request.body or b''
+            self.record_request('dynamodb', event_name.rsplit('.', 1)[-1], len(body))
+
+        def after_call(parsed, context, event_name, **kwargs):
+            self._record_boto3_call(event_name, context)
+            self.record_retry('dynamodb', parsed.get('ResponseMetadata', {}).get('RetryAttempts', 0))
+
+        def after_call_error(context, event_name, **kwargs):
+            self._record_boto3_call(event_name, context, error=True)
+
+        events.register('before-call.dynamodb', before_call)
+        events.register('before-send.dynamodb', before_send)
+        events.register('after-call.dynamodb', after_call)
+        events.register('after-call-error.dynamodb', after_call_error)
+        _watch_urllib3_pool(self)
+        return session
+
+    def _record_boto3_call(self, event_name: str, context: Dict[str, Any], error: bool = False):
+        start = context.get('instrumentation_start')
+        if start is not None:
+            self.record_response('dynamodb', event_name.rsplit('.', 1)[-1], time.perf_counter() - start, error)
+
+    def redis_connection_class(self, base: type) -> type:
+        """Subclass a redis-py Connection class so it reports to this collector"""
+        cls = self._redis_classes.get(base)
+        if cls is None:
+            cls = self._redis_classes[base] = _instrumented_redis_connection(base, self)
+        return cls
+
+    def instrument_redis_client(self, client):
+        """
+        Swap the connection class of a Redis or RedisCluster client's pools for an instrumented one.
+
+        redis-py replaces connection_class with SSLConnection when ssl=True, so this is applied to the
+        connected client instead. Pools are reset so that no uninstrumented connection is reused.
+        """
+        if hasattr(client, 'get_nodes'):
+            pools = [node.redis_connection.connection_pool for node in client.get_nodes()
+                     if node.redis_connection is not None]
+        else:
+            pools = [client.connection_pool]
+        for pool in pools:
+            pool.connection_class = self.redis_connection_class(pool.connection_class)
+            pool.reset()
+            self._time_redis_checkouts(pool)
+        return client
+
+    def _time_redis_checkouts(self, pool):
+        """Wrap a pool's get_connection so the wait for a connection is recorded"""
+        if getattr(pool, '_instrumentation_timed', False):
+            return
+        get_connection = pool.get_connection
+        instrumentation = self
+
+        def timed_get_connection(*args, **kwargs):
+            start = time.perf_counter()
+            connection = get_connection(*args, **kwargs)
+            instrumentation.record_pool_wait('elasticache', time.perf_counter() - start)
+            return connection
+
+        pool.get_connection = timed_get_connection
+        pool._instrumentation_timed = True
+
+
+def _instrumented_redis_connection(base: type, instrumentation: Instrumentation) -> type:
+    """Build a Connection subclass that times each round trip from send to its last reply"""
+
+    class InstrumentedConnection(base):
+        _command_name = 'UNKNOWN'
+        _pending_replies = 0
+        _sent_at = 0.0
+
+        def send_command(self, *args, **kwargs):
+            name = args[0] if args else 'UNKNOWN'
+            self._command_name = (name.decode() if isinstance(name, bytes) else str(name)).upper()
+            self._pending_replies = 1
+            return super().send_command(*args, **kwargs)
+
+        def pack_commands(self, commands):
+            commands = list(commands)
+            self._command_name = 'PIPELINE'
+            self._pending_replies = len(commands)
+            return super().pack_commands(commands)
+
+        def send_packed_command(self, command, check_health=True):
+            size = len(command) if isinstance(command, (bytes, str)) else sum(len(part) for part in command)
+            instrumentation.record_request('elasticache', self._command_name, size)
+            self._sent_at = time.perf_counter()
+            return super().send_packed_command(command, check_health)
+
+        def read_response(self, *args, **kwargs):
+            try:
+                response = super().read_response(*args, **kwargs)
+            except Exception:
+                self._pending_replies = 0
+                instrumentation.record_response('elasticache', self._command_name,
+                                                time.perf_counter() - self._sent_at, error=True)
+                raise
+            self._pending_replies -= 1
+            if self._pending_replies == 0:
+                instrumentation.record_response('elasticache', self._command_name,
+                                                time.perf_counter() - self._sent_at)
+            return response
+
+    InstrumentedConnection.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedConnection
+
+
+class _PoolFullFilter(logging.Filter):
+    """Counts urllib3's "Connection pool is full, discarding connection" warnings without hiding them"""
+
+    def __init__(self, instrumentation: Instrumentation):
+        super().__init__()
+        self.instrumentation = instrumentation
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, str) and record.msg.startswith('Connection pool is full'):
+            host = record.args[0] if record.args else ''
+            if 'dynamodb' in str(host):
+                self.instrumentation.record_pool_overflow('dynamodb')
+        return True
+
+
+def _watch_urllib3_pool(instrumentation: Instrumentation):
+    """Attach the pool-full counter to urllib3's logger (botocore's HTTP pools use urllib3)"""
+    logger = logging.getLogger('urllib3.connectionpool')
+    if not any(isinstance(f, _PoolFullFilter) for f in logger.filters):
+        logger.addFilter(_PoolFullFilter(instrumentation))
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels: Any) -> str:
+    """Format Prometheus labels"""
+    return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + '}'
+
+
+def _write_atomically(path: str, content: str):
+    """Write via a temporary file and rename, so collectors never read a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+instrumentation = Instrumentation(enabled=os.environ.get('SEED_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes'))
+
+
+def enable_instrumentation():
+    """Turn instrumentation on; call before the database connections are opened"""
+    instrumentation.enabled = True
+    return instrumentation
@@ -8,16 +8,40 @@ import sys
 import argparse
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 
 # Import common database connections
-from database_connections import get_dynamodb_table, prepare_for_dynamodb
+from database_connections import get_dynamodb_table
+from converters import prepare_inventory_item
+from data_loader import iter_records, output_file_exists, output_path
+from dynamodb_bulk import DynamoDBBulkLoader, count_items, truncate_table
+from incremental import stamp_content_hash, sync_dynamodb_table, with_content_hash
+from prep_pool import parallel_prepare
+from instrumentation import instrumentation
+from run_journal import RunJournal
+
+
+def prepare_inventory_for_load(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert and hash one inventory record (runs in a preparation worker process)"""
+    # Convert the schema's float fields to Decimal for DynamoDB
+    return stamp_content_hash(prepare_inventory_item(record))
+
 
 class InventorySeeder:
     """Seed inventory data to DynamoDB"""
     
-    def __init__(self):
+    # Columns read by validate_inventory_product_correlation and print_seeding_summary
+    VALIDATION_FIELDS = ['productId', 'availableQuantity', 'totalQuantity', 'reorderLevel']
+    SUMMARY_FIELDS = ['totalQuantity', 'availableQuantity', 'reservedQuantity', 'totalValue', 'alerts',
+                      'category', 'reorderLevel', 'autoReorderEnabled']
+    
+    def __init__(self, truncate_segments: int = 8, write_workers: int = 4,
+                 prep_processes: Optional[int] = None):
         self.inventory_table = get_dynamodb_table('INVENTORY_TABLE')
+        self.truncate_segments = truncate_segments
+        self.write_workers = write_workers
+        # Processes converting records while the writer threads wait on the network (None: all cores)
+        self.prep_processes = prep_processes
     
     def load_inventory_from_json(self, filename: str = "inventory.json") -> List[Dict[str, Any]]:
         """Load inventory records from JSON file"""
@@ -37,21 +61,35 @@ class InventorySeeder:
             print(f"Error loading inventory from JSON: {e}")
             return []
     
-    def validate_inventory_product_correlation(self, inventory_records: List[Dict[str, Any]]) -> bool:
+    def iter_inventory(self, filename: str = "inventory.json",
+                       columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream inventory records from the data file one at a time (only the given columns, if any)"""
+        if not output_file_exists(filename):
+            print(f"No inventory file found at {output_path(filename)}")
+            return iter(())
+        return iter_records(filename, columns)
+    
+    @staticmethod
+    def validate_inventory_product_correlation(inventory_records: Iterable[Dict[str, Any]]) -> bool:
         """Validate that inventory records correlate with products"""
         try:
-            # Load products to check correlation
-            products_filepath = os.path.join(os.path.dirname(__file__), '..', 'output', 'products.json')
-            
-            if not os.path.exists(products_filepath):
+            # Stream products to check correlation (only the productId column is read)
+            if not output_file_exists('products.json'):
                 print("Warning: products.json not found - cannot validate correlation")
                 return True
             
-            with open(products_filepath, 'r', encoding='utf-8') as f:
-                products = json.load(f)
+            product_ids = {product['productId'] for product in iter_records('products.json', ['productId'])}
             
-            product_ids = {product['productId'] for product in products}
-            inventory_product_ids = {record['productId'] for record in inventory_records}
+            # Collect inventory product IDs and check the structure of the first 5 records in one pass
+            required_fields = InventorySeeder.VALIDATION_FIELDS
+            structure_errors = []
+            inventory_product_ids = set()
+            for i, record in enumerate(inventory_records):
+                if i < 5:
+                    missing_fields = [field for field in required_fields if field not in record]
+                    if missing_fields:
+                        structure_errors.append((i, missing_fields))
+                inventory_product_ids.add(record['productId'])
             
             # Check if all inventory records have corresponding products
             missing_products = inventory_product_ids - product_ids
@@ -70,13 +108,9 @@ class InventorySeeder:
             
             # Validate new simplified structure
             print(f"Validating simplified inventory structure...")
-            required_fields = ['productId', 'availableQuantity', 'totalQuantity', 'reorderLevel']
-            
-            for i, record in enumerate(inventory_records[:5]):  # Check first 5 records
-                missing_fields = [field for field in required_fields if field not in record]
-                if missing_fields:
-                    print(f"Warning: Record {i+1} missing fields: {missing_fields}")
-                    return False
+            for i, missing_fields in structure_errors:  # Checked first 5 records
+                print(f"Warning: Record {i+1} missing fields: {missing_fields}")
+                return False
             
             print(f"✅ Inventory structure validation passed")
             return correlation_percentage > 90  # At least 90% correlation
@@ -85,59 +119,68 @@ class InventorySeeder:
             print(f"Error validating correlation: {e}")
             return True  # Don't fail on validation errors
     
-    def seed_to_dynamodb(self, inventory_records: List[Dict[str, Any]]) -> bool:
-        """Seed simplified inventory records to DynamoDB (one record per product)"""
+    def seed_to_dynamodb(self, inventory_records: Iterable[Dict[str, Any]], incremental: bool = False,
+                         journal: Optional[RunJournal] = None) -> bool:
+        """Seed simplified inventory records to DynamoDB (one record per product); journaled full loads can be resumed"""
         try:
             table = self.inventory_table
             
-            # Clear existing inventory (for development)
-            print("Clearing existing inventory records...")
-            scan_response = table.scan()
-            deleted_count = 0
-            
-            with table.batch_writer() as batch:
-                for item in scan_response['Items']:
-                    # Handle both old (with warehouseId) and new (without warehouseId) schemas
-                    if 'warehouseId' in item:
-                        batch.delete_item(Key={
-                            'productId': item['productId'],
-                            'warehouseId': item['warehouseId']
-                        })
-                    else:
-                        batch.delete_item(Key={
-                            'productId': item['productId']
-                        })
-                    deleted_count += 1
-            
-            print(f"Deleted {deleted_count} existing inventory records")
+            # Incremental syncs are restartable as they are, so only full loads are journaled
+            checkpoint = None
+            if journal is not None and not incremental:
+                checkpoint = journal.checkpoint('inventory', f"dynamodb:{table.name}", 'inventory.json')
+                if checkpoint.finished:
+                    print("Inventory records were loaded in full by the run being resumed; skipping")
+                    return True
+            resuming = checkpoint is not None and checkpoint.resumed
+            if resuming:
+                # Puts overwrite, so the batches in flight at the interruption are simply replayed
+                print(f"Resuming inventory load: {checkpoint.committed_count:,} records already committed")
+            elif not incremental:
+                # Clear existing inventory (for development)
+                print("Clearing existing inventory records...")
+                with instrumentation.stage('inventory', 'clear'):
+                    deleted_count = truncate_table(table, segments=self.truncate_segments)
+                
+                print(f"Deleted {deleted_count} existing inventory records")
             
             # Insert new simplified inventory records (one per product)
-            print(f"Inserting {len(inventory_records)} product inventory records...")
-            inserted_count = 0
+            print(f"Inserting product inventory records...")
+            record_count = 0
             failed_count = 0
             
-            with table.batch_writer() as batch:
-                for i, record in enumerate(inventory_records):
-                    try:
-                        # Convert any remaining datetime objects to strings for DynamoDB
-                        dynamodb_record = prepare_for_dynamodb(record)
-                        
-                        # Validate required fields before insertion
-                        if 'productId' not in dynamodb_record:
-                            print(f"Skipping record {i+1}: missing productId")
-                            failed_count += 1
-                            continue
-                            
-                        batch.put_item(Item=dynamodb_record)
-                        inserted_count += 1
-                        
-                        if inserted_count % 25 == 0:  # DynamoDB batch limit is 25
-                            print(f"Inserted {inserted_count}/{len(inventory_records)} product inventory records")
-                            
-                    except Exception as e:
-                        print(f"Failed to insert record {i+1}: {e}")
+            def prepared_records():
+                nonlocal record_count, failed_count
+                # Records are converted in a process pool; failures come back as None
+                prepared = parallel_prepare(inventory_records, prepare_inventory_for_load,
+                                            processes=self.prep_processes)
+                for i, dynamodb_record in enumerate(prepared):
+                    record_count += 1
+                    if dynamodb_record is None:
+                        print(f"Failed to prepare record {i+1}")
+                        failed_count += 1
+                        continue
+                    
+                    # Validate required fields before insertion
+                    if 'productId' not in dynamodb_record:
+                        print(f"Skipping record {i+1}: missing productId")
                         failed_count += 1
                         continue
+                    
+                    yield dynamodb_record
+            
+            # Write from several threads with batch_write_item and UnprocessedItems backoff
+            loader = DynamoDBBulkLoader(table.name, workers=self.write_workers)
+            with instrumentation.stage('inventory', 'insert'):
+                if incremental:
+                    # Only new or changed records are written; removed ones are deleted
+                    sync = sync_dynamodb_table(table, prepared_records(), loader, segments=self.truncate_segments)
+                    sync.print_summary("Inventory")
+                    inserted_count = sync.written
+                else:
+                    inserted_count = loader.load(with_content_hash(prepared_records()), checkpoint=checkpoint)
+            failed_count += loader.items_failed
+            loader.print_stats("Inventory bulk load")
             
             print(f"Successfully seeded {inserted_count} product inventory records to DynamoDB")
             if failed_count > 0:
@@ -145,11 +188,14 @@ class InventorySeeder:
             print(f"Each product now has a single inventory record (simplified structure)")
             
             # Verify the seeding
-            verify_response = table.scan(Select='COUNT')
-            actual_count = verify_response['Count']
-            print(f"Verification: {actual_count} records found in DynamoDB table")
+            with instrumentation.stage('inventory', 'verify'):
+                actual_count = count_items(table)
+                print(f"Verification: {actual_count} records found in DynamoDB table")
             
-            return actual_count == len(inventory_records)
+            success = actual_count == record_count
+            if success and checkpoint is not None:
+                checkpoint.finish(actual_count)
+            return success
             
         except Exception as e:
             print(f"Error seeding inventory to DynamoDB: {e}")
@@ -157,32 +203,30 @@ class InventorySeeder:
     
 
     
-    def print_seeding_summary(self, inventory_records: List[Dict[str, Any]]):
-        """Print summary of seeded inventory data (simplified structure)"""
-        if not inventory_records:
-            return
-        
-        print(f"\n📊 Inventory Seeding Summary")
-        print(f"{'='*50}")
-        
-        # Basic stats
-        total_products = len(inventory_records)
-        total_stock = sum(int(record.get("totalQuantity", 0)) for record in inventory_records)
-        total_available = sum(int(record.get("availableQuantity", 0)) for record in inventory_records)
-        total_reserved = sum(int(record.get("reservedQuantity", 0)) for record in inventory_records)
-        total_value = sum(Decimal(str(record.get("totalValue", 0))) for record in inventory_records)
-        total_alerts = sum(len(record.get("alerts", [])) for record in inventory_records)
-        
-        print(f"Products with inventory: {total_products}")
-        print(f"Total stock units: {total_stock:,}")
-        print(f"Available stock units: {total_available:,}")
-        print(f"Reserved stock units: {total_reserved:,}")
-        print(f"Total inventory value: ${total_value:,.2f}")
-        print(f"Active alerts: {total_alerts}")
-        
-        # Category breakdown
+    def print_seeding_summary(self, inventory_records: Iterable[Dict[str, Any]]):
+        """Print summary of seeded inventory data (simplified structure) in a single streaming pass"""
+        total_products = 0
+        total_stock = 0
+        total_available = 0
+        total_reserved = 0
+        total_value = Decimal(0)
+        total_alerts = 0
         category_stats = {}
+        low_stock_count = 0
+        out_of_stock_count = 0
+        auto_reorder_enabled_count = 0
+        alert_levels = {}
+        
         for record in inventory_records:
+            # Basic stats
+            total_products += 1
+            total_stock += int(record.get("totalQuantity", 0))
+            total_available += int(record.get("availableQuantity", 0))
+            total_reserved += int(record.get("reservedQuantity", 0))
+            total_value += Decimal(str(record.get("totalValue", 0)))
+            total_alerts += len(record.get("alerts", []))
+            
+            # Category breakdown
             category = record.get("category", "Unknown")
             if category not in category_stats:
                 category_stats[category] = {"count": 0, "stock": 0, "value": 0}
@@ -190,17 +234,8 @@ class InventorySeeder:
             category_stats[category]["count"] += 1
             category_stats[category]["stock"] += int(record.get("totalQuantity", 0))
             category_stats[category]["value"] += Decimal(str(record.get("totalValue", 0)))
-        
-        print(f"\nInventory by category:")
-        for category, stats in sorted(category_stats.items()):
-            print(f"  {category}: {stats['count']} products, {stats['stock']:,} units, ${stats['value']:,.2f}")
-        
-        # Stock status summary
-        low_stock_count = 0
-        out_of_stock_count = 0
-        auto_reorder_enabled_count = 0
-        
-        for record in inventory_records:
+            
+            # Stock status summary
             available = int(record.get("availableQuantity", 0))
             reorder_level = int(record.get("reorderLevel", 0))
             auto_reorder = record.get("autoReorderEnabled", False)
@@ -212,6 +247,28 @@ class InventorySeeder:
                 
             if auto_reorder:
                 auto_reorder_enabled_count += 1
+            
+            # Alert summary
+            for alert in record.get("alerts", []):
+                level = alert.get("alertLevel", "unknown")
+                alert_levels[level] = alert_levels.get(level, 0) + 1
+        
+        if not total_products:
+            return
+        
+        print(f"\n📊 Inventory Seeding Summary")
+        print(f"{'='*50}")
+        
+        print(f"Products with inventory: {total_products}")
+        print(f"Total stock units: {total_stock:,}")
+        print(f"Available stock units: {total_available:,}")
+        print(f"Reserved stock units: {total_reserved:,}")
+        print(f"Total inventory value: ${total_value:,.2f}")
+        print(f"Active alerts: {total_alerts}")
+        
+        print(f"\nInventory by category:")
+        for category, stats in sorted(category_stats.items()):
+            print(f"  {category}: {stats['count']} products, {stats['stock']:,} units, ${stats['value']:,.2f}")
         
         print(f"\nStock status:")
         print(f"  Products in stock: {total_products - out_of_stock_count}")
@@ -219,13 +276,6 @@ class InventorySeeder:
         print(f"  Products out of stock: {out_of_stock_count}")
         print(f"  Products with auto-reorder enabled: {auto_reorder_enabled_count}")
         
-        # Alert summary
-        alert_levels = {}
-        for record in inventory_records:
-            for alert in record.get("alerts", []):
-                level = alert.get("alertLevel", "unknown")
-                alert_levels[level] = alert_levels.get(level, 0) + 1
-        
         if alert_levels:
             print(f"\nAlert summary:")
             for level, count in sorted(alert_levels.items()):
@@ -240,6 +290,14 @@ def main():
         parser = argparse.ArgumentParser(description='Seed inventory data to DynamoDB')
         parser.add_argument('--force', '-f', action='store_true', 
                           help='Force seeding even with poor correlation (non-interactive mode)')
+        parser.add_argument('--truncate-segments', type=int, default=8,
+                          help='Parallel scan segments used to clear the table (default: 8)')
+        parser.add_argument('--write-workers', type=int, default=4,
+                          help='Writer threads for the bulk load (default: 4)')
+        parser.add_argument('--incremental', action='store_true',
+                          help='Write only new or changed records and delete removed ones instead of reloading')
+        parser.add_argument('--resume', action='store_true',
+                          help='Continue an interrupted full load from the run journal, skipping committed batches')
         args = parser.parse_args()
         
         print("🦄 Unicorn E-Commerce Inventory Database Seeder")
@@ -247,18 +305,17 @@ def main():
         print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         # Initialize seeder
-        seeder = InventorySeeder()
-        
-        # Load inventory records from JSON
-        inventory_records = seeder.load_inventory_from_json()
+        seeder = InventorySeeder(truncate_segments=args.truncate_segments, write_workers=args.write_workers)
         
-        if not inventory_records:
+        # Inventory records are streamed from JSON on each pass so memory stays flat
+        if not output_file_exists("inventory.json"):
             print("No inventory records found. Please run inventory_generator.py first.")
             return
         
         # Validate correlation with products
         print("\nValidating product-inventory correlation...")
-        correlation_valid = seeder.validate_inventory_product_correlation(inventory_records)
+        correlation_valid = seeder.validate_inventory_product_correlation(
+            seeder.iter_inventory(columns=seeder.VALIDATION_FIELDS))
         
         # if not correlation_valid:
         #     print("Warning: Poor correlation between products and inventory detected")
@@ -276,12 +333,13 @@ def main():
         #             return
         
         # Seed to DynamoDB
-        print(f"\nSeeding {len(inventory_records)} inventory records to DynamoDB...")
-        success = seeder.seed_to_dynamodb(inventory_records)
+        print(f"\nSeeding inventory records to DynamoDB...")
+        journal = RunJournal.from_environment(resume=args.resume)
+        success = seeder.seed_to_dynamodb(seeder.iter_inventory(), incremental=args.incremental, journal=journal)
         
         if success:
             print("✅ Inventory seeding completed successfully!")
-            seeder.print_seeding_summary(inventory_records)
+            seeder.print_seeding_summary(seeder.iter_inventory(columns=seeder.SUMMARY_FIELDS))
             
             print(f"\n🚀 Inventory data is now available in DynamoDB table: {os.environ.get('INVENTORY_TABLE', 'INVENTORY_TABLE')}")
             print(f"   Products in DocumentDB are correlated with inventory in DynamoDB")
@@ -6,16 +6,39 @@ import json
 import os
 import sys
 from datetime import datetime
-from typing import List, Dict, Any
+from functools import partial
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 
 # Import common database connections
 from database_connections import get_documentdb_collection
+from data_loader import iter_records, output_file_exists, output_path
+from documentdb_bulk import SHADOW_SUFFIX, DocumentDBBulkLoader, create_shadow_collection, promote_shadow_collection
+from incremental import stamp_content_hash, sync_documentdb_collection, with_content_hash
+from index_registry import KNOWLEDGE_BASE_INDEXES, sync_indexes
+from embedding_store import get_embedding_store, open_embedding_store
+from prep_pool import parallel_prepare
+from instrumentation import instrumentation
+from run_journal import RunJournal
+
+
+def prepare_article_for_load(article: Dict[str, Any], embeddings_source: Optional[str] = None) -> Dict[str, Any]:
+    """Join and hash one knowledge base article (runs in a preparation worker process)"""
+    if embeddings_source:
+        get_embedding_store(embeddings_source).attach_one(article)
+    return stamp_content_hash(article)
+
 
 class KnowledgeBaseSeeder:
     """Seed knowledge base data to DocumentDB"""
     
-    def __init__(self):
+    def __init__(self, embeddings_source: str = "knowledge_base.json", write_workers: int = 4,
+                 prep_processes: Optional[int] = None):
         self.kb_collection = get_documentdb_collection('knowledge_base')
+        self.write_workers = write_workers
+        # Processes preparing records while the writer threads wait on the network (None: all cores)
+        self.prep_processes = prep_processes
+        # Data file whose embedding sidecar (if any) is joined in at insert time
+        self.embeddings_source = embeddings_source
     
     def load_knowledge_base_from_json(self, filename: str = "knowledge_base.json") -> List[Dict[str, Any]]:
         """Load knowledge base records from JSON file"""
@@ -35,64 +58,114 @@ class KnowledgeBaseSeeder:
             print(f"Error loading knowledge base from JSON: {e}")
             return []
     
-    def seed_to_documentdb(self, kb_articles: List[Dict[str, Any]]) -> bool:
-        """Seed knowledge base records to DocumentDB"""
+    def iter_knowledge_base(self, filename: str = "knowledge_base.json",
+                            columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream knowledge base records from the data file one at a time (only the given columns, if any)"""
+        if not output_file_exists(filename):
+            print(f"No knowledge base file found at {output_path(filename)}")
+            return iter(())
+        return iter_records(filename, columns)
+    
+    def seed_to_documentdb(self, kb_articles: Iterable[Dict[str, Any]], incremental: bool = False,
+                           blue_green: bool = False, journal: Optional[RunJournal] = None) -> bool:
+        """Seed knowledge base records to DocumentDB (blue_green loads a shadow collection and swaps it in)"""
             
         try:
-            # Clear existing knowledge base (for development)
-            print("Clearing existing knowledge base articles...")
-            delete_result = self.kb_collection.delete_many({})
-            print(f"Deleted {delete_result.deleted_count} existing articles")
+            if incremental and blue_green:
+                raise ValueError("incremental and blue_green modes cannot be combined")
+            
+            # Incremental syncs are restartable as they are, so only full loads are journaled
+            checkpoint = None
+            if journal is not None and not incremental:
+                target = self.kb_collection.name + (SHADOW_SUFFIX if blue_green else '')
+                checkpoint = journal.checkpoint('knowledge_base', f"documentdb:{target}", 'knowledge_base.json')
+                if checkpoint.finished:
+                    print("Knowledge base articles were loaded in full by the run being resumed; skipping")
+                    return True
+            resuming = checkpoint is not None and checkpoint.resumed
+            if resuming:
+                print(f"Resuming knowledge base article load: {checkpoint.committed_count:,} articles already committed")
+            
+            collection = self.kb_collection
+            if blue_green:
+                collection = create_shadow_collection(self.kb_collection, keep_existing=resuming)
+                print(f"Seeding into shadow collection {collection.name}...")
+            elif not incremental and not resuming:
+                # Clear existing knowledge base (for development)
+                print("Clearing existing knowledge base articles...")
+                with instrumentation.stage('knowledge_base', 'clear'):
+                    delete_result = self.kb_collection.delete_many({})
+                print(f"Deleted {delete_result.deleted_count} existing articles")
             
             # Insert new articles
             print("Inserting new knowledge base articles...")
             
-            if kb_articles:
-                insert_result = self.kb_collection.insert_many(kb_articles)
-                inserted_count = len(insert_result.inserted_ids)
+            # Prepare articles in a process pool while writer threads send unordered byte-sized batches
+            expected_count = 0
+            embeddings = open_embedding_store(self.embeddings_source)
+            prepare = partial(prepare_article_for_load,
+                              embeddings_source=self.embeddings_source if embeddings else None)
+            
+            def counted_articles():
+                nonlocal expected_count
+                for article in parallel_prepare(kb_articles, prepare, processes=self.prep_processes):
+                    expected_count += 1
+                    if article is not None:
+                        yield article
+            
+            documents = counted_articles()
+            
+            loader = DocumentDBBulkLoader(collection, workers=self.write_workers)
+            with instrumentation.stage('knowledge_base', 'insert'):
+                if incremental:
+                    # Only new or changed documents are written; removed ones are deleted
+                    sync = sync_documentdb_collection(self.kb_collection, documents, 'contentId', loader)
+                    sync.print_summary("Knowledge base")
+                    inserted_count = sync.written
+                elif resuming:
+                    # Upserts make replaying the batches in flight at the interruption idempotent
+                    inserted_count = loader.upsert(with_content_hash(documents), 'contentId', checkpoint=checkpoint)
+                else:
+                    inserted_count = loader.load(with_content_hash(documents), checkpoint=checkpoint)
+            loader.print_stats("Knowledge base bulk load")
+            
+            if expected_count:
                 print(f"Successfully seeded {inserted_count} knowledge base articles to DocumentDB")
                 
-                # Create indexes for better performance
-                self._create_indexes()
+                # Sync indexes with the registry; a missing index fails the seed rather than going unnoticed
+                with instrumentation.stage('knowledge_base', 'index'):
+                    indexes_ok = self._create_indexes(collection)
                 
                 # Verify the seeding
-                actual_count = self.kb_collection.count_documents({})
-                print(f"Verification: {actual_count} articles found in DocumentDB collection")
+                with instrumentation.stage('knowledge_base', 'verify'):
+                    actual_count = collection.count_documents({})
+                    print(f"Verification: {actual_count} articles found in DocumentDB collection {collection.name}")
                 
-                return actual_count == len(kb_articles)
+                if blue_green:
+                    if actual_count != expected_count or not indexes_ok:
+                        print(f"❌ Shadow collection failed verification; live knowledge base left untouched")
+                        return False
+                    promote_shadow_collection(collection, self.kb_collection.name)
+                
+                success = actual_count == expected_count and indexes_ok
+                if success and checkpoint is not None:
+                    checkpoint.finish(actual_count)
+                return success
             else:
                 print("No knowledge base articles to seed")
+                if blue_green:
+                    collection.drop()
                 return True
             
         except Exception as e:
             print(f"Error seeding knowledge base to DocumentDB: {e}")
             return False
     
-    def _create_indexes(self):
-        """Create indexes for better query performance"""
-        try:
-            # Create indexes on commonly queried fields
-            indexes = [
-                ("category", 1),      # Index on category
-                ("tags", 1),          # Index on tags
-                ("title", "text"),    # Text index for search
-                ("content", "text"),  # Text index for content search
-                ("createdAt", -1),    # Index on creation date (desc)
-            ]
-            
-            for field, direction in indexes:
-                try:
-                    if field in ["title", "content"]:
-                        # Text index for full-text search
-                        self.kb_collection.create_index([(field, direction)])
-                    else:
-                        self.kb_collection.create_index([(field, direction)])
-                    print(f"Created index on {field}")
-                except Exception as e:
-                    print(f"Index on {field} may already exist: {e}")
-                    
-        except Exception as e:
-            print(f"Error creating indexes: {e}")
+    def _create_indexes(self, collection=None) -> bool:
+        """Sync the collection's indexes with the declared spec in index_registry"""
+        if collection is None:
+            collection = self.kb_collection
+        return sync_indexes(collection, KNOWLEDGE_BASE_INDEXES)
 
 def main():
     """Main function to seed knowledge base data to DocumentDB"""
@@ -104,16 +177,14 @@ def main():
         # Initialize seeder
         seeder = KnowledgeBaseSeeder()
         
-        # Load knowledge base records from JSON
-        kb_articles = seeder.load_knowledge_base_from_json()
-        
-        if not kb_articles:
+        # Knowledge base records are streamed from JSON so memory stays flat
+        if not output_file_exists("knowledge_base.json"):
             print("No knowledge base articles found. Skipping knowledge base seeding.")
             return
         
         # Seed to DocumentDB
-        print(f"\nSeeding {len(kb_articles)} knowledge base articles to DocumentDB...")
-        success = seeder.seed_to_documentdb(kb_articles)
+        print(f"\nSeeding knowledge base articles to DocumentDB...")
+        success = seeder.seed_to_documentdb(seeder.iter_knowledge_base())
         
         if success:
             print("✅ Knowledge base seeding completed successfully!")
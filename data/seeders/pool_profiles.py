@@ -0,0 +1,117 @@
+"""
+Connection Pool Profiles for Unicorn E-Commerce Seeders
+Named pool size, keepalive, timeout, compression and retry settings applied alike to all three clients
+
+- interactive: small pools and 10 s timeouts, as before profiles existed, for one-off seeds (default)
+- bulk-load: large pre-warmed pools, long socket timeouts, Mongo wire compression and adaptive
+  DynamoDB retries, for parallel full reseeds
+- lambda: a couple of connections per store, short timeouts, and idle connections dropped
+  before a frozen execution environment's sockets go stale
+
+Select a profile with seed_all.py --pool-profile or SEED_POOL_PROFILE. Inside Lambda
+(AWS_LAMBDA_FUNCTION_NAME set) the lambda profile is the default.
+"""
+import importlib.util
+import os
+from typing import Any, Dict, List, Optional
+
+
+class PoolProfile:
+    """Connection pool settings shared by the DocumentDB, DynamoDB and ElastiCache clients"""
+
+    def __init__(self, name: str, max_connections: int, prewarm_connections: int, connect_timeout: float,
+                 socket_timeout: float, pool_timeout: float, max_idle_time: Optional[float] = None,
+                 keepalive: bool = True, compressors: Optional[List[str]] = None,
+                 retry_mode: str = 'standard', max_attempts: int = 3):
+        self.name = name
+        # Per client: Mongo maxPoolSize, Redis connections per node, botocore max_pool_connections
+        self.max_connections = max_connections
+        # Connections opened at connect time instead of on the first burst of writes
+        self.prewarm_connections = min(prewarm_connections, max_connections)
+        self.connect_timeout = connect_timeout
+        self.socket_timeout = socket_timeout
+        # Longest wait for a free pooled connection before the checkout fails
+        self.pool_timeout = pool_timeout
+        self.max_idle_time = max_idle_time
+        self.keepalive = keepalive
+        self.compressors = compressors or []
+        self.retry_mode = retry_mode
+        self.max_attempts = max_attempts
+
+    def mongo_options(self) -> Dict[str, Any]:
+        """pymongo MongoClient keyword arguments (pymongo always enables TCP keepalive)"""
+        options = {
+            'maxPoolSize': self.max_connections,
+            'minPoolSize': self.prewarm_connections,
+            'connectTimeoutMS': int(self.connect_timeout * 1000),
+            'serverSelectionTimeoutMS': int(self.connect_timeout * 1000),
+            'socketTimeoutMS': int(self.socket_timeout * 1000),
+            'waitQueueTimeoutMS': int(self.pool_timeout * 1000),
+            'retryReads': self.max_attempts > 1,
+        }
+        if self.max_idle_time is not None:
+            options['maxIdleTimeMS'] = int(self.max_idle_time * 1000)
+        # Compression is negotiated with the server; skip compressors whose module is missing
+        compressors = [name for name in self.compressors if _compressor_available(name)]
+        if compressors:
+            options['compressors'] = ','.join(compressors)
+        return options
+
+    def redis_options(self) -> Dict[str, Any]:
+        """redis-py socket and pool-size settings (valid for sync and asyncio clients)"""
+        return {
+            'max_connections': self.max_connections,
+            'socket_connect_timeout': self.connect_timeout,
+            'socket_timeout': self.socket_timeout,
+            'socket_keepalive': self.keepalive,
+            'retry_on_timeout': self.max_attempts > 1,
+        }
+
+    def botocore_config_kwargs(self) -> Dict[str, Any]:
+        """botocore Config keyword arguments (also accepted by aiobotocore's AioConfig)"""
+        return {
+            'max_pool_connections': self.max_connections,
+            'connect_timeout': self.connect_timeout,
+            'read_timeout': self.socket_timeout,
+            'tcp_keepalive': self.keepalive,
+            'retries': {'mode': self.retry_mode, 'total_max_attempts': self.max_attempts},
+        }
+
+    def botocore_config(self):
+        """botocore Config for DynamoDB clients and resources"""
+        from botocore.config import Config
+        return Config(**self.botocore_config_kwargs())
+
+
+_COMPRESSOR_MODULES = {'zstd': 'zstandard', 'snappy': 'snappy', 'zlib': 'zlib'}
+
+
+def _compressor_available(name: str) -> bool:
+    return importlib.util.find_spec(_COMPRESSOR_MODULES.get(name, name)) is not None
+
+
+POOL_PROFILES = {
+    'interactive': PoolProfile('interactive', max_connections=10, prewarm_connections=0,
+                               connect_timeout=10, socket_timeout=10, pool_timeout=10),
+    'bulk-load': PoolProfile('bulk-load', max_connections=64, prewarm_connections=8,
+                             connect_timeout=10, socket_timeout=60, pool_timeout=30,
+                             max_idle_time=300, compressors=['zstd', 'zlib'],
+                             retry_mode='adaptive', max_attempts=10),
+    'lambda': PoolProfile('lambda', max_connections=4, prewarm_connections=1,
+                          connect_timeout=3, socket_timeout=10, pool_timeout=5,
+                          max_idle_time=60, max_attempts=3),
+}
+
+DEFAULT_POOL_PROFILE = 'interactive'
+
+
+def get_pool_profile(name: Optional[str] = None) -> PoolProfile:
+    """Look up a profile by name, falling back to SEED_POOL_PROFILE and then the environment's default"""
+    if name is None:
+        name = os.environ.get('SEED_POOL_PROFILE')
+    if name is None:
+        name = 'lambda' if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') else DEFAULT_POOL_PROFILE
+    try:
+        return POOL_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown pool profile: {name}. Available: {', '.join(POOL_PROFILES)}")
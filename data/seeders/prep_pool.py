@@ -0,0 +1,83 @@
+"""
+Parallel Record Preparation for Unicorn E-Commerce Seeders
+Runs CPU-bound record preparation in a process pool while writer threads do network I/O
+"""
+import multiprocessing
+import os
+import time
+from collections import deque
+from itertools import chain, islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from data_loader import batched
+from instrumentation import instrumentation
+
+
+def prepare_chunk(func: Callable[[Any], Any], chunk: List[Any]) -> List[Any]:
+    """Apply func to every record of a chunk in a worker process; failed records become None"""
+    results = []
+    for record in chunk:
+        try:
+            results.append(func(record))
+        except Exception as e:
+            print(f"Failed to prepare record: {e}")
+            results.append(None)
+    return results
+
+
+def _get_context():
+    """
+    Pick a start method that is safe in a process that already runs driver threads.
+
+    Forking a process that holds MongoClient or boto3 threads can deadlock the child, so
+    workers are started from a clean forkserver (or spawned where that is unavailable).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def parallel_prepare(records: Iterable[Any], func: Callable[[Any], Any], processes: Optional[int] = None,
+                     chunk_size: int = 500, max_pending_chunks: Optional[int] = None) -> Iterator[Any]:
+    """
+    Yield func(record) for every record, computed in chunks by a process pool.
+
+    Results come back in input order. At most max_pending_chunks chunks are in flight, and the
+    next chunk is only read from records once the oldest result has been consumed, so a slow
+    consumer (e.g. a full writer queue) holds back both the reader and the pool. func must be
+    picklable (a module-level function or a functools.partial of one).
+
+    Records are prepared inline when processes <= 1 or the input fits in a single chunk, so
+    small loads do not pay for starting a pool. Time spent preparing inline, or waiting on the
+    pool, is recorded as the 'prepare' stage of the enclosing instrumentation stage.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    chunks = batched(records, chunk_size)
+    head = list(islice(chunks, 2))
+    if processes <= 1 or len(head) < 2:
+        for chunk in chain(head, chunks):
+            start = time.perf_counter()
+            prepared = prepare_chunk(func, chunk)
+            instrumentation.record_stage('prepare', time.perf_counter() - start)
+            yield from prepared
+        return
+
+    max_pending_chunks = max_pending_chunks or processes * 2
+    pending = deque()
+
+    with _get_context().Pool(processes) as pool:
+        for chunk in chain(head, chunks):
+            pending.append(pool.apply_async(prepare_chunk, (func, chunk)))
+            if len(pending) >= max_pending_chunks:
+                yield from _collect(pending.popleft())
+
+        while pending:
+            yield from _collect(pending.popleft())
+
+
+def _collect(result) -> List[Any]:
+    """Wait for a pool result, recording the wait as preparation time"""
+    start = time.perf_counter()
+    prepared = result.get()
+    instrumentation.record_stage('prepare', time.perf_counter() - start)
+    return prepared
@@ -6,16 +6,82 @@ import json
 import os
 import sys
 from datetime import datetime
-from typing import List, Dict, Any
+from functools import partial
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 
 # Import common database connections
 from database_connections import get_documentdb_collection
+from data_loader import iter_records, output_file_exists, output_path
+from documentdb_bulk import SHADOW_SUFFIX, DocumentDBBulkLoader, create_shadow_collection, promote_shadow_collection
+from incremental import stamp_content_hash, sync_documentdb_collection, with_content_hash
+from index_registry import PRODUCT_INDEXES, sync_indexes
+from embedding_store import get_embedding_store, open_embedding_store
+from converters import prepare_product_document
+from prep_pool import parallel_prepare
+from instrumentation import instrumentation
+from run_journal import RunJournal
+
+
+def prepare_product_for_load(product: Dict[str, Any], embeddings_source: Optional[str] = None) -> Dict[str, Any]:
+    """Convert, join and hash one product (runs in a preparation worker process)"""
+    # Compiled from PRODUCT_DOCUMENT_SCHEMA: only the declared datetime fields are parsed
+    document = prepare_product_document(product)
+    
+    # Set _id field with productId for DocumentDB
+    if 'productId' in document:
+        document['_id'] = document['productId']
+    
+    if embeddings_source:
+        # Joined after conversion so the datetime conversion never walks the vectors
+        get_embedding_store(embeddings_source).attach_one(document)
+    return stamp_content_hash(document)
+
+
+# Products that can take part in vector search
+EMBEDDING_FILTER = {"embedding": {"$exists": True, "$ne": None}}
+
+
+def report_embedding_coverage(products_with_embeddings: int, total_products: int,
+                              sample_product: Optional[Dict[str, Any]]) -> bool:
+    """Print embedding coverage and dimensions; False when no product has an embedding"""
+    if products_with_embeddings == 0:
+        print("❌ No products have embeddings!")
+        print("   Vector search will not work without embeddings")
+        return False
+    elif products_with_embeddings < total_products:
+        print(f"⚠️  Only {products_with_embeddings}/{total_products} products have embeddings")
+        print("   Some products may not appear in vector search results")
+    else:
+        print(f"✅ All {products_with_embeddings} products have embeddings")
+    
+    # Check embedding dimensions
+    if sample_product and "embedding" in sample_product:
+        embedding_dim = len(sample_product["embedding"])
+        print(f"   Embedding dimensions: {embedding_dim}")
+        
+        if embedding_dim != 1536:
+            print(f"⚠️  Expected 1536 dimensions for Titan embeddings, got {embedding_dim}")
+        else:
+            print("   ✅ Embedding dimensions match Titan model (1536)")
+    
+    return True
+
 
 class ProductSeeder:
     """Seed product data to DocumentDB"""
     
-    def __init__(self):
+    # Columns read by validate_product_data and print_seeding_summary
+    VALIDATION_FIELDS = ['productId', 'name', 'category', 'currentPrice']
+    SUMMARY_FIELDS = ['currentPrice', 'category', 'inStock', 'isFeatured', 'isNew']
+    
+    def __init__(self, embeddings_source: str = "products.json", write_workers: int = 4,
+                 prep_processes: Optional[int] = None):
         self.products_collection = get_documentdb_collection('products')
+        self.write_workers = write_workers
+        # Processes converting records while the writer threads wait on the network (None: all cores)
+        self.prep_processes = prep_processes
+        # Data file whose embedding sidecar (if any) is joined in at insert time
+        self.embeddings_source = embeddings_source
     
     def load_products_from_json(self, filename: str = "products.json") -> List[Dict[str, Any]]:
         """Load product records from JSON file"""
@@ -35,16 +101,23 @@ class ProductSeeder:
             print(f"Error loading products from JSON: {e}")
             return []
     
-    def validate_product_data(self, products: List[Dict[str, Any]]) -> bool:
+    def iter_products(self, filename: str = "products.json",
+                      columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream product records from the data file one at a time (only the given columns, if any)"""
+        if not output_file_exists(filename):
+            print(f"No products file found at {output_path(filename)}")
+            return iter(())
+        return iter_records(filename, columns)
+    
+    @staticmethod
+    def validate_product_data(products: Iterable[Dict[str, Any]]) -> bool:
         """Validate product data before seeding"""
-        if not products:
-            print("No products to validate")
-            return False
-        
-        required_fields = ['productId', 'name', 'category', 'currentPrice']
+        required_fields = ProductSeeder.VALIDATION_FIELDS
         
+        total_count = 0
         valid_count = 0
         for i, product in enumerate(products):
+            total_count += 1
             # Check required fields
             missing_fields = [field for field in required_fields if field not in product]
             if missing_fields:
@@ -62,232 +135,143 @@ class ProductSeeder:
             
             valid_count += 1
         
-        validation_percentage = (valid_count / len(products)) * 100
-        print(f"Product validation: {valid_count}/{len(products)} valid ({validation_percentage:.1f}%)")
+        if not total_count:
+            print("No products to validate")
+            return False
+        
+        validation_percentage = (valid_count / total_count) * 100
+        print(f"Product validation: {valid_count}/{total_count} valid ({validation_percentage:.1f}%)")
         
         return validation_percentage > 95  # At least 95% valid
     
-    def seed_to_documentdb(self, products: List[Dict[str, Any]]) -> bool:
-        """Seed product records to DocumentDB"""
+    def seed_to_documentdb(self, products: Iterable[Dict[str, Any]], incremental: bool = False,
+                           blue_green: bool = False, journal: Optional[RunJournal] = None) -> bool:
+        """
+        Seed product records to DocumentDB.
+        
+        With blue_green, products are loaded, indexed and verified in a shadow collection that is
+        then swapped in for the live one, so readers never see a partial catalog. With a journal,
+        full loads record their committed batches, and a resuming journal continues the
+        interrupted load instead of starting over.
+        """
             
         try:
-            # Clear existing products (for development)
-            print("Clearing existing products...")
-            delete_result = self.products_collection.delete_many({})
-            print(f"Deleted {delete_result.deleted_count} existing products")
+            if incremental and blue_green:
+                raise ValueError("incremental and blue_green modes cannot be combined")
+            
+            # Incremental syncs are restartable as they are, so only full loads are journaled
+            checkpoint = None
+            if journal is not None and not incremental:
+                target = self.products_collection.name + (SHADOW_SUFFIX if blue_green else '')
+                checkpoint = journal.checkpoint('products', f"documentdb:{target}", 'products.json')
+                if checkpoint.finished:
+                    print("Products were loaded in full by the run being resumed; skipping")
+                    return True
+            resuming = checkpoint is not None and checkpoint.resumed
+            if resuming:
+                print(f"Resuming product load: {checkpoint.committed_count:,} products already committed")
+            
+            collection = self.products_collection
+            if blue_green:
+                collection = create_shadow_collection(self.products_collection, keep_existing=resuming)
+                print(f"Seeding into shadow collection {collection.name}...")
+            elif not incremental and not resuming:
+                # Clear existing products (for development)
+                print("Clearing existing products...")
+                with instrumentation.stage('products', 'clear'):
+                    delete_result = self.products_collection.delete_many({})
+                print(f"Deleted {delete_result.deleted_count} existing products")
             
             # Insert new products
             print("Inserting new products...")
             
-            # Prepare products for MongoDB (ensure proper data types)
-            prepared_products = []
-            for product in products:
-                prepared_product = self._prepare_for_documentdb(product)
-                prepared_products.append(prepared_product)
-            
-            # Insert in batches
-            batch_size = 100
-            inserted_count = 0
-            
-            for i in range(0, len(prepared_products), batch_size):
-                batch = prepared_products[i:i + batch_size]
-                insert_result = self.products_collection.insert_many(batch)
-                inserted_count += len(insert_result.inserted_ids)
-                
-                print(f"Inserted {inserted_count}/{len(prepared_products)} products")
+            # Prepare products in a process pool while writer threads send unordered byte-sized
+            # batches; both stages are bounded, so a slow cluster holds back the reader
+            expected_count = 0
+            embeddings = open_embedding_store(self.embeddings_source)
+            prepare = partial(prepare_product_for_load,
+                              embeddings_source=self.embeddings_source if embeddings else None)
+            
+            def prepared_products():
+                nonlocal expected_count
+                for document in parallel_prepare(products, prepare, processes=self.prep_processes):
+                    expected_count += 1
+                    # Failed records are reported by the worker and show up in the count check
+                    if document is not None:
+                        yield document
+            
+            documents = prepared_products()
+            
+            loader = DocumentDBBulkLoader(collection, workers=self.write_workers)
+            with instrumentation.stage('products', 'insert'):
+                if incremental:
+                    # Only new or changed documents are written; removed ones are deleted
+                    sync = sync_documentdb_collection(self.products_collection, documents, 'productId', loader)
+                    sync.print_summary("Product")
+                    inserted_count = sync.written
+                elif resuming:
+                    # Upserts make replaying the batches in flight at the interruption idempotent
+                    inserted_count = loader.upsert(with_content_hash(documents), 'productId', checkpoint=checkpoint)
+                else:
+                    inserted_count = loader.load(with_content_hash(documents), checkpoint=checkpoint)
+            loader.print_stats("Product bulk load")
             
             print(f"Successfully seeded {inserted_count} products to DocumentDB")
             
-            # Create indexes for better performance
-            self._create_indexes()
+            # Sync indexes with the registry; a missing index fails the seed rather than going unnoticed
+            with instrumentation.stage('products', 'index'):
+                indexes_ok = self._create_indexes(collection)
             
             # Verify the seeding
-            actual_count = self.products_collection.count_documents({})
-            print(f"Verification: {actual_count} products found in DocumentDB collection")
+            with instrumentation.stage('products', 'verify'):
+                actual_count = collection.count_documents({})
+                print(f"Verification: {actual_count} products found in DocumentDB collection {collection.name}")
+                
+                # Verify embeddings
+                embeddings_ok = self._verify_embeddings(collection)
             
-            # Verify embeddings
-            self._verify_embeddings()
+            if blue_green:
+                if actual_count != expected_count or not embeddings_ok or not indexes_ok:
+                    print(f"❌ Shadow collection failed verification; live products left untouched")
+                    return False
+                promote_shadow_collection(collection, self.products_collection.name)
             
-            return actual_count == len(products)
+            success = actual_count == expected_count and embeddings_ok and indexes_ok
+            if success and checkpoint is not None:
+                checkpoint.finish(actual_count)
+            return success
             
         except Exception as e:
             print(f"Error seeding products to DocumentDB: {e}")
             return False
     
-    def _prepare_for_documentdb(self, product: Dict[str, Any]) -> Dict[str, Any]:
-        """Prepare product for DocumentDB by ensuring proper data types and setting _id"""
-        def convert_recursive(obj):
-            if isinstance(obj, str):
-                # Try to parse ISO datetime strings back to datetime objects
-                if obj.endswith('Z') or '+' in obj[-6:] or obj.count('T') == 1:
-                    try:
-                        from datetime import datetime
-                        return datetime.fromisoformat(obj.replace('Z', '+00:00'))
-                    except:
-                        return obj
-                return obj
-            elif isinstance(obj, dict):
-                return {k: convert_recursive(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_recursive(item) for item in obj]
-            else:
-                return obj
-        
-        prepared_product = convert_recursive(product)
-        
-        # Set _id field with productId for DocumentDB
-        if 'productId' in prepared_product:
-            prepared_product['_id'] = prepared_product['productId']
-        
-        return prepared_product
-    
-    def _create_indexes(self):
-        """Create indexes for better query performance"""
-        try:
-            # Create indexes on commonly queried fields
-            indexes = [
-                ("productId", 1),  # Unique index on productId
-                ("category", 1),   # Index on category
-                ("name", "text"),  # Text index for search
-                ("tags", 1),       # Index on tags
-                ("currentPrice", 1),  # Index on price
-                ("rating", 1),     # Index on rating
-                ("inStock", 1),    # Index on stock status
-            ]
-            
-            for field, direction in indexes:
-                try:
-                    if field == "name":
-                        # Text index for full-text search
-                        self.products_collection.create_index([(field, direction)])
-                    else:
-                        self.products_collection.create_index([(field, direction)])
-                    print(f"Created index on {field}")
-                except Exception as e:
-                    print(f"Index on {field} may already exist: {e}")
-            
-            # Create compound indexes
-            compound_indexes = [
-                [("category", 1), ("currentPrice", 1)],  # Category + price
-                [("category", 1), ("rating", -1)],       # Category + rating (desc)
-                [("inStock", 1), ("category", 1)],       # Stock + category
-            ]
-            
-            for compound_index in compound_indexes:
-                try:
-                    self.products_collection.create_index(compound_index)
-                    field_names = ", ".join([f[0] for f in compound_index])
-                    print(f"Created compound index on {field_names}")
-                except Exception as e:
-                    print(f"Compound index may already exist: {e}")
-            
-            # Create HNSW vector index for embeddings (vector similarity search)
-            self._create_vector_index()
-                    
-        except Exception as e:
-            print(f"Error creating indexes: {e}")
-    
-    def _create_vector_index(self):
-        """Create HNSW vector index for embedding field"""
-        try:
-            print("Creating HNSW vector index for embeddings...")
-            
-            # DocumentDB vector index specification
-            # Try different formats for compatibility
-
-            self.products_collection.create_index ([("embedding","vector")], 
-                vectorOptions= {
-                    "type": "hnsw", 
-                    "similarity": "euclidean",
-                    "dimensions": 1536,
-                    "m": 16,
-                    "efConstruction": 64},
-                name="vss_index")
-            
-        except Exception as e:
-            print(f"Error in vector index creation process: {e}")
-                        
-        except Exception as e:
-            print(f"Error creating vector index: {e}")
-            print("Vector search may not be available until index is created manually")
-    
+    def _create_indexes(self, collection=None) -> bool:
+        """Sync the collection's indexes with the declared spec in index_registry"""
+        if collection is None:
+            collection = self.products_collection
+        return sync_indexes(collection, PRODUCT_INDEXES)
     
-    
-    def _verify_embeddings(self):
+    def _verify_embeddings(self, collection=None):
         """Verify that products have embeddings for vector search"""
+        if collection is None:
+            collection = self.products_collection
         try:
             print("\nVerifying embeddings...")
-            
-            # Count products with embeddings
-            products_with_embeddings = self.products_collection.count_documents({
-                "embedding": {"$exists": True, "$ne": None}
-            })
-            
-            total_products = self.products_collection.count_documents({})
-            
-            if products_with_embeddings == 0:
-                print("❌ No products have embeddings!")
-                print("   Vector search will not work without embeddings")
-                return False
-            elif products_with_embeddings < total_products:
-                print(f"⚠️  Only {products_with_embeddings}/{total_products} products have embeddings")
-                print("   Some products may not appear in vector search results")
-            else:
-                print(f"✅ All {products_with_embeddings} products have embeddings")
-            
-            # Check embedding dimensions
-            sample_product = self.products_collection.find_one({
-                "embedding": {"$exists": True, "$ne": None}
-            })
-            
-            if sample_product and "embedding" in sample_product:
-                embedding_dim = len(sample_product["embedding"])
-                print(f"   Embedding dimensions: {embedding_dim}")
-                
-                if embedding_dim != 1536:
-                    print(f"⚠️  Expected 1536 dimensions for Titan embeddings, got {embedding_dim}")
-                else:
-                    print("   ✅ Embedding dimensions match Titan model (1536)")
-            
-            return products_with_embeddings > 0
+            return report_embedding_coverage(
+                collection.count_documents(EMBEDDING_FILTER),
+                collection.count_documents({}),
+                collection.find_one(EMBEDDING_FILTER)
+            )
             
         except Exception as e:
             print(f"Error verifying embeddings: {e}")
             return False
     
-    def print_seeding_summary(self, products: List[Dict[str, Any]]):
-        """Print summary of seeded product data"""
-        if not products:
-            return
-        
-        print(f"\n📊 Product Seeding Summary")
-        print(f"{'='*50}")
-        
-        # Basic stats
-        total_products = len(products)
-        total_value = sum(product.get("currentPrice", 0) for product in products)
-        avg_price = total_value / total_products if total_products > 0 else 0
-        
-        print(f"Total products: {total_products}")
-        print(f"Total catalog value: ${total_value:,.2f}")
-        print(f"Average price: ${avg_price:.2f}")
-        
-        # Category breakdown
+    def print_seeding_summary(self, products: Iterable[Dict[str, Any]]):
+        """Print summary of seeded product data in a single streaming pass"""
+        total_products = 0
+        total_value = 0
         category_stats = {}
-        for product in products:
-            category = product.get("category", "Unknown")
-            if category not in category_stats:
-                category_stats[category] = {"count": 0, "total_value": 0}
-            
-            category_stats[category]["count"] += 1
-            category_stats[category]["total_value"] += product.get("currentPrice", 0)
-        
-        print(f"\nProducts by category:")
-        for category, stats in sorted(category_stats.items()):
-            avg_cat_price = stats["total_value"] / stats["count"] if stats["count"] > 0 else 0
-            print(f"  {category}: {stats['count']} products (avg: ${avg_cat_price:.2f})")
-        
-        # Price ranges
         price_ranges = {
             "Under $50": 0,
             "$50-$100": 0,
@@ -295,9 +279,23 @@ class ProductSeeder:
             "$500-$1000": 0,
             "Over $1000": 0
         }
+        in_stock = 0
+        featured = 0
+        new_products = 0
         
         for product in products:
             price = product.get("currentPrice", 0)
+            total_products += 1
+            total_value += price
+            
+            # Category breakdown
+            category = product.get("category", "Unknown")
+            if category not in category_stats:
+                category_stats[category] = {"count": 0, "total_value": 0}
+            category_stats[category]["count"] += 1
+            category_stats[category]["total_value"] += price
+            
+            # Price ranges
             if price < 50:
                 price_ranges["Under $50"] += 1
             elif price < 100:
@@ -308,24 +306,44 @@ class ProductSeeder:
                 price_ranges["$500-$1000"] += 1
             else:
                 price_ranges["Over $1000"] += 1
+            
+            # Stock status, featured and new products
+            if product.get("inStock", False):
+                in_stock += 1
+            if product.get("isFeatured", False):
+                featured += 1
+            if product.get("isNew", False):
+                new_products += 1
+        
+        if not total_products:
+            return
+        
+        print(f"\n📊 Product Seeding Summary")
+        print(f"{'='*50}")
+        
+        # Basic stats
+        avg_price = total_value / total_products
+        
+        print(f"Total products: {total_products}")
+        print(f"Total catalog value: ${total_value:,.2f}")
+        print(f"Average price: ${avg_price:.2f}")
+        
+        print(f"\nProducts by category:")
+        for category, stats in sorted(category_stats.items()):
+            avg_cat_price = stats["total_value"] / stats["count"] if stats["count"] > 0 else 0
+            print(f"  {category}: {stats['count']} products (avg: ${avg_cat_price:.2f})")
         
         print(f"\nPrice distribution:")
         for range_name, count in price_ranges.items():
-            percentage = (count / total_products) * 100 if total_products > 0 else 0
+            percentage = (count / total_products) * 100
             print(f"  {range_name}: {count} products ({percentage:.1f}%)")
         
-        # Stock status
-        in_stock = sum(1 for product in products if product.get("inStock", False))
         out_of_stock = total_products - in_stock
         
         print(f"\nStock status:")
         print(f"  In stock: {in_stock} products ({(in_stock/total_products)*100:.1f}%)")
         print(f"  Out of stock: {out_of_stock} products ({(out_of_stock/total_products)*100:.1f}%)")
         
-        # Featured and new products
-        featured = sum(1 for product in products if product.get("isFeatured", False))
-        new_products = sum(1 for product in products if product.get("isNew", False))
-        
         print(f"\nSpecial products:")
         print(f"  Featured: {featured} products")
         print(f"  New: {new_products} products")
@@ -340,16 +358,14 @@ def main():
         # Initialize seeder
         seeder = ProductSeeder()
         
-        # Load product records from JSON
-        products = seeder.load_products_from_json()
-        
-        if not products:
+        # Product records are streamed from JSON on each pass so memory stays flat
+        if not output_file_exists("products.json"):
             print("No products found. Please run product_generator.py first.")
             return
         
         # Validate product data
         print("\nValidating product data...")
-        data_valid = seeder.validate_product_data(products)
+        data_valid = seeder.validate_product_data(seeder.iter_products(columns=seeder.VALIDATION_FIELDS))
         
         if not data_valid:
             print("Warning: Product data validation failed")
@@ -359,12 +375,12 @@ def main():
                 return
         
         # Seed to DocumentDB
-        print(f"\nSeeding {len(products)} products to DocumentDB...")
-        success = seeder.seed_to_documentdb(products)
+        print(f"\nSeeding products to DocumentDB...")
+        success = seeder.seed_to_documentdb(seeder.iter_products())
         
         if success:
             print("✅ Product seeding completed successfully!")
-            seeder.print_seeding_summary(products)
+            seeder.print_seeding_summary(seeder.iter_products(columns=seeder.SUMMARY_FIELDS))
             
             print(f"\n🚀 Product data is now available in DocumentDB collection: products")
             print(f"   Products are indexed for efficient querying")
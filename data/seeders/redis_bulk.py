@@ -0,0 +1,192 @@
+"""
+Redis Bulk Write Utilities for Unicorn E-Commerce Seeders
+Groups cache commands by cluster hash slot and sends them as pipelines
+"""
+import time
+from typing import Any, Dict, List, Tuple
+
+from redis.crc import key_slot
+
+
+def get_key_slot(key) -> int:
+    """Return the cluster hash slot for a key (honours {hash tags})"""
+    if isinstance(key, str):
+        key = key.encode('utf-8')
+    return key_slot(key)
+
+
+class RedisBulkWriter:
+    """Buffer Redis commands, group them by hash slot and flush them as pipelines"""
+
+    def __init__(self, redis_client, chunk_size: int = 500, max_buffered: int = 50000):
+        self.redis_client = redis_client
+        self.chunk_size = max(1, chunk_size)
+        self.max_buffered = max(self.chunk_size, max_buffered)
+        self._buffer: Dict[int, List[Tuple[str, Any, tuple]]] = {}
+        self._buffered = 0
+
+        # Throughput statistics
+        self.commands_sent = 0
+        self.pipelines_sent = 0
+        self.errors = 0
+        self.first_error = None
+        # Sum of integer replies, e.g. the keys UNLINK actually removed
+        self.reply_total = 0
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+
+    def add(self, command: str, key, *args):
+        """Queue a single-key command such as setex, unlink or zadd"""
+        self._buffer_command(command, key, args)
+        if self.needs_flush:
+            self.flush()
+
+    @property
+    def needs_flush(self) -> bool:
+        """True once max_buffered commands are waiting to be sent"""
+        return self._buffered >= self.max_buffered
+
+    def _buffer_command(self, command: str, key, args: tuple):
+        """Append a command to its hash slot's buffer"""
+        self._buffer.setdefault(get_key_slot(key), []).append((command, key, args))
+        self._buffered += 1
+
+    def setex(self, key, ttl: int, value):
+        """Queue a SETEX command"""
+        self.add('setex', key, ttl, value)
+
+    def flush(self) -> int:
+        """Send all buffered commands in slot order, up to chunk_size commands per pipeline"""
+        if not self._buffered:
+            return 0
+
+        start = time.perf_counter()
+        sent = sum(self._execute(chunk) for chunk in self._take_chunks())
+        self.elapsed += time.perf_counter() - start
+        return sent
+
+    def _take_chunks(self) -> List[List[Tuple[str, Any, tuple]]]:
+        """Empty the buffer into pipeline-sized chunks of commands (a chunk may span slots)"""
+        chunks = []
+        chunk = []
+        # Slot order keeps each pipeline on as few cluster nodes as possible
+        for slot in sorted(self._buffer):
+            for command in self._buffer[slot]:
+                chunk.append(command)
+                if len(chunk) >= self.chunk_size:
+                    chunks.append(chunk)
+                    chunk = []
+        if chunk:
+            chunks.append(chunk)
+
+        self._buffer = {}
+        self._buffered = 0
+        return chunks
+
+    def _execute(self, chunk: List[Tuple[str, Any, tuple]]) -> int:
+        """Execute one chunk of commands as a non-transactional pipeline"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for command, key, args in chunk:
+            getattr(pipe, command)(key, *args)
+
+        self._record_errors(pipe.execute(raise_on_error=False))
+        self.commands_sent += len(chunk)
+        self.pipelines_sent += 1
+        return len(chunk)
+
+    def _record_errors(self, results: list):
+        """Count the failed commands in a pipeline's results, keeping the first error, and sum integer replies"""
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures and self.first_error is None:
+            self.first_error = failures[0]
+        self.errors += len(failures)
+        self.reply_total += sum(result for result in results
+                                if isinstance(result, int) and not isinstance(result, bool))
+
+    @property
+    def commands_per_second(self) -> float:
+        """Average command throughput across all flushes"""
+        return self.commands_sent / self.elapsed if self.elapsed > 0 else 0.0
+
+    def print_stats(self, label: str = "Redis bulk write"):
+        """Print throughput statistics for this writer"""
+        print(f"✅ {label}: {self.commands_sent:,} commands in {self.pipelines_sent:,} pipelines "
+              f"({self.elapsed:.2f}s, {self.commands_per_second:,.0f} commands/sec)")
+        if self.errors:
+            print(f"⚠️  {self.errors} commands failed during bulk write (first error: {self.first_error})")
+
+
+class PurgeError(Exception):
+    """Raised when some UNLINK commands of a namespace purge failed"""
+
+
+def purge_result(writer: RedisBulkWriter, patterns: List[str]) -> int:
+    """Return the keys a purge's UNLINK replies report as removed; raise PurgeError if any UNLINK failed"""
+    if writer.errors:
+        raise PurgeError(f"{writer.errors} UNLINK commands failed while purging {', '.join(patterns)} "
+                         f"(first error: {writer.first_error})")
+    return writer.reply_total
+
+
+def _is_literal(pattern: str) -> bool:
+    """True when a key pattern contains no glob characters"""
+    return not any(ch in pattern for ch in '*?[')
+
+
+def _scan_targets(redis_client) -> list:
+    """Return the nodes to SCAN: every cluster primary, or [None] for a standalone client"""
+    if hasattr(redis_client, 'get_primaries'):
+        return redis_client.get_primaries()
+    return [None]
+
+
+def scan_keys(redis_client, pattern: str, count: int = 1000):
+    """Iterate keys matching pattern with non-blocking SCAN, one node at a time"""
+    if _is_literal(pattern):
+        if redis_client.exists(pattern):
+            yield pattern
+        return
+
+    for node in _scan_targets(redis_client):
+        kwargs = {'target_nodes': node} if node is not None else {}
+        yield from redis_client.scan_iter(match=pattern, count=count, **kwargs)
+
+
+def count_keys(redis_client, pattern: str, count: int = 1000) -> int:
+    """Count keys matching pattern without blocking the server the way KEYS does"""
+    return sum(1 for _ in scan_keys(redis_client, pattern, count=count))
+
+
+def purge_namespace(redis_client, patterns: List[str], batch_size: int = 500,
+                    chunk_size: int = 100, scan_count: int = 1000) -> int:
+    """
+    Delete every key matching the given patterns and return the number of keys unlinked.
+
+    Keys are found with per-node SCAN, grouped by hash slot so each multi-key UNLINK stays
+    within one slot, and unlinked in pipelined batches so memory is reclaimed asynchronously.
+    The count is the sum of the UNLINK replies; PurgeError is raised if any UNLINK failed,
+    since stale keys would otherwise survive a reseed unnoticed.
+    """
+    writer = RedisBulkWriter(redis_client, chunk_size=chunk_size)
+    pending: Dict[int, list] = {}
+
+    for pattern in patterns:
+        for key in scan_keys(redis_client, pattern, count=scan_count):
+            slot_keys = pending.setdefault(get_key_slot(key), [])
+            slot_keys.append(key)
+            if len(slot_keys) >= batch_size:
+                writer.add('unlink', *slot_keys)
+                slot_keys.clear()
+
+    for slot_keys in pending.values():
+        if slot_keys:
+            writer.add('unlink', *slot_keys)
+
+    writer.flush()
+    return purge_result(writer, patterns)
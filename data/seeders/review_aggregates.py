@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Materialized Review Aggregates for Unicorn E-Commerce
+Precomputes per-product review statistics so product pages never aggregate reviews on read
+
+One $group pass over the reviews collection computes, per productId, the review count, rating
+sum and average, the 1-5 star histogram, the verified purchase count and the sentiment
+breakdown. Each result is upserted into review_stats and written back to the product as
+rating, reviewCount and reviewStats; products without reviews are reset to zero. New reviews
+are folded in with apply_new_reviews, which aggregates only those reviews and $inc's the
+counters, so the stored stats stay current without another full pass.
+
+  python data/seeders/review_aggregates.py    # recompute every product's review stats
+"""
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
+
+# Import common database connections
+from database_connections import get_documentdb_collection
+from data_loader import batched
+from index_registry import REVIEW_STATS_INDEXES, sync_indexes
+from instrumentation import instrumentation
+
+REVIEW_STATS_COLLECTION = 'review_stats'
+
+RATINGS = (1, 2, 3, 4, 5)
+SENTIMENTS = ('positive', 'neutral', 'negative')
+
+# Stats and product write-backs sent per unordered bulk_write
+WRITE_BATCH_SIZE = 1000
+
+# Reviews carry either verified or the frontend's isVerifiedPurchase flag
+_VERIFIED = {'$ifNull': ['$verified', '$isVerifiedPurchase']}
+# sentiment is a label, or an object with one
+_SENTIMENT = {'$ifNull': ['$sentiment.label', '$sentiment']}
+
+
+def _count_if(condition: Dict[str, Any]) -> Dict[str, Any]:
+    """$group accumulator counting the reviews that match condition"""
+    return {'$sum': {'$cond': [condition, 1, 0]}}
+
+
+def review_stats_pipeline(match: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Aggregation pipeline grouping reviews (optionally only those matching match) by productId"""
+    group = {
+        '_id': '$productId',
+        'reviewCount': {'$sum': 1},
+        'ratingSum': {'$sum': '$rating'},
+        'verifiedCount': _count_if({'$eq': [_VERIFIED, True]}),
+    }
+    for rating in RATINGS:
+        group[f"rating{rating}"] = _count_if({'$eq': ['$rating', rating]})
+    for sentiment in SENTIMENTS:
+        group[sentiment] = _count_if({'$eq': [_SENTIMENT, sentiment]})
+    return ([{'$match': match}] if match else []) + [{'$group': group}]
+
+
+def _average(rating_sum: float, review_count: int) -> float:
+    """Average rating rounded for display; 0 without reviews"""
+    return round(rating_sum / review_count, 2) if review_count else 0.0
+
+
+def stats_from_group(group: Dict[str, Any], updated_at: str) -> Dict[str, Any]:
+    """Turn one $group result into a review_stats document"""
+    return {
+        'productId': group['_id'],
+        'reviewCount': group['reviewCount'],
+        'ratingSum': group['ratingSum'],
+        'averageRating': _average(group['ratingSum'], group['reviewCount']),
+        'ratingHistogram': {str(rating): group[f"rating{rating}"] for rating in RATINGS},
+        'verifiedCount': group['verifiedCount'],
+        'sentiment': {sentiment: group[sentiment] for sentiment in SENTIMENTS},
+        'updatedAt': updated_at,
+    }
+
+
+def empty_stats(updated_at: str) -> Dict[str, Any]:
+    """Stats for a product without reviews"""
+    group = {'_id': None, 'reviewCount': 0, 'ratingSum': 0, 'verifiedCount': 0}
+    group.update({f"rating{rating}": 0 for rating in RATINGS})
+    group.update({sentiment: 0 for sentiment in SENTIMENTS})
+    return stats_from_group(group, updated_at)
+
+
+def product_fields(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """The product fields written back from a review_stats document"""
+    review_stats = {key: value for key, value in stats.items() if key not in ('productId', 'ratingSum')}
+    return {'rating': stats['averageRating'], 'reviewCount': stats['reviewCount'], 'reviewStats': review_stats}
+
+
+def refresh_requests(stats: Dict[str, Any]):
+    """The review_stats upsert and product write-back for one product's stats"""
+    return (ReplaceOne({'productId': stats['productId']}, stats, upsert=True),
+            UpdateOne({'productId': stats['productId']}, {'$set': product_fields(stats)}))
+
+
+def _increments(group: Dict[str, Any]) -> Dict[str, Any]:
+    """$inc document adding one $group result of new reviews to stored stats"""
+    increments = {'reviewCount': group['reviewCount'], 'ratingSum': group['ratingSum'],
+                  'verifiedCount': group['verifiedCount']}
+    increments.update({f"ratingHistogram.{rating}": group[f"rating{rating}"] for rating in RATINGS})
+    increments.update({f"sentiment.{sentiment}": group[sentiment] for sentiment in SENTIMENTS})
+    return increments
+
+
+class ReviewAggregator:
+    """Materialize per-product review statistics into review_stats and products"""
+
+    def __init__(self, reviews_collection=None, products_collection=None, stats_collection=None,
+                 batch_size: int = WRITE_BATCH_SIZE):
+        self.reviews_collection = reviews_collection or get_documentdb_collection('reviews')
+        self.products_collection = products_collection or get_documentdb_collection('products')
+        self.stats_collection = stats_collection or get_documentdb_collection(REVIEW_STATS_COLLECTION)
+        self.batch_size = batch_size
+
+    def refresh(self) -> bool:
+        """Recompute every product's review stats in one pipeline pass and write them back"""
+        try:
+            # The productId index comes first so every upsert below is a point lookup
+            with instrumentation.stage('review_stats', 'index'):
+                if not self._create_indexes():
+                    return False
+
+            updated_at = datetime.now().isoformat()
+            print("Aggregating review statistics per product...")
+            with instrumentation.stage('review_stats', 'aggregate'):
+                groups = self.reviews_collection.aggregate(review_stats_pipeline())
+                product_count = review_count = 0
+                for batch in batched(groups, self.batch_size):
+                    requests = [refresh_requests(stats_from_group(group, updated_at)) for group in batch]
+                    self.stats_collection.bulk_write([stats for stats, _ in requests], ordered=False)
+                    self.products_collection.bulk_write([product for _, product in requests], ordered=False)
+                    product_count += len(batch)
+                    review_count += sum(group['reviewCount'] for group in batch)
+            print(f"Materialized review stats for {product_count:,} products from {review_count:,} reviews")
+
+            # Products whose reviews are all gone, or that never had any, fall back to zero
+            with instrumentation.stage('review_stats', 'cleanup'):
+                stale = self.stats_collection.delete_many({'updatedAt': {'$ne': updated_at}})
+                reset = self.products_collection.update_many(
+                    {'reviewStats.updatedAt': {'$ne': updated_at}},
+                    {'$set': product_fields(empty_stats(updated_at))})
+            print(f"Removed {stale.deleted_count:,} stale review_stats documents; "
+                  f"reset {reset.modified_count:,} products without reviews")
+            return True
+
+        except Exception as e:
+            print(f"Error materializing review statistics: {e}")
+            return False
+
+    def apply_new_reviews(self, review_ids: Iterable[str]) -> int:
+        """
+        Fold reviews that were just inserted into their products' stats; return the products updated.
+
+        Only the given reviews are aggregated, and their counts are added with $inc, so each
+        review must be applied once. A later refresh() recomputes everything from scratch.
+        """
+        review_ids = list(review_ids)
+        if not review_ids:
+            return 0
+        updated_at = datetime.now().isoformat()
+        product_updates = []
+        groups = self.reviews_collection.aggregate(review_stats_pipeline({'reviewId': {'$in': review_ids}}))
+        for group in groups:
+            stats = self.stats_collection.find_one_and_update(
+                {'productId': group['_id']},
+                {'$inc': _increments(group), '$set': {'updatedAt': updated_at}},
+                projection={'_id': False}, upsert=True, return_document=ReturnDocument.AFTER)
+            stats['averageRating'] = _average(stats['ratingSum'], stats['reviewCount'])
+            # Guard on reviewCount so a slower writer cannot overwrite newer counts
+            self.stats_collection.update_one(
+                {'productId': stats['productId'], 'reviewCount': stats['reviewCount']},
+                {'$set': {'averageRating': stats['averageRating']}})
+            product_updates.append(UpdateOne(
+                {'productId': stats['productId'], 'reviewStats.reviewCount': {'$not': {'$gt': stats['reviewCount']}}},
+                {'$set': product_fields(stats)}))
+
+        if product_updates:
+            self.products_collection.bulk_write(product_updates, ordered=False)
+        return len(product_updates)
+
+    def _create_indexes(self) -> bool:
+        """Sync the review_stats indexes with the declared spec in index_registry"""
+        return sync_indexes(self.stats_collection, REVIEW_STATS_INDEXES)
+
+
+def main():
+    """Recompute review statistics for every product"""
+    print("🦄 Unicorn E-Commerce Review Aggregates")
+    print("=" * 60)
+    success = ReviewAggregator().refresh()
+    if success:
+        print(f"✅ Review stats are available in products and the {REVIEW_STATS_COLLECTION} collection")
+    else:
+        print("❌ Review aggregation failed")
+    return success
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
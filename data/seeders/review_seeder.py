@@ -6,16 +6,26 @@ import json
 import os
 import sys
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 
 # Import common database connections
 from database_connections import get_documentdb_collection
+from data_loader import iter_records, output_file_exists, output_path
+from documentdb_bulk import SHADOW_SUFFIX, DocumentDBBulkLoader, create_shadow_collection, promote_shadow_collection
+from incremental import stamp_content_hash, sync_documentdb_collection, with_content_hash
+from index_registry import REVIEW_INDEXES, sync_indexes
+from prep_pool import parallel_prepare
+from instrumentation import instrumentation
+from run_journal import RunJournal
 
 class ReviewSeeder:
     """Seed review data to DocumentDB"""
     
-    def __init__(self):
+    def __init__(self, write_workers: int = 4, prep_processes: Optional[int] = None):
         self.reviews_collection = get_documentdb_collection('reviews')
+        self.write_workers = write_workers
+        # Processes hashing records while the writer threads wait on the network (None: all cores)
+        self.prep_processes = prep_processes
     
     def load_reviews_from_json(self, filename: str = "reviews.json") -> List[Dict[str, Any]]:
         """Load review records from JSON file"""
@@ -35,80 +45,103 @@ class ReviewSeeder:
             print(f"Error loading reviews from JSON: {e}")
             return []
     
-    def seed_to_documentdb(self, reviews: List[Dict[str, Any]]) -> bool:
-        """Seed review records to DocumentDB"""
+    def iter_reviews(self, filename: str = "reviews.json",
+                     columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream review records from the data file one at a time (only the given columns, if any)"""
+        if not output_file_exists(filename):
+            print(f"No reviews file found at {output_path(filename)}")
+            return iter(())
+        return iter_records(filename, columns)
+    
+    def seed_to_documentdb(self, reviews: Iterable[Dict[str, Any]], incremental: bool = False,
+                           blue_green: bool = False, journal: Optional[RunJournal] = None) -> bool:
+        """Seed review records to DocumentDB (blue_green loads a shadow collection and swaps it in)"""
             
         try:
-            # Clear existing reviews (for development)
-            print("Clearing existing reviews...")
-            delete_result = self.reviews_collection.delete_many({})
-            print(f"Deleted {delete_result.deleted_count} existing reviews")
+            if incremental and blue_green:
+                raise ValueError("incremental and blue_green modes cannot be combined")
+            
+            # Incremental syncs are restartable as they are, so only full loads are journaled
+            checkpoint = None
+            if journal is not None and not incremental:
+                target = self.reviews_collection.name + (SHADOW_SUFFIX if blue_green else '')
+                checkpoint = journal.checkpoint('reviews', f"documentdb:{target}", 'reviews.json')
+                if checkpoint.finished:
+                    print("Reviews were loaded in full by the run being resumed; skipping")
+                    return True
+            resuming = checkpoint is not None and checkpoint.resumed
+            if resuming:
+                print(f"Resuming review load: {checkpoint.committed_count:,} reviews already committed")
+            
+            collection = self.reviews_collection
+            if blue_green:
+                collection = create_shadow_collection(self.reviews_collection, keep_existing=resuming)
+                print(f"Seeding into shadow collection {collection.name}...")
+            elif not incremental and not resuming:
+                # Clear existing reviews (for development)
+                print("Clearing existing reviews...")
+                with instrumentation.stage('reviews', 'clear'):
+                    delete_result = self.reviews_collection.delete_many({})
+                print(f"Deleted {delete_result.deleted_count} existing reviews")
             
             # Insert new reviews
             print("Inserting new reviews...")
             
-            # Insert in batches
-            batch_size = 100
-            inserted_count = 0
-            
-            for i in range(0, len(reviews), batch_size):
-                batch = reviews[i:i + batch_size]
-                insert_result = self.reviews_collection.insert_many(batch)
-                inserted_count += len(insert_result.inserted_ids)
-                
-                print(f"Inserted {inserted_count}/{len(reviews)} reviews")
+            # Hash reviews in a process pool while writer threads send unordered byte-sized batches
+            expected_count = 0
+            
+            def counted_reviews():
+                nonlocal expected_count
+                for review in parallel_prepare(reviews, stamp_content_hash, processes=self.prep_processes):
+                    expected_count += 1
+                    if review is not None:
+                        yield review
+            
+            loader = DocumentDBBulkLoader(collection, workers=self.write_workers)
+            with instrumentation.stage('reviews', 'insert'):
+                if incremental:
+                    # Only new or changed documents are written; removed ones are deleted
+                    sync = sync_documentdb_collection(self.reviews_collection, counted_reviews(), 'reviewId', loader)
+                    sync.print_summary("Review")
+                    inserted_count = sync.written
+                elif resuming:
+                    # Upserts make replaying the batches in flight at the interruption idempotent
+                    inserted_count = loader.upsert(with_content_hash(counted_reviews()), 'reviewId', checkpoint=checkpoint)
+                else:
+                    inserted_count = loader.load(with_content_hash(counted_reviews()), checkpoint=checkpoint)
+            loader.print_stats("Review bulk load")
             
             print(f"Successfully seeded {inserted_count} reviews to DocumentDB")
             
-            # Create indexes for better performance
-            self._create_indexes()
+            # Sync indexes with the registry; a missing index fails the seed rather than going unnoticed
+            with instrumentation.stage('reviews', 'index'):
+                indexes_ok = self._create_indexes(collection)
             
             # Verify the seeding
-            actual_count = self.reviews_collection.count_documents({})
-            print(f"Verification: {actual_count} reviews found in DocumentDB collection")
+            with instrumentation.stage('reviews', 'verify'):
+                actual_count = collection.count_documents({})
+                print(f"Verification: {actual_count} reviews found in DocumentDB collection {collection.name}")
             
-            return actual_count == len(reviews)
+            if blue_green:
+                if actual_count != expected_count or not indexes_ok:
+                    print(f"❌ Shadow collection failed verification; live reviews left untouched")
+                    return False
+                promote_shadow_collection(collection, self.reviews_collection.name)
+            
+            success = actual_count == expected_count and indexes_ok
+            if success and checkpoint is not None:
+                checkpoint.finish(actual_count)
+            return success
             
         except Exception as e:
             print(f"Error seeding reviews to DocumentDB: {e}")
             return False
     
-    def _create_indexes(self):
-        """Create indexes for better query performance"""
-        try:
-            # Create indexes on commonly queried fields
-            indexes = [
-                ("productId", 1),     # Index on productId
-                ("rating", 1),        # Index on rating
-                ("sentiment", 1),     # Index on sentiment
-                ("createdAt", -1),    # Index on creation date (desc)
-                ("verified", 1),      # Index on verified status
-            ]
-            
-            for field, direction in indexes:
-                try:
-                    self.reviews_collection.create_index([(field, direction)])
-                    print(f"Created index on {field}")
-                except Exception as e:
-                    print(f"Index on {field} may already exist: {e}")
-            
-            # Create compound indexes
-            compound_indexes = [
-                [("productId", 1), ("rating", -1)],      # Product + rating (desc)
-                [("productId", 1), ("createdAt", -1)],   # Product + date (desc)
-                [("sentiment", 1), ("rating", -1)],      # Sentiment + rating
-            ]
-            
-            for compound_index in compound_indexes:
-                try:
-                    self.reviews_collection.create_index(compound_index)
-                    field_names = ", ".join([f[0] for f in compound_index])
-                    print(f"Created compound index on {field_names}")
-                except Exception as e:
-                    print(f"Compound index may already exist: {e}")
-                    
-        except Exception as e:
-            print(f"Error creating indexes: {e}")
+    def _create_indexes(self, collection=None) -> bool:
+        """Sync the collection's indexes with the declared spec in index_registry"""
+        if collection is None:
+            collection = self.reviews_collection
+        return sync_indexes(collection, REVIEW_INDEXES)
 
 def main():
     """Main function to seed review data to DocumentDB"""
@@ -120,17 +153,20 @@ def main():
         # Initialize seeder
         seeder = ReviewSeeder()
         
-        # Load review records from JSON
-        reviews = seeder.load_reviews_from_json()
-        
-        if not reviews:
+        # Review records are streamed from JSON so memory stays flat
+        if not output_file_exists("reviews.json"):
             print("No reviews found. Skipping review seeding.")
             return
         
         # Seed to DocumentDB
-        print(f"\nSeeding {len(reviews)} reviews to DocumentDB...")
-        success = seeder.seed_to_documentdb(reviews)
+        print(f"\nSeeding reviews to DocumentDB...")
+        success = seeder.seed_to_documentdb(seeder.iter_reviews())
         
+        if success:
+            # Product pages read the materialized stats, so refresh them with the reviews
+            from review_aggregates import ReviewAggregator
+            success = ReviewAggregator().refresh()
+
         if success:
             print("✅ Review seeding completed successfully!")
             print(f"🚀 Review data is now available in DocumentDB collection: reviews")
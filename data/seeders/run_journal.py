@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Run Journal for Unicorn E-Commerce Seeders
+Records which batches of every bulk load were committed, so an interrupted run can resume
+
+Each full load appends to data/output/seed_journal.jsonl (SEED_JOURNAL_FILE overrides it):
+
+  {"event": "start", "seeder": "products", "target": "documentdb:products", "source": {...}}
+  {"event": "commit", "seeder": "products", "target": "documentdb:products", "ranges": [[0, 1000]]}
+  {"event": "finish", "seeder": "products", "target": "documentdb:products", "records": 100000}
+
+Ranges are half-open positions in the stream of prepared records handed to the bulk loader,
+and a batch is committed only once every record in it was written. With --resume, a seeder
+whose journal entry matches the current source file keeps what is already in its target,
+skips the committed records and replays the rest as upserts. Batches that were in flight when
+the run stopped are therefore rewritten idempotently. A load that finished is skipped entirely.
+
+  python data/seeders/run_journal.py            # show the journaled loads
+  python data/seeders/run_journal.py --clear    # forget them; the next --resume starts over
+"""
+import argparse
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from data_loader import OUTPUT_DIR, output_path
+
+DEFAULT_JOURNAL_FILE = os.path.join(OUTPUT_DIR, 'seed_journal.jsonl')
+
+# The append-only file is rewritten with one entry per load once it grows past this
+COMPACT_BYTES = 1 << 20
+
+
+def merge_ranges(ranges: Iterable[Tuple[int, int]]) -> List[List[int]]:
+    """Merge half-open [start, end) ranges into a sorted list of disjoint ones"""
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def positions_to_ranges(positions: List[int]) -> List[List[int]]:
+    """Collapse ascending record positions into half-open ranges"""
+    ranges: List[List[int]] = []
+    for position in positions:
+        if ranges and ranges[-1][1] == position:
+            ranges[-1][1] += 1
+        else:
+            ranges.append([position, position + 1])
+    return ranges
+
+
+def source_fingerprint(filename: str) -> Dict[str, Any]:
+    """Identify a data file's current contents by name, size and modification time"""
+    stat = os.stat(output_path(filename))
+    return {'file': os.path.basename(filename), 'size': stat.st_size, 'mtimeNs': stat.st_mtime_ns}
+
+
+def _apply(loads: Dict[Tuple[str, str], Dict[str, Any]], entry: Dict[str, Any]):
+    """Update the state of the load an entry belongs to"""
+    key = (entry['seeder'], entry['target'])
+    if entry['event'] == 'start':
+        loads[key] = {'source': entry.get('source'), 'started': entry.get('time'),
+                      'ranges': [], 'finished': False, 'records': None}
+    elif key in loads and entry['event'] == 'commit':
+        loads[key]['ranges'] = merge_ranges(loads[key]['ranges'] + entry['ranges'])
+    elif key in loads and entry['event'] == 'finish':
+        loads[key].update(finished=True, records=entry.get('records'))
+
+
+class BatchCheckpoint:
+    """Progress of one seeder's load into one target, as recorded in the run journal"""
+
+    def __init__(self, journal: "RunJournal", seeder: str, target: str, ranges: List[List[int]],
+                 finished: bool = False):
+        self.journal = journal
+        self.seeder = seeder
+        self.target = target
+        self.finished = finished
+        # Ranges committed by the interrupted run; only these are skipped by this one
+        self._skip_ranges = merge_ranges(ranges)
+        self._skip_starts = [start for start, _ in self._skip_ranges]
+        self.resumed = bool(self._skip_ranges)
+
+    @property
+    def committed_count(self) -> int:
+        """Records the interrupted run had already committed"""
+        return sum(end - start for start, end in self._skip_ranges)
+
+    def is_committed(self, position: int) -> bool:
+        """True when the record at position was written by the interrupted run"""
+        i = bisect.bisect_right(self._skip_starts, position) - 1
+        return i >= 0 and position < self._skip_ranges[i][1]
+
+    def commit(self, positions: List[int]):
+        """Record that the records at these positions were written (called from writer threads)"""
+        if positions:
+            self.journal._record(self.seeder, self.target, 'commit', ranges=positions_to_ranges(positions))
+
+    def finish(self, records: int):
+        """Record that the load completed and was verified"""
+        self.journal._record(self.seeder, self.target, 'finish', records=records)
+
+
+class RunJournal:
+    """
+    Append-only journal of committed batch ranges per seeder and target.
+
+    One journal is shared by every task of a run; writer threads append to it concurrently.
+    """
+
+    def __init__(self, path: Optional[str] = None, resume: bool = False):
+        self.path = path or DEFAULT_JOURNAL_FILE
+        self.resume = resume
+        self._lock = threading.Lock()
+        self._loads = self._read()
+        if os.path.exists(self.path) and os.path.getsize(self.path) > COMPACT_BYTES:
+            self._compact()
+
+    @classmethod
+    def from_environment(cls, resume: bool = False) -> "RunJournal":
+        """Create a journal at SEED_JOURNAL_FILE, or data/output/seed_journal.jsonl"""
+        return cls(os.environ.get('SEED_JOURNAL_FILE'), resume=resume)
+
+    def _read(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Replay the journal file into the latest state of every load"""
+        loads: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        if not os.path.exists(self.path):
+            return loads
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short when the process was killed
+                _apply(loads, entry)
+        return loads
+
+    def _compact(self):
+        """Rewrite the file with one start, commit and finish entry per load"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for (seeder, target), load in self._loads.items():
+                base = {'seeder': seeder, 'target': target}
+                f.write(json.dumps(dict(base, event='start', source=load['source'], time=load['started'])) + '\n')
+                if load['ranges']:
+                    f.write(json.dumps(dict(base, event='commit', ranges=load['ranges'])) + '\n')
+                if load['finished']:
+                    f.write(json.dumps(dict(base, event='finish', records=load['records'])) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def _record(self, seeder: str, target: str, event: str, **fields):
+        """Append one entry and apply it to the in-memory state"""
+        entry = dict(event=event, seeder=seeder, target=target, **fields)
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+                f.flush()
+            _apply(self._loads, entry)
+
+    def checkpoint(self, seeder: str, target: str, source: str) -> BatchCheckpoint:
+        """
+        Return the checkpoint for loading source (a data file) into target.
+
+        When resuming and the journal has this load for the same source contents, the
+        checkpoint carries its committed ranges; otherwise a new load is started.
+        """
+        fingerprint = source_fingerprint(source)
+        load = self._loads.get((seeder, target))
+        if self.resume and load is not None:
+            if load['source'] == fingerprint:
+                return BatchCheckpoint(self, seeder, target, load['ranges'], finished=load['finished'])
+            print(f"⚠️  {source} changed since the interrupted {seeder} run; starting {target} over")
+        self._record(seeder, target, 'start', source=fingerprint, time=time.time())
+        return BatchCheckpoint(self, seeder, target, [])
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Summarize every journaled load"""
+        return [{'seeder': seeder, 'target': target, 'source': load['source'],
+                 'committed': sum(end - start for start, end in load['ranges']),
+                 'finished': load['finished'], 'records': load['records']}
+                for (seeder, target), load in self._loads.items()]
+
+    def clear(self):
+        """Forget every load, so the next --resume starts from scratch"""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._loads = {}
+
+
+def main():
+    """Show or clear the run journal"""
+    parser = argparse.ArgumentParser(description='Show or clear the seeding run journal')
+    parser.add_argument('--clear', action='store_true', help='Delete the journal')
+    args = parser.parse_args()
+
+    journal = RunJournal.from_environment()
+    if args.clear:
+        journal.clear()
+        print(f"✅ Cleared run journal {journal.path}")
+        return True
+
+    loads = journal.status()
+    if not loads:
+        print(f"No journaled loads in {journal.path}")
+        return True
+    print(f"{'Seeder':<18}{'Target':<44}{'Committed':>11}  Status")
+    for load in loads:
+        status = f"finished ({load['records']:,} records)" if load['finished'] else 'interrupted'
+        print(f"{load['seeder']:<18}{load['target']:<44}{load['committed']:>11,}  {status}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -7,16 +7,34 @@ import os
 import sys
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 
 # Import common database connections
-from database_connections import get_dynamodb_table, prepare_for_dynamodb
+from database_connections import get_dynamodb_table
+from converters import prepare_search_analytics_item
+from data_loader import iter_records, output_file_exists, output_path
+from dynamodb_bulk import DynamoDBBulkLoader, count_items, truncate_table
+from incremental import stamp_content_hash, sync_dynamodb_table, with_content_hash
+from prep_pool import parallel_prepare
+from instrumentation import instrumentation
+from run_journal import RunJournal
+
+
+def prepare_search_analytics_for_load(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert and hash one search analytics record (runs in a preparation worker process)"""
+    return stamp_content_hash(prepare_search_analytics_item(record))
+
 
 class SearchAnalyticsSeeder:
     """Seed search analytics data to DynamoDB"""
     
-    def __init__(self):
+    def __init__(self, truncate_segments: int = 8, write_workers: int = 4,
+                 prep_processes: Optional[int] = None):
         self.search_analytics_table = get_dynamodb_table('SEARCH_ANALYTICS_TABLE')
+        self.truncate_segments = truncate_segments
+        self.write_workers = write_workers
+        # Processes converting records while the writer threads wait on the network (None: all cores)
+        self.prep_processes = prep_processes
     
     def load_search_analytics_from_json(self, filename: str = "search_behaviors.json") -> List[Dict[str, Any]]:
         """Load search analytics records from JSON file"""
@@ -36,50 +54,77 @@ class SearchAnalyticsSeeder:
             print(f"Error loading search analytics from JSON: {e}")
             return []
     
-    def seed_to_dynamodb(self, search_data: List[Dict[str, Any]]) -> bool:
-        """Seed search analytics records to DynamoDB"""
+    def iter_search_analytics(self, filename: str = "search_behaviors.json",
+                              columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream search analytics records from the data file one at a time (only the given columns, if any)"""
+        if not output_file_exists(filename):
+            print(f"No search analytics file found at {output_path(filename)}")
+            return iter(())
+        return iter_records(filename, columns)
+    
+    def seed_to_dynamodb(self, search_data: Iterable[Dict[str, Any]], incremental: bool = False,
+                         journal: Optional[RunJournal] = None) -> bool:
+        """Seed search analytics records to DynamoDB; journaled full loads can be resumed"""
         try:
             table = self.search_analytics_table
             
-            # Clear existing search analytics (for development)
-            print("Clearing existing search analytics records...")
-            scan_response = table.scan()
-            deleted_count = 0
-            
-            with table.batch_writer() as batch:
-                for item in scan_response['Items']:
-                    # Assuming the table has a composite key or single key
-                    # Adjust the key structure based on your table design
-                    if 'searchTerm' in item:
-                        batch.delete_item(Key={'searchTerm': item['searchTerm']})
-                    elif 'id' in item:
-                        batch.delete_item(Key={'id': item['id']})
-                    deleted_count += 1
-            
-            print(f"Deleted {deleted_count} existing search analytics records")
+            # Incremental syncs are restartable as they are, so only full loads are journaled
+            checkpoint = None
+            if journal is not None and not incremental:
+                checkpoint = journal.checkpoint('search_analytics', f"dynamodb:{table.name}", 'search_behaviors.json')
+                if checkpoint.finished:
+                    print("Search analytics records were loaded in full by the run being resumed; skipping")
+                    return True
+            resuming = checkpoint is not None and checkpoint.resumed
+            if resuming:
+                # Puts overwrite, so the batches in flight at the interruption are simply replayed
+                print(f"Resuming search analytics load: {checkpoint.committed_count:,} records already committed")
+            elif not incremental:
+                # Clear existing search analytics (for development)
+                print("Clearing existing search analytics records...")
+                with instrumentation.stage('search_analytics', 'clear'):
+                    deleted_count = truncate_table(table, segments=self.truncate_segments)
+                
+                print(f"Deleted {deleted_count} existing search analytics records")
             
             # Insert new search analytics records
             print("Inserting new search analytics records...")
-            inserted_count = 0
+            # Convert in a process pool while several threads write with batch_write_item and
+            # UnprocessedItems backoff
+            record_count = 0
             
-            with table.batch_writer() as batch:
-                for record in search_data:
-                    # Prepare record for DynamoDB
-                    dynamodb_record = prepare_for_dynamodb(record)
-                    batch.put_item(Item=dynamodb_record)
-                    inserted_count += 1
-                    
-                    if inserted_count % 25 == 0:  # DynamoDB batch limit is 25
-                        print(f"Inserted {inserted_count}/{len(search_data)} search analytics records")
+            def prepared_records():
+                nonlocal record_count
+                prepared = parallel_prepare(search_data, prepare_search_analytics_for_load,
+                                            processes=self.prep_processes)
+                for record in prepared:
+                    record_count += 1
+                    # Failed records are reported by the worker and show up in the count check
+                    if record is not None:
+                        yield record
+            
+            loader = DynamoDBBulkLoader(table.name, workers=self.write_workers)
+            with instrumentation.stage('search_analytics', 'insert'):
+                if incremental:
+                    # Only new or changed records are written; removed ones are deleted
+                    sync = sync_dynamodb_table(table, prepared_records(), loader, segments=self.truncate_segments)
+                    sync.print_summary("Search analytics")
+                    inserted_count = sync.written
+                else:
+                    inserted_count = loader.load(with_content_hash(prepared_records()), checkpoint=checkpoint)
+            loader.print_stats("Search analytics bulk load")
             
             print(f"Successfully seeded {inserted_count} search analytics records to DynamoDB")
             
             # Verify the seeding
-            verify_response = table.scan(Select='COUNT')
-            actual_count = verify_response['Count']
-            print(f"Verification: {actual_count} records found in DynamoDB table")
+            with instrumentation.stage('search_analytics', 'verify'):
+                actual_count = count_items(table)
+                print(f"Verification: {actual_count} records found in DynamoDB table")
             
-            return actual_count == len(search_data)
+            success = actual_count == record_count
+            if success and checkpoint is not None:
+                checkpoint.finish(actual_count)
+            return success
             
         except Exception as e:
             print(f"Error seeding search analytics to DynamoDB: {e}")
@@ -97,16 +142,14 @@ def main():
         # Initialize seeder
         seeder = SearchAnalyticsSeeder()
         
-        # Load search analytics records from JSON
-        search_data = seeder.load_search_analytics_from_json()
-        
-        if not search_data:
+        # Search analytics records are streamed from JSON so memory stays flat
+        if not output_file_exists("search_behaviors.json"):
             print("No search analytics data found. Skipping search analytics seeding.")
             return
         
         # Seed to DynamoDB
         print(f"\nSeeding search analytics data to DynamoDB...")
-        success = seeder.seed_to_dynamodb(search_data)
+        success = seeder.seed_to_dynamodb(seeder.iter_search_analytics())
         
         if success:
             print("✅ Search analytics seeding completed successfully!")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Secrets Cache for Unicorn E-Commerce Seeders
+Keeps Secrets Manager values in memory for a TTL and, optionally, in an encrypted local file
+
+Every seeder process (and every Lambda cold start) used to call Secrets Manager again. With
+the file cache enabled, the first process stores the secret encrypted with Fernet and later
+processes read it back until the TTL runs out:
+
+  export SEED_SECRETS_CACHE_KEY=$(python data/seeders/secrets_cache.py --generate-key)
+  export SEED_SECRETS_CACHE_FILE=~/.cache/unicorn-seeders/secrets.bin
+  export SEED_SECRETS_TTL=900   # seconds (default)
+
+The file cache needs the cryptography package and is skipped, with a warning, without it.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# cryptography is imported only when the file cache is enabled
+CRYPTOGRAPHY_AVAILABLE = importlib.util.find_spec('cryptography') is not None
+
+DEFAULT_TTL_SECONDS = 900
+
+
+class SecretsCache:
+    """Thread-safe TTL cache for secret values, with an optional encrypted file behind it"""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, cache_file: Optional[str] = None,
+                 key: Optional[str] = None):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._fernet = None
+        self.cache_file = None
+
+        if cache_file:
+            if not CRYPTOGRAPHY_AVAILABLE:
+                print("⚠️  SEED_SECRETS_CACHE_FILE is set but cryptography is not installed; "
+                      "secrets are cached in memory only. Install with: pip install cryptography")
+            elif not key:
+                print("⚠️  SEED_SECRETS_CACHE_FILE is set without SEED_SECRETS_CACHE_KEY; "
+                      "secrets are cached in memory only")
+            else:
+                from cryptography.fernet import Fernet
+                self._fernet = Fernet(key.encode() if isinstance(key, str) else key)
+                self.cache_file = os.path.expanduser(cache_file)
+
+    @classmethod
+    def from_environment(cls) -> 'SecretsCache':
+        """Build a cache configured by SEED_SECRETS_TTL, SEED_SECRETS_CACHE_FILE and SEED_SECRETS_CACHE_KEY"""
+        return cls(ttl_seconds=float(os.environ.get('SEED_SECRETS_TTL', DEFAULT_TTL_SECONDS)),
+                   cache_file=os.environ.get('SEED_SECRETS_CACHE_FILE'),
+                   key=os.environ.get('SEED_SECRETS_CACHE_KEY'))
+
+    def get(self, secret_id: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Return the cached value of secret_id, calling fetch() only when it is missing or expired.
+
+        Exceptions from fetch() propagate and nothing is cached, so a failed lookup is retried
+        on the next call.
+        """
+        with self._lock:
+            now = time.time()
+            entry = self._entries.get(secret_id)
+            if entry is None and self._fernet is not None:
+                entry = self._read_file().get(secret_id)
+                if entry is not None:
+                    self._entries[secret_id] = entry
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+            value = fetch()
+            entry = (now + self.ttl_seconds, value)
+            self._entries[secret_id] = entry
+            if self._fernet is not None:
+                self._write_file(secret_id, entry)
+            return value
+
+    def invalidate(self, secret_id: Optional[str] = None):
+        """Forget one secret (e.g. after an authentication failure), or all of them"""
+        with self._lock:
+            if secret_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(secret_id, None)
+            if self._fernet is not None:
+                entries = {} if secret_id is None else self._read_file()
+                entries.pop(secret_id, None)
+                self._store_file(entries)
+
+    def _read_file(self) -> Dict[str, Tuple[float, Any]]:
+        """Decrypt the cache file; a missing, corrupt or foreign file reads as empty"""
+        from cryptography.fernet import InvalidToken
+        try:
+            with open(self.cache_file, 'rb') as f:
+                payload = json.loads(self._fernet.decrypt(f.read()))
+        except (OSError, ValueError, InvalidToken):
+            return {}
+        now = time.time()
+        return {secret_id: (expires_at, value) for secret_id, (expires_at, value) in payload.items()
+                if expires_at > now}
+
+    def _write_file(self, secret_id: str, entry: Tuple[float, Any]):
+        entries = self._read_file()
+        entries[secret_id] = entry
+        self._store_file(entries)
+
+    def _store_file(self, entries: Dict[str, Tuple[float, Any]]):
+        """Encrypt entries to the cache file, readable by the owner only"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+            tmp_path = f"{self.cache_file}.{os.getpid()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._fernet.encrypt(json.dumps(entries).encode('utf-8')))
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            print(f"⚠️  Could not write secrets cache {self.cache_file}: {e}")
+
+
+def main():
+    """Generate a cache key or clear the cache file"""
+    parser = argparse.ArgumentParser(description='Manage the encrypted seeder secrets cache')
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--generate-key', action='store_true', help='Print a new SEED_SECRETS_CACHE_KEY')
+    action.add_argument('--clear', action='store_true', help='Delete the SEED_SECRETS_CACHE_FILE')
+    args = parser.parse_args()
+
+    if args.generate_key:
+        if not CRYPTOGRAPHY_AVAILABLE:
+            print("ERROR: cryptography is required to generate a key. Install with: pip install cryptography")
+            return False
+        from cryptography.fernet import Fernet
+        print(Fernet.generate_key().decode())
+        return True
+
+    cache_file = os.environ.get('SEED_SECRETS_CACHE_FILE')
+    if not cache_file:
+        print("SEED_SECRETS_CACHE_FILE is not set; nothing to clear")
+        return True
+    try:
+        os.remove(os.path.expanduser(cache_file))
+        print(f"✅ Removed {cache_file}")
+    except FileNotFoundError:
+        print(f"No secrets cache at {cache_file}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
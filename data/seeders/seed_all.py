@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Seeding Orchestrator for Unicorn E-Commerce
+Runs all seeders as a dependency DAG over one shared set of database connections
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Callable, List, Optional
+
+# Import common database connections
+from database_connections import close_all_connections, set_pool_profile
+from autocomplete import add_autocomplete_arguments, autocomplete_options
+from data_loader import output_file_exists
+from instrumentation import enable_instrumentation, instrumentation
+from pool_profiles import POOL_PROFILES
+from run_journal import RunJournal
+
+
+class SeedTask:
+    """A single seeding step in the orchestration DAG"""
+
+    def __init__(self, name: str, store: str, run: Callable[[argparse.Namespace], bool],
+                 depends_on: Optional[List[str]] = None, required: bool = False):
+        self.name = name
+        self.store = store
+        self.run = run
+        self.depends_on = depends_on or []
+        self.required = required
+        self.status = 'pending'
+        self.elapsed = 0.0
+        self.error = None
+
+
+def seed_products(args: argparse.Namespace) -> bool:
+    """Seed products to DocumentDB"""
+    if not output_file_exists('products.json'):
+        print("No products found. Please run product_generator.py first.")
+        return False
+
+    from product_seeder import ProductSeeder
+
+    seeder = ProductSeeder(prep_processes=args.prep_processes)
+    with instrumentation.stage('products', 'load'):
+        valid = seeder.validate_product_data(seeder.iter_products(columns=seeder.VALIDATION_FIELDS))
+    if not valid:
+        if not args.force:
+            print("Product data validation failed (use --force to seed anyway)")
+            return False
+        print("Warning: Product data validation failed - continuing because --force is set")
+
+    if not seeder.seed_to_documentdb(seeder.iter_products(), incremental=args.incremental,
+                                     blue_green=args.blue_green, journal=args.journal):
+        return False
+    seeder.print_seeding_summary(seeder.iter_products(columns=seeder.SUMMARY_FIELDS))
+    return True
+
+
+def seed_inventory(args: argparse.Namespace) -> bool:
+    """Seed inventory to DynamoDB"""
+    if not output_file_exists('inventory.json'):
+        print("No inventory records found. Please run inventory_generator.py first.")
+        return False
+
+    from inventory_seeder import InventorySeeder
+
+    seeder = InventorySeeder(prep_processes=args.prep_processes)
+    with instrumentation.stage('inventory', 'load'):
+        seeder.validate_inventory_product_correlation(seeder.iter_inventory(columns=seeder.VALIDATION_FIELDS))
+
+    if not seeder.seed_to_dynamodb(seeder.iter_inventory(), incremental=args.incremental, journal=args.journal):
+        return False
+    seeder.print_seeding_summary(seeder.iter_inventory(columns=seeder.SUMMARY_FIELDS))
+    return True
+
+
+def seed_reviews(args: argparse.Namespace) -> bool:
+    """Seed reviews to DocumentDB (skipped when reviews.json is absent)"""
+    if not output_file_exists('reviews.json'):
+        print("No reviews.json found. Skipping review seeding.")
+        return True
+
+    from review_seeder import ReviewSeeder
+
+    seeder = ReviewSeeder(prep_processes=args.prep_processes)
+    return seeder.seed_to_documentdb(seeder.iter_reviews(), incremental=args.incremental,
+                                     blue_green=args.blue_green, journal=args.journal)
+
+
+def seed_review_stats(args: argparse.Namespace) -> bool:
+    """Materialize per-product review stats into products and review_stats (skipped when reviews.json is absent)"""
+    if not output_file_exists('reviews.json'):
+        print("No reviews.json found. Skipping review aggregation.")
+        return True
+
+    from review_aggregates import ReviewAggregator
+
+    return ReviewAggregator().refresh()
+
+
+def seed_knowledge_base(args: argparse.Namespace) -> bool:
+    """Seed knowledge base articles to DocumentDB"""
+    if not output_file_exists('knowledge_base.json'):
+        print("No knowledge_base.json found. Skipping knowledge base seeding.")
+        return True
+
+    from knowledge_base_seeder import KnowledgeBaseSeeder
+
+    seeder = KnowledgeBaseSeeder(prep_processes=args.prep_processes)
+    return seeder.seed_to_documentdb(seeder.iter_knowledge_base(), incremental=args.incremental,
+                                     blue_green=args.blue_green, journal=args.journal)
+
+
+def seed_search_analytics(args: argparse.Namespace) -> bool:
+    """Seed search behaviors to DynamoDB"""
+    if not output_file_exists('search_behaviors.json'):
+        print("No search_behaviors.json found. Skipping search analytics seeding.")
+        return True
+
+    from search_analytics_seeder import SearchAnalyticsSeeder
+
+    seeder = SearchAnalyticsSeeder(prep_processes=args.prep_processes)
+    return seeder.seed_to_dynamodb(seeder.iter_search_analytics(), incremental=args.incremental,
+                                   journal=args.journal)
+
+
+def seed_elasticache(args: argparse.Namespace) -> bool:
+    """Seed popular search terms and behaviors to ElastiCache"""
+    if not output_file_exists('popular_search_terms.json'):
+        print("No popular_search_terms.json found. Skipping ElastiCache seeding.")
+        return True
+
+    from elasticache_seeder import ElastiCacheSeeder
+
+    seeder = ElastiCacheSeeder(**autocomplete_options(args))
+    if not seeder.seed_popular_terms_to_cache(seeder.iter_popular_terms()):
+        return False
+    with instrumentation.stage('elasticache', 'insert'):
+        behaviors_ok = seeder.seed_search_behaviors_to_cache()
+    if not behaviors_ok:
+        print("⚠️  Failed to seed search behaviors to ElastiCache (non-critical)")
+    with instrumentation.stage('elasticache', 'verify'):
+        return seeder.verify_cache_data()
+
+
+def build_tasks() -> List[SeedTask]:
+    """Build the seeding DAG in topological order"""
+    return [
+        SeedTask('products', 'documentdb', seed_products, required=True),
+        SeedTask('inventory', 'dynamodb', seed_inventory, required=True),
+        SeedTask('elasticache', 'elasticache', seed_elasticache),
+        SeedTask('reviews', 'documentdb', seed_reviews, depends_on=['products']),
+        # Writes back into products, so it also waits for them when reviews are skipped
+        SeedTask('review_stats', 'documentdb', seed_review_stats, depends_on=['products', 'reviews']),
+        SeedTask('knowledge_base', 'documentdb', seed_knowledge_base),
+        SeedTask('search_analytics', 'dynamodb', seed_search_analytics),
+    ]
+
+
+def select_tasks(tasks: List[SeedTask], only: Optional[List[str]], skip: Optional[List[str]]) -> List[SeedTask]:
+    """Apply --only/--skip selection, rejecting unknown task names"""
+    known = {task.name for task in tasks}
+    unknown = set(only or []) | set(skip or [])
+    unknown -= known
+    if unknown:
+        raise ValueError(f"Unknown task(s): {', '.join(sorted(unknown))}. Available: {', '.join(sorted(known))}")
+
+    selected = [task for task in tasks if not only or task.name in only]
+    return [task for task in selected if task.name not in (skip or [])]
+
+
+class SeedOrchestrator:
+    """Run seeding tasks concurrently across stores while respecting dependencies"""
+
+    def __init__(self, tasks: List[SeedTask], args: argparse.Namespace, max_per_store: int = 1):
+        self.tasks = {task.name: task for task in tasks}
+        self.args = args
+        self.max_per_store = max_per_store
+        # Tasks on the same store share a semaphore so they don't compete for the same cluster
+        self.store_locks = {}
+        for task in tasks:
+            self.store_locks.setdefault(task.store, threading.Semaphore(max_per_store))
+
+    def _run_task(self, task: SeedTask) -> bool:
+        """Execute one task under its store semaphore and record wall-clock time"""
+        with self.store_locks[task.store]:
+            print(f"\n▶️  Starting task: {task.name} ({task.store})")
+            start = time.perf_counter()
+            try:
+                return bool(task.run(self.args))
+            except SystemExit as e:
+                # Connection helpers exit the process on fatal errors; contain that to the task
+                task.error = f"exited with status {e.code}"
+                return False
+            except Exception as e:
+                task.error = str(e)
+                return False
+            finally:
+                task.elapsed = time.perf_counter() - start
+                instrumentation.record_stage('total', task.elapsed, scope=task.name)
+
+    def _ready(self, task: SeedTask) -> bool:
+        """A task is ready once every selected dependency has finished"""
+        return all(self.tasks[dep].status not in ('pending', 'running')
+                   for dep in task.depends_on if dep in self.tasks)
+
+    def _blocked(self, task: SeedTask) -> bool:
+        """A task is blocked when a selected dependency did not succeed"""
+        return any(self.tasks[dep].status != 'succeeded'
+                   for dep in task.depends_on if dep in self.tasks)
+
+    def run(self) -> bool:
+        """Run all tasks and return False if any required task did not succeed"""
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=max(len(self.tasks), 1)) as executor:
+            while True:
+                for task in self.tasks.values():
+                    if task.status != 'pending' or not self._ready(task):
+                        continue
+                    if self._blocked(task):
+                        task.status = 'skipped'
+                        task.error = 'dependency did not succeed'
+                        continue
+                    task.status = 'running'
+                    running[executor.submit(self._run_task, task)] = task
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    task.status = 'succeeded' if future.result() else 'failed'
+                    print(f"⏹️  Finished task: {task.name} - {task.status} in {task.elapsed:.2f}s")
+
+        return all(task.status == 'succeeded' for task in self.tasks.values() if task.required)
+
+    async def run_async(self) -> bool:
+        """Run every task's async write path on one event loop, respecting dependencies"""
+        import asyncio
+        from async_seeders import ASYNC_SEED_TASKS
+
+        finished = {name: asyncio.Event() for name in self.tasks}
+        store_locks = {store: asyncio.Semaphore(self.max_per_store) for store in self.store_locks}
+
+        async def run_task(task: SeedTask):
+            try:
+                for dep in task.depends_on:
+                    if dep in finished:
+                        await finished[dep].wait()
+                if self._blocked(task):
+                    task.status = 'skipped'
+                    task.error = 'dependency did not succeed'
+                    return
+
+                task.status = 'running'
+                async with store_locks[task.store]:
+                    print(f"\n▶️  Starting task: {task.name} ({task.store}, async)")
+                    start = time.perf_counter()
+                    try:
+                        succeeded = bool(await ASYNC_SEED_TASKS[task.name](self.args))
+                    except SystemExit as e:
+                        task.error = f"exited with status {e.code}"
+                        succeeded = False
+                    except Exception as e:
+                        task.error = str(e)
+                        succeeded = False
+                    finally:
+                        task.elapsed = time.perf_counter() - start
+                        instrumentation.record_stage('total', task.elapsed, scope=task.name)
+                task.status = 'succeeded' if succeeded else 'failed'
+                print(f"⏹️  Finished task: {task.name} - {task.status} in {task.elapsed:.2f}s")
+            finally:
+                finished[task.name].set()
+
+        await asyncio.gather(*(run_task(task) for task in self.tasks.values()))
+        return all(task.status == 'succeeded' for task in self.tasks.values() if task.required)
+
+    def print_report(self, wall_time: float):
+        """Print per-task wall-clock times and overall speedup"""
+        print(f"\n📊 Seeding Report")
+        print(f"{'='*60}")
+        print(f"{'Task':<20}{'Store':<14}{'Status':<12}{'Time (s)':>10}")
+        for task in self.tasks.values():
+            print(f"{task.name:<20}{task.store:<14}{task.status:<12}{task.elapsed:>10.2f}")
+            if task.error:
+                print(f"{'':<20}↳ {task.error}")
+
+        serial_time = sum(task.elapsed for task in self.tasks.values())
+        print(f"{'-'*60}")
+        print(f"Sum of task times: {serial_time:.2f}s")
+        print(f"Wall-clock time:   {wall_time:.2f}s")
+        if wall_time > 0:
+            print(f"Concurrency speedup: {serial_time / wall_time:.2f}x")
+
+        pool_waits = {store: stats['poolWait'] for store, stats in instrumentation.to_dict()['stores'].items()
+                      if 'poolWait' in stats}
+        if pool_waits:
+            print(f"{'-'*60}")
+            print(f"{'Pool wait':<20}{'Checkouts':>12}{'Total (s)':>12}{'Max (ms)':>12}")
+            for store, wait in pool_waits.items():
+                print(f"{store:<20}{wait['checkouts']:>12,}{wait['sumSeconds']:>12.3f}{wait['maxSeconds'] * 1000:>12.1f}")
+
+
+async def run_async_orchestrator(orchestrator: SeedOrchestrator) -> bool:
+    """Run the async tasks and close the async clients on the same event loop"""
+    from async_connections import close_all_async_connections
+
+    try:
+        return await orchestrator.run_async()
+    finally:
+        await close_all_async_connections()
+
+
+def main():
+    """Main function to seed all databases from one process"""
+    parser = argparse.ArgumentParser(description='Seed all Unicorn E-Commerce databases concurrently')
+    parser.add_argument('--only', nargs='+', metavar='TASK',
+                        help='Run only these tasks')
+    parser.add_argument('--skip', nargs='+', metavar='TASK',
+                        help='Skip these tasks')
+    parser.add_argument('--max-per-store', type=int, default=1,
+                        help='Maximum concurrent tasks against the same store (default: 1)')
+    parser.add_argument('--force', '-f', action='store_true',
+                        help='Seed products even when validation fails (non-interactive mode)')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true',
+                      help='Write only new or changed records and delete removed ones, using stored content hashes')
+    mode.add_argument('--blue-green', action='store_true',
+                      help='Load DocumentDB collections into shadow collections and swap them in once verified')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted full reseed from the run journal, skipping committed batches')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Write from one asyncio event loop instead of writer threads (full reseeds only)')
+    parser.add_argument('--concurrency', type=int, default=32,
+                        help='Batches in flight per store with --async (default: 32)')
+    parser.add_argument('--prep-processes', type=int,
+                        help='Processes preparing records for each seeding task (default: one per CPU core)')
+    parser.add_argument('--pool-profile', choices=sorted(POOL_PROFILES),
+                        help='Connection pool settings for every store (default: SEED_POOL_PROFILE, or interactive; '
+                             'lambda inside AWS Lambda)')
+    add_autocomplete_arguments(parser)
+    parser.add_argument('--metrics-json', metavar='PATH',
+                        help='Record round trips, latency, bytes, retries and stage times and write them as JSON')
+    parser.add_argument('--metrics-prom', metavar='PATH',
+                        help='Write the same metrics as a Prometheus textfile')
+    parser.add_argument('--list', action='store_true',
+                        help='List available tasks and exit')
+    args = parser.parse_args()
+
+    tasks = build_tasks()
+    if args.list:
+        for task in tasks:
+            deps = f" (after: {', '.join(task.depends_on)})" if task.depends_on else ""
+            print(f"{task.name:<20}{task.store}{deps}")
+        return True
+
+    try:
+        tasks = select_tasks(tasks, args.only, args.skip)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+
+    if args.use_async and (args.incremental or args.blue_green):
+        print("❌ --async only supports full reseeds; drop --incremental/--blue-green or --async")
+        return False
+    if args.resume and (args.incremental or args.use_async):
+        print("❌ --resume continues threaded full reseeds; incremental runs can simply be rerun")
+        return False
+
+    print("🦄 Unicorn E-Commerce Seeding Orchestrator")
+    print("=" * 60)
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Tasks: {', '.join(task.name for task in tasks)}")
+
+    if args.pool_profile:
+        set_pool_profile(args.pool_profile)
+    if args.metrics_json or args.metrics_prom:
+        # Hooks are attached as connections open, so this must happen before any task runs
+        enable_instrumentation()
+    # Every threaded full load records its committed batches, so any run can be resumed later
+    args.journal = RunJournal.from_environment(resume=args.resume)
+    if args.resume:
+        print(f"Resuming from run journal: {args.journal.path}")
+
+    orchestrator = SeedOrchestrator(tasks, args, max_per_store=args.max_per_store)
+    start = time.perf_counter()
+    try:
+        if args.use_async:
+            # Imported here so thread-mode runs skip asyncio's import cost
+            import asyncio
+            success = asyncio.run(run_async_orchestrator(orchestrator))
+        else:
+            success = orchestrator.run()
+    finally:
+        orchestrator.print_report(time.perf_counter() - start)
+        close_all_connections()
+        if args.metrics_json:
+            instrumentation.write_json(args.metrics_json)
+            print(f"📝 Metrics written to {args.metrics_json}")
+        if args.metrics_prom:
+            instrumentation.write_prometheus(args.metrics_prom)
+            print(f"📝 Prometheus metrics written to {args.metrics_prom}")
+
+    if success:
+        print("\n✅ Database seeding completed successfully!")
+    else:
+        print("\n❌ One or more required seeding tasks failed")
+    return success
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Seeder Benchmark Suite for Unicorn E-Commerce
+Runs every seed_all.py task against local stand-ins at multiples of the shipped data volume
+
+Start the stand-ins first, e.g.:
+  docker run -d -p 27017:27017 mongo:5.0
+  docker run -d -p 8000:8000 amazon/dynamodb-local
+  docker run -d -p 6379:6379 redis:7
+
+Each stage (one task at one scale) records wall time, records/sec, round trips per store and
+peak memory. Results are written to a JSON file and compared against a saved baseline; the
+run fails when a stage's throughput drops, or its memory or round trips grow, by more than
+--tolerance. Scaled datasets are written by dataset_scaler.py to a temporary directory per
+scale. Stand-in data lives in a scratch database, tables and the seeders' own Redis key
+patterns, all removed after the run. MongoDB cannot build DocumentDB-only indexes such as
+the products vector index, so those are skipped and listed in the stage's skipped_indexes.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List
+
+import data_loader
+from autocomplete import add_autocomplete_arguments
+from dataset_scaler import DatasetScaler
+from instrumentation import enable_instrumentation, instrumentation
+
+SCRATCH_NAME = 'seeder-benchmark'
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'benchmarks')
+
+# seed_all.py task -> data file whose record count is the stage's throughput denominator
+TASK_FILES = {
+    'products': 'products.json',
+    'inventory': 'inventory.json',
+    'elasticache': 'popular_search_terms.json',
+    'reviews': 'reviews.json',
+    'review_stats': 'reviews.json',
+    'knowledge_base': 'knowledge_base.json',
+    'search_analytics': 'search_behaviors.json',
+}
+
+# Stand-in DynamoDB tables, keyed like the CloudFormation template
+BENCHMARK_TABLES = {
+    'INVENTORY_TABLE': {
+        'TableName': f"{SCRATCH_NAME}-inventory",
+        'KeySchema': [{'AttributeName': 'productId', 'KeyType': 'HASH'}],
+        'AttributeDefinitions': [{'AttributeName': 'productId', 'AttributeType': 'S'}],
+    },
+    'SEARCH_ANALYTICS_TABLE': {
+        'TableName': f"{SCRATCH_NAME}-search-analytics",
+        'KeySchema': [{'AttributeName': 'searchId', 'KeyType': 'HASH'}],
+        'AttributeDefinitions': [
+            {'AttributeName': 'searchId', 'AttributeType': 'S'},
+            {'AttributeName': 'userId', 'AttributeType': 'S'},
+            {'AttributeName': 'timestamp', 'AttributeType': 'N'},
+            {'AttributeName': 'searchTerm', 'AttributeType': 'S'},
+        ],
+        'GlobalSecondaryIndexes': [
+            {'IndexName': 'UserSearchIndex',
+             'KeySchema': [{'AttributeName': 'userId', 'KeyType': 'HASH'},
+                           {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}],
+             'Projection': {'ProjectionType': 'ALL'}},
+            {'IndexName': 'SearchTermIndex',
+             'KeySchema': [{'AttributeName': 'searchTerm', 'KeyType': 'HASH'},
+                           {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}],
+             'Projection': {'ProjectionType': 'ALL'}},
+        ],
+    },
+}
+
+# Stage metrics checked against the baseline: metric -> True when higher is better
+COMPARED_METRICS = {
+    'records_per_second': True,
+    'peak_memory_mb': False,
+    'total_round_trips': False,
+}
+
+
+def connect_stand_ins(args: argparse.Namespace):
+    """Point the shared db_connections at instrumented clients for the local stand-ins"""
+    # DynamoDB Local accepts any credentials; the table names come from the usual variables
+    os.environ['AWS_ENDPOINT_URL_DYNAMODB'] = args.dynamodb_endpoint
+    os.environ.setdefault('AWS_REGION', 'us-east-1')
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'local')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'local')
+    for env_var, definition in BENCHMARK_TABLES.items():
+        os.environ[env_var] = definition['TableName']
+
+    import boto3
+    import redis
+    from pymongo import MongoClient
+    from database_connections import db_connections
+    from index_registry import STAND_IN_ENV_VAR
+
+    # mongo:5.0 rejects DocumentDB-only indexes (the products vector index), so they are skipped
+    os.environ[STAND_IN_ENV_VAR] = '1'
+
+    db_connections.documentdb_client = MongoClient(args.mongo_uri, event_listeners=[instrumentation.mongo_listener()])
+    db_connections.documentdb_db = db_connections.documentdb_client[SCRATCH_NAME]
+
+    # Hooks registered before any client is created apply to every client the seeders make
+    session = instrumentation.instrument_boto3_session(boto3.session.Session(region_name=os.environ['AWS_REGION']))
+    db_connections.boto3_session = session
+    db_connections.dynamodb_resource = session.resource('dynamodb')
+
+    db_connections.elasticache_client = redis.Redis.from_url(
+        args.redis_url, decode_responses=True, connection_class=instrumentation.redis_connection_class(redis.Connection))
+    return db_connections
+
+
+def reset_stand_ins(connections):
+    """Empty the scratch database, tables and cache keys between scales (not timed)"""
+    from elasticache_seeder import SEARCH_CACHE_PATTERNS
+    from redis_bulk import purge_namespace
+
+    connections.documentdb_client.drop_database(SCRATCH_NAME)
+    purge_namespace(connections.elasticache_client, SEARCH_CACHE_PATTERNS)
+
+    client = connections.boto3_session.client('dynamodb')
+    for definition in BENCHMARK_TABLES.values():
+        drop_table(client, definition['TableName'])
+        client.create_table(BillingMode='PAY_PER_REQUEST', **definition)
+        client.get_waiter('table_exists').wait(TableName=definition['TableName'])
+        connections.forget_dynamodb_table(definition['TableName'])
+
+
+def drop_table(client, table_name: str):
+    """Delete a stand-in table if it exists"""
+    try:
+        client.delete_table(TableName=table_name)
+        client.get_waiter('table_not_exists').wait(TableName=table_name)
+    except client.exceptions.ResourceNotFoundException:
+        pass
+
+
+def remove_stand_in_data(connections):
+    """Drop everything the benchmark created on the stand-ins"""
+    from elasticache_seeder import SEARCH_CACHE_PATTERNS
+    from redis_bulk import purge_namespace
+
+    connections.documentdb_client.drop_database(SCRATCH_NAME)
+    purge_namespace(connections.elasticache_client, SEARCH_CACHE_PATTERNS)
+    client = connections.boto3_session.client('dynamodb')
+    for definition in BENCHMARK_TABLES.values():
+        drop_table(client, definition['TableName'])
+
+
+def _max_rss_mb(who: int) -> float:
+    """High-water resident set size in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    max_rss = resource.getrusage(who).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+
+def run_stage(task, scale: int, record_count: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one seeding task and measure it"""
+    from index_registry import INDEX_REGISTRY, skipped_specs
+
+    log = io.StringIO()
+    instrumentation.reset()
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else log):
+            success = bool(task.run(args))
+        error = None
+    except Exception as e:
+        success, error = False, str(e)
+    wall_time = time.perf_counter() - start
+
+    metrics = instrumentation.to_dict()
+    round_trips = {store: stats['roundTrips'] for store, stats in metrics['stores'].items()}
+    result = {
+        'task': task.name,
+        'store': task.store,
+        'scale': scale,
+        'records': record_count,
+        'success': success,
+        'wall_time_seconds': round(wall_time, 4),
+        'records_per_second': round(record_count / wall_time, 1) if wall_time > 0 else 0.0,
+        'round_trips': round_trips,
+        'total_round_trips': sum(round_trips.values()),
+        'bytes_sent': {store: stats['bytesSent'] for store, stats in metrics['stores'].items()},
+        'retries': {store: stats['retries'] for store, stats in metrics['stores'].items() if stats['retries']},
+        'seeder_stages': {name: timing['seconds'] for name, timing in metrics['stages'].get(task.name, {}).items()},
+        'peak_memory_mb': round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2) if tracemalloc.is_tracing() else None,
+        'max_rss_mb': round(_max_rss_mb(resource.RUSAGE_SELF), 1),
+        'children_max_rss_mb': round(_max_rss_mb(resource.RUSAGE_CHILDREN), 1),
+    }
+    skipped_indexes = [spec.name for spec in skipped_specs(INDEX_REGISTRY.get(task.name, []))]
+    if skipped_indexes:
+        # Not built on the stand-in, so the stage does not cover them
+        result['skipped_indexes'] = skipped_indexes
+    if error:
+        result['error'] = error
+    if not success and not args.verbose:
+        result['log_tail'] = log.getvalue().splitlines()[-20:]
+    return result
+
+
+def run_benchmark(args: argparse.Namespace, connections) -> List[Dict[str, Any]]:
+    """Run every selected task at every scale, each scale on freshly emptied stand-ins"""
+    from seed_all import build_tasks
+
+    tasks = [task for task in build_tasks() if task.name in args.tasks]
+    source_dir = data_loader.OUTPUT_DIR
+    stages = []
+
+    for scale in args.scales:
+        work_dir = tempfile.mkdtemp(prefix=f"{SCRATCH_NAME}-{scale}x-")
+        try:
+            print(f"\n📦 Writing {scale}x dataset to {work_dir}...")
+            # ElastiCacheSeeder also caches search behaviors, so they are always written
+            filenames = sorted({TASK_FILES[task.name] for task in tasks} | {'search_behaviors.json'})
+            counts = DatasetScaler(scale, seed=args.seed).write_all(work_dir, filenames)
+            reset_stand_ins(connections)
+
+            # Seeders resolve bare filenames against data_loader.OUTPUT_DIR
+            data_loader.OUTPUT_DIR = work_dir
+            try:
+                for task in tasks:
+                    filename = TASK_FILES[task.name]
+                    if filename not in counts:
+                        print(f"⏭️  {task.name} {scale}x: no {filename}, skipped")
+                        continue
+                    stage = run_stage(task, scale, counts[filename], args)
+                    stages.append(stage)
+                    status = '✅' if stage['success'] else '❌'
+                    print(f"{status} {task.name} {scale}x: {stage['records']:,} records in "
+                          f"{stage['wall_time_seconds']:.2f}s ({stage['records_per_second']:,.0f}/s), "
+                          f"{stage['total_round_trips']:,} round trips")
+                    for line in stage.get('log_tail', []):
+                        print(f"     {line}")
+            finally:
+                data_loader.OUTPUT_DIR = source_dir
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return stages
+
+
+def stage_key(stage: Dict[str, Any]) -> str:
+    return f"{stage['task']}@{stage['scale']}x"
+
+
+def compare_to_baseline(stages: List[Dict[str, Any]], baseline: Dict[str, Any],
+                        tolerance: float) -> List[str]:
+    """Return a description of every stage that regressed against the baseline"""
+    baseline_stages = {stage_key(stage): stage for stage in baseline.get('stages', [])}
+    regressions = []
+    for stage in stages:
+        key = stage_key(stage)
+        previous = baseline_stages.get(key)
+        if previous is None:
+            continue
+        if previous['success'] and not stage['success']:
+            regressions.append(f"{key}: failed (passed in baseline)")
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = previous.get(metric), stage.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{key}: {metric} {old:,} -> {new:,} ({change:+.1%})")
+    return regressions
+
+
+def main():
+    """Benchmark all seeders on local stand-ins and check for regressions"""
+    from seed_all import build_tasks
+
+    task_names = [task.name for task in build_tasks()]
+    parser = argparse.ArgumentParser(description='Benchmark every seeder on local stand-ins at scaled data volumes')
+    parser.add_argument('--tasks', nargs='+', choices=task_names, default=task_names,
+                        help='Seeding tasks to benchmark (default: all)')
+    parser.add_argument('--scales', nargs='+', type=int, default=[1, 10, 100],
+                        help='Multiples of the shipped data volume (default: 1 10 100)')
+    parser.add_argument('--seed', type=int, default=0, help='Dataset scaler seed (default: 0)')
+    parser.add_argument('--prep-processes', type=int,
+                        help='Record preparation processes (default: one per CPU core)')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'latest.json'),
+                        help='Results file (default: data/benchmarks/latest.json)')
+    parser.add_argument('--baseline', default=os.path.join(RESULTS_DIR, 'baseline.json'),
+                        help='Baseline to compare against, if it exists (default: data/benchmarks/baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Also write the results to --baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='Allowed relative regression per metric (default: 0.15)')
+    parser.add_argument('--no-trace-memory', dest='trace_memory', action='store_false',
+                        help='Skip tracemalloc peak tracking, which slows Python-heavy stages')
+    add_autocomplete_arguments(parser)
+    parser.add_argument('--verbose', action='store_true', help='Show seeder output')
+    parser.add_argument('--mongo-uri', default='mongodb://localhost:27017')
+    parser.add_argument('--dynamodb-endpoint', default='http://localhost:8000')
+    parser.add_argument('--redis-url', default='redis://localhost:6379/0')
+    args = parser.parse_args()
+
+    # seed_all.py task options: plain full reseeds, not journaled
+    args.force, args.incremental, args.blue_green, args.journal = True, False, False, None
+
+    enable_instrumentation()
+    connections = connect_stand_ins(args)
+    if args.trace_memory:
+        tracemalloc.start()
+    try:
+        stages = run_benchmark(args, connections)
+    finally:
+        if args.trace_memory:
+            tracemalloc.stop()
+        remove_stand_in_data(connections)
+        connections.close_connections()
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'host': {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count()},
+        'settings': {'scales': args.scales, 'seed': args.seed, 'prep_processes': args.prep_processes, 'trace_memory': args.trace_memory},
+        'stages': stages,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📝 Results written to {args.output}")
+
+    success = all(stage['success'] for stage in stages)
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('settings') != results['settings']:
+            print(f"⚠️  Baseline settings {baseline.get('settings')} differ from this run's {results['settings']}")
+        regressions = compare_to_baseline(stages, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%} against {args.baseline}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            success = False
+        else:
+            print(f"✅ No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+    if args.save_baseline:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"📌 Baseline saved to {args.baseline}")
+    return success
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Startup Profiler for Unicorn E-Commerce Seeders
+Measures what importing each seeder costs, from `python -X importtime`, and checks it against a budget
+
+Every module is imported in a fresh interpreter (best of --repeat runs). A module fails the check
+when its import takes longer than its budget, or when it loads a driver it does not need; drivers
+are imported on first use, so e.g. product_seeder must not pull in boto3 or redis.
+
+  python data/seeders/startup_profile.py                      # all seeders, default budgets
+  python data/seeders/startup_profile.py --modules seed_all --verbose
+  python data/seeders/startup_profile.py --budget-file budgets.json   # {"product_seeder": 250, ...}
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+SEEDERS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Import budget per module in milliseconds, with headroom over a typical workstation
+STARTUP_BUDGETS_MS = {
+    'seed_all': 150,
+    'product_seeder': 400,
+    'review_seeder': 400,
+    'review_aggregates': 400,
+    'knowledge_base_seeder': 400,
+    'inventory_seeder': 400,
+    'search_analytics_seeder': 400,
+    'elasticache_seeder': 300,
+}
+
+# Heavy optional packages, and the ones each module is allowed to import eagerly
+DRIVER_PACKAGES = ('pymongo', 'boto3', 'redis', 'numpy', 'cryptography', 'aiobotocore', 'motor')
+EXPECTED_DRIVERS = {
+    'seed_all': set(),
+    'product_seeder': {'pymongo'},
+    'review_seeder': {'pymongo'},
+    'review_aggregates': {'pymongo'},
+    'knowledge_base_seeder': {'pymongo'},
+    'inventory_seeder': {'boto3'},
+    'search_analytics_seeder': {'boto3'},
+    'elasticache_seeder': {'redis'},
+}
+
+
+def parse_importtime(stderr: str, module: str) -> Optional[Dict[str, Any]]:
+    """
+    Summarize `-X importtime` output for the import of module.
+
+    Returns the module's cumulative import time, the self time of every top-level package it
+    pulled in, and the driver packages it imported itself (not ones a driver imported in
+    turn, such as pymongo's cryptography); None if module's line is missing.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        raw_name = fields[2]
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        entries.append((int(fields[0]), int(fields[1]), depth, raw_name.strip()))
+
+    # Children are reported before their parent, so the module's imports are the entries
+    # between the previous top-level line and the module's own line
+    end = next((i for i in range(len(entries) - 1, -1, -1)
+                if entries[i][2] == 0 and entries[i][3] == module), None)
+    if end is None:
+        return None
+    start = end
+    while start > 0 and entries[start - 1][2] > 0:
+        start -= 1
+
+    packages: Dict[str, int] = {}
+    drivers = set()
+    ancestors: List[str] = []
+    # Walking backwards, every entry comes right after its parent chain
+    for self_us, _, depth, name in reversed(entries[start:end + 1]):
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us
+        del ancestors[depth:]
+        if package in DRIVER_PACKAGES and not any(a in DRIVER_PACKAGES for a in ancestors):
+            drivers.add(package)
+        ancestors.append(package)
+
+    return {
+        'importMs': entries[end][1] / 1000,
+        'packagesMs': {package: us / 1000 for package, us in
+                       sorted(packages.items(), key=lambda item: item[1], reverse=True)},
+        'drivers': sorted(drivers),
+    }
+
+
+def profile_module(module: str, repeat: int = 3) -> Dict[str, Any]:
+    """Import module in fresh interpreters and return the fastest run's summary"""
+    best = None
+    for _ in range(max(1, repeat)):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                cwd=SEEDERS_DIR, capture_output=True, text=True)
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed'
+            return {'module': module, 'error': error}
+        summary = parse_importtime(result.stderr, module)
+        if summary is None:
+            return {'module': module, 'error': 'no importtime data (already imported by site?)'}
+        if best is None or summary['importMs'] < best['importMs']:
+            best = summary
+    return dict(best, module=module)
+
+
+def check_profile(profile: Dict[str, Any], budget_ms: Optional[float]) -> List[str]:
+    """Return the reasons a module's profile fails its budget and driver checks"""
+    if 'error' in profile:
+        return [profile['error']]
+    problems = []
+    if budget_ms is not None and profile['importMs'] > budget_ms:
+        problems.append(f"import took {profile['importMs']:.1f} ms, budget is {budget_ms:g} ms")
+    unexpected = set(profile['drivers']) - EXPECTED_DRIVERS.get(profile['module'], set(DRIVER_PACKAGES))
+    if unexpected:
+        problems.append(f"eagerly imports {', '.join(sorted(unexpected))}")
+    return problems
+
+
+def main():
+    """Profile seeder startup and fail when a budget is exceeded"""
+    parser = argparse.ArgumentParser(description='Profile seeder import time against a startup budget')
+    parser.add_argument('--modules', nargs='+', default=list(STARTUP_BUDGETS_MS), metavar='MODULE',
+                        help='Modules to import (default: seed_all and every seeder)')
+    parser.add_argument('--repeat', type=int, default=3, help='Imports per module; the fastest counts (default: 3)')
+    parser.add_argument('--budget-ms', type=float, help='One budget for every module, overriding the defaults')
+    parser.add_argument('--budget-file', help='JSON object of per-module budgets in ms, merged over the defaults')
+    parser.add_argument('--output', help='Also write the profiles to this JSON file')
+    parser.add_argument('--verbose', action='store_true', help='Show the slowest packages of each module')
+    args = parser.parse_args()
+
+    budgets = dict(STARTUP_BUDGETS_MS)
+    if args.budget_file:
+        try:
+            with open(args.budget_file, 'r', encoding='utf-8') as f:
+                budgets.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not read budget file {args.budget_file}: {e}")
+            return False
+
+    print(f"{'Module':<26}{'Import ms':>10}{'Budget':>9}  Drivers")
+    profiles = []
+    failed = False
+    for module in args.modules:
+        profile = profile_module(module, repeat=args.repeat)
+        budget = args.budget_ms if args.budget_ms is not None else budgets.get(module)
+        problems = check_profile(profile, budget)
+        profile.update(budgetMs=budget, problems=problems)
+        profiles.append(profile)
+
+        status = '❌' if problems else '✅'
+        import_ms = f"{profile['importMs']:.1f}" if 'importMs' in profile else '-'
+        budget_text = f"{budget:g}" if budget is not None else '-'
+        print(f"{status} {module:<24}{import_ms:>10}{budget_text:>9}  {', '.join(profile.get('drivers', [])) or '-'}")
+        for problem in problems:
+            print(f"   ↳ {problem}")
+        if args.verbose and 'packagesMs' in profile:
+            for package, ms in list(profile['packagesMs'].items())[:5]:
+                print(f"     {package:<28}{ms:>8.1f} ms")
+        failed = failed or bool(problems)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'profiles': profiles}, f, indent=2)
+        print(f"Wrote startup profile to {args.output}")
+
+    if failed:
+        print("❌ Startup budget check failed")
+    else:
+        print("✅ All modules within their startup budget")
+    return not failed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -198,65 +198,21 @@ export PYTHONPATH="${PYTHONPATH}:$(pwd)"
 # Seed data to databases
 print_info "Starting database seeding..."
 
-# Seed products to DocumentDB
-print_info "Seeding products to DocumentDB..."
-if python3 data/seeders/product_seeder.py --force; then
-    print_status "Products seeded to DocumentDB successfully"
-else
-    print_error "Products seeding failed"
-    exit 1
+# Unpack reviews (if available) so the orchestrator can seed them
+if [ -f "data/output/reviews.json.zip" ]; then
+    unzip -o data/output/reviews.json.zip -d data/output
 fi
 
-# Seed inventory to DynamoDB
-print_info "Seeding inventory to DynamoDB..."
-if python3 data/seeders/inventory_seeder.py --force; then
-    print_status "Inventory seeded to DynamoDB successfully"
+# Seed all stores concurrently from a single process sharing one set of connections.
+# DocumentDB, DynamoDB and ElastiCache tasks run in parallel; products and inventory are required.
+print_info "Seeding DocumentDB, DynamoDB and ElastiCache..."
+if python3 data/seeders/seed_all.py --force; then
+    print_status "All seeding tasks completed"
 else
-    print_error "Inventory seeding failed"
+    print_error "Required seeding tasks failed"
     exit 1
 fi
 
-# Seed reviews to DocumentDB (if available)
-if [ -f "data/output/reviews.json.zip" ]; then
-    unzip data/output/reviews.json.zip -d data/output
-    print_info "Seeding reviews to DocumentDB..."
-    if python3 data/seeders/review_seeder.py; then
-        print_status "Reviews seeded to DocumentDB successfully"
-    else
-        print_warning "Reviews seeding failed, continuing..."
-    fi
-fi
-
-# Seed knowledge base to DocumentDB (if available)
-if [ -f "data/output/knowledge_base.json" ]; then
-    print_info "Seeding knowledge base to DocumentDB..."
-    if python3 data/seeders/knowledge_base_seeder.py; then
-        print_status "Knowledge base seeded to DocumentDB successfully"
-    else
-        print_warning "Knowledge base seeding failed, continuing..."
-    fi
-fi
-
-# Seed search behaviors to DynamoDB (if available)
-if [ -f "data/output/search_behaviors.json" ]; then
-    print_info "Seeding search behaviors to DynamoDB..."
-    if python3 data/seeders/search_analytics_seeder.py; then
-        print_status "Search behaviors seeded to DynamoDB successfully"
-    else
-        print_warning "Search behaviors seeding failed, continuing..."
-    fi
-fi
-
-# Seed popular search terms to ElastiCache (if available)
-if [ -f "data/output/popular_search_terms.json" ]; then
-    print_info "Seeding popular search terms to ElastiCache..."
-    if python3 data/seeders/elasticache_seeder.py; then
-        print_status "Popular search terms seeded to ElastiCache successfully"
-    else
-        print_warning "ElastiCache seeding failed, continuing..."
-    fi
-fi
-
 print_status "Database seeding completed successfully!"
 print_info "Data has been seeded to:"
 echo "  • DocumentDB: Products, reviews, and knowledge base collections"